@@ -0,0 +1,41 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""Guard the cold start of the trivial CLI modes.
+
+``upload.py --help`` is answered before the upload machinery is imported. This runs it
+with ``-X importtime`` and fails if any of the heavy modules sneaks back onto that path,
+or if the wall time exceeds the budget (default 0.6 s, override with the first argument).
+
+    python bin/check_startup_time.py [budget_seconds]
+"""
+import os
+import subprocess
+import sys
+import time
+
+# Modules that must stay off the --help path; each costs tens of milliseconds or more.
+HEAVY_MODULES = ('aiohttp', 'cli_ui', 'httpx', 'qbittorrentapi', 'torf', 'guessit', 'src.clients', 'src.prep', 'src.trackersetup')
+
+
+def check_startup_time(budget: float = 0.6) -> bool:
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(base_dir, 'upload.py'), '--help'],
+        cwd=base_dir, capture_output=True, text=True, check=False,
+    )
+    elapsed = time.perf_counter() - started
+
+    if result.returncode != 0:
+        print(f"upload.py --help exited with {result.returncode}:\n{result.stderr}")
+        return False
+
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith('import time:')}
+    leaked = sorted(name for name in HEAVY_MODULES if name in imported)
+    if leaked:
+        print(f"upload.py --help imported heavy modules: {', '.join(leaked)}")
+    print(f"upload.py --help took {elapsed:.2f}s (budget {budget:.2f}s)")
+    return not leaked and elapsed <= budget
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_startup_time(float(sys.argv[1]) if len(sys.argv) > 1 else 0.6) else 1)
@@ -135,6 +135,14 @@ config = {
         # This places an additional limitation on ffmpeg to reduce CPU usage
         "ffmpeg_limit": False,
 
+        # Hash the BASE torrent and start uploading screenshots while the remaining
+        # screenshots are still being captured. Set false to run each step in sequence
+        "pipeline_screenshots": True,
+
+        # Move screenshot timestamps onto the nearest following keyframe and remember each file's keyframes
+        # in data/cache, so retakes and repeat uploads don't probe the file again
+        "keyframe_index": True,
+
         # Tonemap HDR - DV+HDR screenshots
         "tone_map": True,
 
@@ -217,6 +225,10 @@ config = {
         # You might not want to process screens/mediainfo for 40 episodes in a season pack.
         "processLimit": "10",
 
+        # Keep MediaInfo output in data/cache, keyed on each file's identity, so re-running a pack
+        # (or a --queue pass over the same library) doesn't parse every episode again
+        "mediainfo_cache": True,
+
         # Providing the option to add a description header, in bbcode, at the top of the description section where supported
         # Can be overridden in a per-tracker setting by adding this same config
         "custom_description_header": "",
@@ -293,6 +305,52 @@ config = {
         # this path for TV shows
         # "emby_tv_dir": None,
 
+        # NETWORK
+
+        # HTTP connections are pooled and reused across image hosts, trackers and metadata sites.
+        # Maximum number of open connections shared by all requests (default "100")
+        "http_max_connections": "100",
+
+        # Maximum number of idle connections kept alive for reuse (default "20")
+        "http_max_keepalive_connections": "20",
+
+        # Seconds an idle connection is kept open before it is closed (default "30")
+        "http_keepalive_expiry": "30",
+
+        # Negotiate HTTP/2 with hosts that support it (needs the 'h2' package, falls back to HTTP/1.1 without it)
+        "http2": False,
+
+        # Minimum seconds between requests to a host, on top of the built-in limits
+        # (passthepopcorn.me: 1, blu-ray.com: 2-4, SN uploads: 16). Retry-After from 429/503 responses is always honoured
+        # "rate_limits": {"example.org": "2"},
+
+        # Cache TMDB/IMDb/TVDB/TVmaze lookups in data/cache so queues and season packs only
+        # query each series once. Use --no-cache or --refresh-cache to bypass it for a run
+        "metadata_cache": True,
+
+        # Maximum size of the metadata cache in MB, least recently used entries are dropped first
+        "metadata_cache_max_mb": "128",
+
+        # Seconds a tracker's dupe search response is reused by later queue items with the same query
+        # (e.g. every episode of a season). Dropped early once we upload to that tracker. "0" disables (default "300")
+        "dupe_search_cache_ttl": "300",
+
+        # QUEUE
+
+        # Number of --queue items processed at the same time (unattended/auto mode only, default "1")
+        # While one item takes screenshots, another can be hashing or uploading to trackers
+        "queue_parallel_items": "1",
+
+        # When processing queue items in parallel, how many items may run each phase at once
+        # Screenshot capture (each capture still uses up to process_limit ffmpeg processes)
+        "queue_ffmpeg_slots": "1",
+
+        # Torrent hashing
+        "queue_hashing_slots": "1",
+
+        # Tracker dupe searches and uploads
+        "queue_tracker_slots": "4",
+
         # TORRENT CREATION
 
         # set true to use mkbrr for torrent creation
@@ -303,6 +361,10 @@ config = {
         # Conversely, you can set a lower amount such as 1 to protect system resources (default "0" (auto))
         "mkbrr_threads": "0",
 
+        # Remember piece hashes per file in data/cache so retries and re-uploads of unchanged content
+        # only hash the pieces that changed, instead of reading the whole release again
+        "piece_hash_cache": True,
+
         # Set true to prefer torrents with piece size <= 16 MiB when searching for existing torrents in clients
         # Does not override MTV preference for small pieces
         "prefer_max_16_torrent": False,
@@ -993,6 +1055,9 @@ config = {
             # Allow fallback to inject torrent into qBitTorrent using the original path
             # when linking error. eg: unsupported file system.
             "allow_fallback": True,
+            # When a hardlink is refused (eg: too many links to the file), clone the file instead on
+            # copy-on-write filesystems (btrfs, XFS, bcachefs). Linux only, same filesystem only.
+            "reflink_fallback": False,
             # A folder or list of folders that will contain the linked content
             # if using hardlinking, the linked folder must be on the same drive/volume as the original content,
             # with UA mapping the correct location if multiple paths are specified.
@@ -1037,6 +1102,9 @@ config = {
             # Allow fallback to inject torrent into qBitTorrent using the original path
             # when linking error. eg: unsupported file system.
             "allow_fallback": True,
+            # When a hardlink is refused (eg: too many links to the file), clone the file instead on
+            # copy-on-write filesystems (btrfs, XFS, bcachefs). Linux only, same filesystem only.
+            "reflink_fallback": False,
             # A folder or list of folders that will contain the linked content
             # if using hardlinking, the linked folder must be on the same drive/volume as the original content,
             # with UA mapping the correct location if multiple paths are specified.
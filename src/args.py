@@ -72,9 +72,10 @@ class Args:
     Parse Args
     """
 
-    def __init__(self, config: dict[str, Any]) -> None:
+    def __init__(self, config: Optional[dict[str, Any]] = None) -> None:
+        # config only supplies defaults (e.g. screens); upload.py parses without it to
+        # answer --help and --cleanup before the config and upload machinery are loaded
         self.config = config
-        pass
 
     def parse(self, argv: Sequence[str], meta: dict[str, Any]) -> tuple[dict[str, Any], CustomArgumentParser, list[str]]:
         input = list(argv)
@@ -88,7 +89,7 @@ class Args:
         parser.add_argument('-sc', '--site-check', dest='site_check', action='store_true', required=False, help="Just search sites for suitable uploads and create log file, no uploading", default=False)
         parser.add_argument('-su', '--site-upload', dest='site_upload', nargs=1, required=False, help="Specify a single tracker, and it will process the site searches and upload.", type=str, default=None)
         parser.add_argument('--unit3d', action='store_true', required=False, help="[parse a txt output file from UNIT3D-Upload-Checker]")
-        parser.add_argument('-s', '--screens', nargs=1, required=False, help="Number of screenshots", default=int(self.config['DEFAULT']['screens']))
+        parser.add_argument('-s', '--screens', nargs=1, required=False, help="Number of screenshots", default=None)
         parser.add_argument('-comps', '--comparison', nargs='+', required=False, help="Use comparison images from a folder (input folder path). See: https://github.com/Audionut/Upload-Assistant/pull/487", default=None)
         parser.add_argument('-comps_index', '--comparison_index', nargs=1, required=False, help="Which of your comparison indexes is the main images (required when comps)", type=int, default=None)
         parser.add_argument('-mf', '--manual_frames', nargs=1, required=False, help="Comma-separated frame numbers to use as screenshots", type=str, default=None)
@@ -170,6 +171,8 @@ class Args:
         parser.add_argument('-mps', '--max-piece-size', nargs=1, required=False, help="Set max piece size allowed in MiB for default torrent creation (default 128 MiB)", choices=['1', '2', '4', '8', '16', '32', '64', '128'])
         parser.add_argument('-nh', '--nohash', action='store_true', required=False, help="Don't hash .torrent")
         parser.add_argument('-rh', '--rehash', action='store_true', required=False, help="DO hash .torrent")
+        parser.add_argument('--no-cache', dest='no_cache', action='store_true', required=False, help="Don't read or write the TMDB/IMDb/TVDB/TVmaze metadata cache")
+        parser.add_argument('--refresh-cache', dest='refresh_cache', action='store_true', required=False, help="Ignore cached TMDB/IMDb/TVDB/TVmaze metadata and fetch it again")
         parser.add_argument('-mkbrr', '--mkbrr', action='store_true', required=False, help="Use mkbrr for torrent hashing")
         parser.add_argument('-frc', '--force-recheck', action='store_true', required=False, help="(qBitTorrent only with auto torrent searching) Force recheck torrent in client before uploading", dest="force_recheck")
         parser.add_argument('-dr', '--draft', action='store_true', required=False, help="Send to drafts (BHD, LST)")
@@ -478,6 +481,9 @@ class Args:
             # if key == 'help' and value == True:
                 # parser.print_help()
 
+        if parsed_args.get('screens') is None and self.config is not None:
+            meta['screens'] = int(self.config['DEFAULT']['screens'])
+
         manual_frames_value = meta.get('manual_frames')
         if manual_frames_value is not None:
             try:
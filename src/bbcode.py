@@ -35,6 +35,37 @@ from src.console import console
 # IMG - REMOVE?
 # INDENT - Probably not an issue, but maybe just remove tags
 
+# Patterns used on every imported description. The searches below are written so each one walks the
+# description once; the plain regex forms they replace rescanned the rest of the text from every [img]
+# or line start, which was quadratic on large descriptions (full BDInfo, long comparisons).
+_COMPARISON_LINE_RE = re.compile(r"^.*comparison.*\n", flags=re.IGNORECASE | re.MULTILINE)
+_IMG_OPEN_RE = re.compile(r"\[img\]", flags=re.IGNORECASE)
+_IMG_CLOSE_RE = re.compile(r"\[\/img\]", flags=re.IGNORECASE)
+_HDBITS_HOST_RE = re.compile(r"(img\.|t\.)?hdbits\.org", flags=re.IGNORECASE)
+_PTP_HOST_RE = re.compile(r"passthepopcorn\.m", flags=re.IGNORECASE)
+
+
+def _hdbits_img_groups(desc: str) -> list[str]:
+    r"""
+    What ``re.findall(r"\[img\][\s\S]*?(img\.|t\.)?hdbits\.org[\s\S]*?\[\/img\]", desc, re.I)`` returns,
+    found in one forward scan: once no hdbits.org (or no [/img] after it) is left, no later [img] can match either.
+    """
+    groups: list[str] = []
+    pos = 0
+    while True:
+        start = _IMG_OPEN_RE.search(desc, pos)
+        if start is None:
+            break
+        host = _HDBITS_HOST_RE.search(desc, start.end())
+        if host is None:
+            break
+        end = _IMG_CLOSE_RE.search(desc, host.end())
+        if end is None:
+            break
+        groups.append(host.group(1) or '')
+        pos = end.end()
+    return groups
+
 
 class BBCODE:
     def __init__(self) -> None:
@@ -57,7 +88,7 @@ class BBCODE:
                 desc = desc.replace(section_text, '')
 
         # Handle individual comparison lines
-        comparison_lines = re.finditer(r"(.*comparison.*)\n", desc, flags=re.IGNORECASE)
+        comparison_lines = _COMPARISON_LINE_RE.finditer(desc)
         for comp_match in comparison_lines:
             comp_pos = comp_match.start()
 
@@ -82,7 +113,7 @@ class BBCODE:
             desc = desc.replace(full_url, '')
 
         # Remove HDBits image tags
-        hdbits_imgs = re.findall(r"\[img\][\s\S]*?(img\.|t\.)?hdbits\.org[\s\S]*?\[\/img\]", desc, flags=re.IGNORECASE)
+        hdbits_imgs = _hdbits_img_groups(desc)
         for img_tag in hdbits_imgs:
             desc = desc.replace(img_tag, '')
 
@@ -221,11 +252,13 @@ class BBCODE:
         desc = desc.replace('\r\n', '\n')
 
         # Remove url tags with PTP/HDB links
-        url_tags: list[str] = re.findall(
-            r"(?:\[url(?:=|\])[^\]]*https?:\/\/passthepopcorn\.m[^\]]*\]|\bhttps?:\/\/passthepopcorn\.m[^\s]+)",
-            desc,
-            flags=re.IGNORECASE,
-        )
+        url_tags: list[str] = []
+        if _PTP_HOST_RE.search(desc):
+            url_tags = re.findall(
+                r"(?:\[url(?:=|\])[^\]]*https?:\/\/passthepopcorn\.m[^\]]*\]|\bhttps?:\/\/passthepopcorn\.m[^\s]+)",
+                desc,
+                flags=re.IGNORECASE,
+            )
         url_tags += [
             ''.join(tag)
             for tag in re.findall(
@@ -2,7 +2,6 @@
 import asyncio
 import json
 import os
-import random
 import re
 from collections.abc import Mapping, MutableMapping, Sequence
 from pathlib import Path
@@ -14,6 +13,9 @@ from bs4 import BeautifulSoup
 from bs4.element import AttributeValueList
 from rich.console import Console
 
+from src.http_client import http_client_manager
+from src.rate_limit import rate_limiter
+
 console = Console()
 
 Meta = MutableMapping[str, Any]
@@ -85,14 +87,10 @@ async def search_bluray(meta: Meta) -> Optional[str]:
 
     while retry_count <= max_retries:
         try:
-            delay = random.uniform(1, 3)  # nosec B311 - Rate limiting delay, not cryptographic
-            if meta.get('debug'):
-                console.print(f"[dim]Waiting {delay:.2f} seconds before request (attempt {retry_count + 1}/{max_retries + 1})...[/dim]")
-            await asyncio.sleep(delay)
 
             if meta.get('debug'):
                 console.print(f"[yellow]Sending request to blu-ray.com (attempt {retry_count + 1}/{max_retries + 1})...[/yellow]")
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=10.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=headers)
 
                 if response.status_code == 200 and "No index" not in response.text:
@@ -116,7 +114,7 @@ async def search_bluray(meta: Meta) -> Optional[str]:
                     if retry_count < 2:
                         backoff_time *= 2
                         console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                        await asyncio.sleep(backoff_time)
+                        rate_limiter.defer(url, backoff_time)
                         retry_count += 1
                     else:
                         console.print("[red]Maximum retries reached, giving up on search[/red]")
@@ -128,7 +126,7 @@ async def search_bluray(meta: Meta) -> Optional[str]:
                         backoff_time *= 2
                         if meta['debug']:
                             console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                        await asyncio.sleep(backoff_time)
+                        rate_limiter.defer(url, backoff_time)
                         retry_count += 1
                     else:
                         console.print("[red]Maximum retries reached, giving up on search[/red]")
@@ -140,7 +138,7 @@ async def search_bluray(meta: Meta) -> Optional[str]:
                 backoff_time *= 2
                 if meta.get('debug'):
                     console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                await asyncio.sleep(backoff_time)
+                rate_limiter.defer(url, backoff_time)
                 retry_count += 1
             else:
                 console.print("[red]Maximum retries reached, giving up on search[/red]")
@@ -393,10 +391,6 @@ async def get_bluray_releases(meta: Meta) -> list[Release]:
             console.print(f"[yellow]Error reading cached file: {str(e)}[/yellow]")
 
         # If we're here, we need to make a request
-        delay = random.uniform(2, 4)  # nosec B311 - Rate limiting delay, not cryptographic
-        if meta.get('debug'):
-            console.print(f"[dim]Waiting {delay:.2f} seconds before request...[/dim]")
-        await asyncio.sleep(delay)
 
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -415,7 +409,7 @@ async def get_bluray_releases(meta: Meta) -> list[Release]:
 
             while retry_count <= max_retries:
                 try:  # noqa: PERF203
-                    async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+                    async with http_client_manager.client(timeout=15.0, follow_redirects=True) as client:
                         response = await client.get(ajax_url, headers=headers)
 
                         if response.status_code == 200 and "No index" not in response.text:
@@ -433,7 +427,7 @@ async def get_bluray_releases(meta: Meta) -> list[Release]:
                             if retry_count < max_retries:
                                 backoff_time *= 2
                                 console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                                await asyncio.sleep(backoff_time)
+                                rate_limiter.defer(ajax_url, backoff_time)
                                 retry_count += 1
                             else:
                                 console.print("[red]Maximum retries reached, giving up on this URL[/red]")
@@ -443,7 +437,7 @@ async def get_bluray_releases(meta: Meta) -> list[Release]:
                             if retry_count < max_retries:
                                 backoff_time *= 2
                                 console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                                await asyncio.sleep(backoff_time)
+                                rate_limiter.defer(ajax_url, backoff_time)
                                 retry_count += 1
                             else:
                                 console.print("[red]Maximum retries reached, giving up on this URL[/red]")
@@ -454,7 +448,7 @@ async def get_bluray_releases(meta: Meta) -> list[Release]:
                     if retry_count < max_retries:
                         backoff_time *= 2
                         console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                        await asyncio.sleep(backoff_time)
+                        rate_limiter.defer(ajax_url, backoff_time)
                         retry_count += 1
                     else:
                         console.print("[red]Maximum retries reached, giving up on this URL[/red]")
@@ -780,7 +774,7 @@ async def download_cover_images(meta: Meta) -> bool:
     downloaded_images: dict[str, str] = {}
     console.print("[blue]Downloading cover images...[/blue]")
 
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+    async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
         cover_images = cast(Mapping[str, str], meta.get('cover_images', {}))
         for img_type, url in cover_images.items():
             file_ext = os.path.splitext(url)[1]
@@ -919,10 +913,6 @@ async def fetch_release_details(release: Release, meta: Meta) -> Release:
         console.print(f"[yellow]Error reading cached file: {str(e)}[/yellow]")
 
     # If we're here, we need to make a request
-    delay = random.uniform(2, 4)  # nosec B311 - Rate limiting delay, not cryptographic
-    if meta.get('debug'):
-        console.print(f"[dim]Waiting {delay:.2f} seconds before request...[/dim]")
-    await asyncio.sleep(delay)
 
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -945,7 +935,7 @@ async def fetch_release_details(release: Release, meta: Meta) -> Release:
             if meta.get('debug'):
                 console.print(f"[yellow]Sending request to {release_url} (attempt {retry_count + 1}/{max_retries + 1})...[/yellow]")
 
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=15.0, follow_redirects=True) as client:
                 response = await client.get(release_url, headers=headers)
 
                 if response.status_code == 200 and "No index" not in response.text:
@@ -967,7 +957,7 @@ async def fetch_release_details(release: Release, meta: Meta) -> Release:
                     if retry_count < 2:
                         backoff_time *= 2
                         console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                        await asyncio.sleep(backoff_time)
+                        rate_limiter.defer(release_url, backoff_time)
                         retry_count += 1
                     else:
                         console.print("[red]Maximum retries reached, giving up on this release[/red]")
@@ -977,7 +967,7 @@ async def fetch_release_details(release: Release, meta: Meta) -> Release:
                     if retry_count < max_retries:
                         backoff_time *= 2
                         console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                        await asyncio.sleep(backoff_time)
+                        rate_limiter.defer(release_url, backoff_time)
                         retry_count += 1
                     else:
                         console.print("[red]Maximum retries reached, giving up on this release[/red]")
@@ -988,7 +978,7 @@ async def fetch_release_details(release: Release, meta: Meta) -> Release:
             if retry_count < max_retries:
                 backoff_time *= 2
                 console.print(f"[yellow]Retrying in {backoff_time:.1f} seconds...[/yellow]")
-                await asyncio.sleep(backoff_time)
+                rate_limiter.defer(release_url, backoff_time)
                 retry_count += 1
             else:
                 console.print("[red]Maximum retries reached, giving up on this release[/red]")
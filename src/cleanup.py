@@ -24,14 +24,32 @@ IS_ANDROID = ('android' in platform.platform().lower() or
               'ANDROID_ROOT' in os.environ)
 
 running_subprocesses: set[subprocess.Popen[Any]] = set()
+# Background work (e.g. BASE torrent hashing pipelined with screenshots) that the
+# mid-run cleanup() calls must not cancel or kill. The tasks spawn child tasks of their
+# own, so while any of them runs cleanup() cancels no tasks at all; processes are still
+# cleaned up, apart from the protected pids and their descendants. Owners remove their
+# entries when done.
+protected_tasks: set[asyncio.Task[Any]] = set()
+protected_pids: set[int] = set()
 thread_executor: Optional[ThreadPoolExecutor] = None
 IS_MACOS = sys.platform == 'darwin'
 erase_key: Optional[str] = None
 
 
 class CleanupManager:
+    def __init__(self) -> None:
+        # Set while queue items run in parallel: one item finishing must not cancel the
+        # tasks, processes and pooled connections of the others. The queue runner does
+        # a full cleanup() once every item is done.
+        self.deferred = False
+
     async def cleanup(self) -> None:
         """Ensure all running tasks, threads, and subprocesses are properly cleaned up before exiting."""
+        if self.deferred:
+            return
+        # Mid-run call with background work in flight: its tasks are left for the cleanup at exit
+        background_running = any(not task.done() for task in protected_tasks)
+
         # console.print("[yellow]Cleaning up tasks before exiting...[/yellow]")
 
         # Step 1: Shutdown ThreadPoolExecutor **before checking for threads**
@@ -54,6 +72,8 @@ class CleanupManager:
         #        console.print("[red]Warning: Monitoring thread did not exit in time.[/red]")
 
         # 🔹 Step 3: Terminate all tracked subprocesses
+        kept = {proc for proc in running_subprocesses if proc.pid in protected_pids}
+        running_subprocesses.difference_update(kept)
         while running_subprocesses:
             proc = running_subprocesses.pop()
             if proc.returncode is None:  # If still running
@@ -78,13 +98,15 @@ class CleanupManager:
                     with contextlib.suppress(Exception):
                         stream.close()
 
+        running_subprocesses.update(kept)
+
         # 🔹 Step 4: Ensure subprocess transport cleanup
         with contextlib.suppress(RuntimeError):
             await asyncio.sleep(0.1)
 
         # 🔹 Step 5: Cancel all running asyncio tasks **gracefully**
         try:
-            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            tasks = [] if background_running else [t for t in asyncio.all_tasks() if t is not asyncio.current_task() and t not in protected_tasks]
             # console.print(f"[yellow]Cancelling {len(tasks)} remaining tasks...[/yellow]")
 
             for task in tasks:
@@ -140,7 +162,7 @@ class CleanupManager:
             try:
                 # Only try to clean up processes we directly spawned
                 for proc in list(running_subprocesses):
-                    if proc.returncode is None:
+                    if proc.returncode is None and proc.pid not in protected_pids:
                         with contextlib.suppress(PermissionError, psutil.AccessDenied, OSError):
                             proc.terminate()
             except Exception:
@@ -150,7 +172,11 @@ class CleanupManager:
             # Standard process cleanup for non-Android systems
             try:
                 current_process = psutil.Process()
-                children = current_process.children(recursive=True)
+                spared = set(protected_pids)
+                for pid in protected_pids:
+                    with contextlib.suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+                        spared.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+                children = [child for child in current_process.children(recursive=True) if child.pid not in spared]
 
                 for child in children:
                     # console.print(f"[yellow]Terminating process {child.pid}...[/yellow]")
@@ -9,7 +9,6 @@ from typing import Any, Optional, Union, cast
 
 import aiohttp
 import defusedxml.xmlrpc
-import qbittorrentapi
 from torf import Torrent
 
 from src.console import console
@@ -300,6 +299,7 @@ class Clients(QbittorrentClientMixin, RtorrentClientMixin, DelugeClientMixin, Tr
 
     async def _search_single_client_for_torrent(self, meta: dict[str, Any], client_name: str, prefer_small_pieces: bool, mtv_torrent: bool, piece_limit: bool, best_match: Optional[dict[str, Any]]) -> Union[dict[str, Any], str, None]:
         """Search a single client for an existing torrent by hash or via API search (qbit only)."""
+        import qbittorrentapi
 
         client = self.config['TORRENT_CLIENTS'][client_name]
         torrent_client = client.get('torrent_client', '').lower()
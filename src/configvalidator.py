@@ -45,11 +45,14 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "process_limit": (str, int),
     "threads": (str, int),
     "ffmpeg_limit": (bool,),
+    "pipeline_screenshots": (bool,),
+    "keyframe_index": (bool,),
     "multiScreens": (str, int),
     "pack_thumb_size": (str, int),
     "charLimit": (str, int),
     "fileLimit": (str, int),
     "processLimit": (str, int),
+    "mediainfo_cache": (bool,),
     "default_torrent_client": (str,),
     "skip_auto_torrent": (bool,),
     "sfx_on_prompt": (bool,),
@@ -61,6 +64,7 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "use_radarr": (bool,),
     "mkbrr": (bool,),
     "mkbrr_threads": (str, int),
+    "piece_hash_cache": (bool,),
     "user_overrides": (bool,),
     "ping_unit3d": (bool,),
     "get_bluray_info": (bool,),
@@ -81,6 +85,17 @@ DEFAULT_KEY_TYPES: dict[str, tuple[type, ...]] = {
     "cross_seeding": (bool,),
     "cross_seed_check_everything": (bool,),
     "auto_mode": (bool, str),
+    "http_max_connections": (str, int),
+    "http_max_keepalive_connections": (str, int),
+    "http_keepalive_expiry": (str, int, float),
+    "rate_limits": (dict,),
+    "metadata_cache": (bool,),
+    "metadata_cache_max_mb": (str, int),
+    "dupe_search_cache_ttl": (str, int),
+    "queue_parallel_items": (str, int),
+    "queue_ffmpeg_slots": (str, int),
+    "queue_hashing_slots": (str, int),
+    "queue_tracker_slots": (str, int),
 }
 
 # Valid image hosts
@@ -410,7 +425,9 @@ def _validate_default_section(default: dict[str, Any]) -> tuple[list[str], list[
     # Validate numeric string values can be parsed
     numeric_keys = ["screens", "cutoff_screens", "thumbnail_size", "process_limit", "threads",
                     "multiScreens", "pack_thumb_size", "charLimit", "fileLimit", "processLimit",
-                    "tracker_pass_checks", "mkbrr_threads", "ffmpeg_compression"]
+                    "tracker_pass_checks", "mkbrr_threads", "ffmpeg_compression",
+                    "http_max_connections", "http_max_keepalive_connections", "metadata_cache_max_mb", "dupe_search_cache_ttl",
+                    "queue_parallel_items", "queue_ffmpeg_slots", "queue_hashing_slots", "queue_tracker_slots"]
     for key in numeric_keys:
         if key in default:
             value = default[key]
@@ -1,4 +1,5 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+import collections
 import os
 import re
 from collections.abc import MutableMapping, Sequence
@@ -8,7 +9,7 @@ from typing_extensions import TypeAlias
 
 from cogs.redaction import Redaction
 from src.console import console
-from src.trackers.HUNO import HUNO
+from src.trackersetup import tracker_class_map
 
 Meta: TypeAlias = MutableMapping[str, Any]
 
@@ -40,6 +41,125 @@ class AttributeCheck(TypedDict):
     exclude_msg: Callable[[str], str]
 
 
+def _normalize_name(filename: str) -> str:
+    return filename.lower().replace("-", " -").replace(" ", " ").replace(".", " ")
+
+
+def _hdr_terms(hdr: str) -> set[str]:
+    hdr_upper = hdr.upper()
+    terms: set[str] = set()
+    if "DV" in hdr_upper or "DOVI" in hdr_upper:
+        terms.add("DV")
+    if "HDR" in hdr_upper:  # Any HDR-related term is normalized to 'HDR'
+        terms.add("HDR")
+    return terms
+
+
+class DupeFingerprint:
+    """What the exclusion rules read from one dupe entry, derived once and reused across runs."""
+
+    __slots__ = ('file_hdr', 'files', 'files_lower', 'files_lower_set', 'flags', 'normalized')
+
+    def __init__(self, entry: DupeEntry) -> None:
+        files = [str(file) for file in cast(list[Any], entry.get('files') or [])]
+        # Handle case where files might be comma-separated strings in a list
+        if files and len(files) == 1 and ',' in files[0]:
+            files = [f.strip() for f in files[0].split(',')]
+        self.files = files
+        self.files_lower = [f.lower() for f in files]
+        self.files_lower_set = frozenset(self.files_lower)
+        self.normalized = _normalize_name(str(entry.get('name', '')))
+        self.flags = [str(flag) for flag in cast(list[Any], entry.get('flags') or [])]
+        # Only read by the rules, never modified
+        self.file_hdr: set[str] = set()
+        if self.flags:
+            # If flags are provided, use them directly for HDR information
+            for flag in self.flags:
+                flag_upper = flag.upper()
+                if flag_upper == 'DV':
+                    self.file_hdr.add('DV')
+                elif flag_upper in ['HDR', 'HDR10', 'HDR10+']:
+                    self.file_hdr.add('HDR')
+        else:
+            # Fall back to parsing filename for HDR terms
+            self.file_hdr = _hdr_terms(self.normalized)
+
+
+# Tracker search results repeat across queue items and re-runs; keyed on tracker, id, name and file count
+_FINGERPRINT_CACHE_SIZE = 4096
+_fingerprints: collections.OrderedDict[tuple[str, str, str, int], DupeFingerprint] = collections.OrderedDict()
+
+
+def dupe_fingerprint(entry: DupeEntry, tracker_name: str) -> DupeFingerprint:
+    entry_id = entry.get('id')
+    if entry_id is None or entry_id == '':
+        return DupeFingerprint(entry)
+    key = (tracker_name, str(entry_id), str(entry.get('name', '')), len(entry.get('files') or []))
+    fingerprint = _fingerprints.get(key)
+    if fingerprint is None:
+        fingerprint = DupeFingerprint(entry)
+        _fingerprints[key] = fingerprint
+        if len(_fingerprints) > _FINGERPRINT_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+    else:
+        _fingerprints.move_to_end(key)
+    return fingerprint
+
+
+class SeasonEpisodeMatcher:
+    """``is_season_episode_match`` for one target season/episode, with its patterns compiled once."""
+
+    _EPISODE_RE = re.compile(r"[eE]\d{2}", re.IGNORECASE)
+
+    def __init__(self, target_season: Optional[Union[str, int]], target_episode: Optional[Union[str, int]]) -> None:
+        season_match = re.search(r'[sS](\d+)', str(target_season))
+        target_season_value = int(season_match.group(1)) if season_match else None
+
+        # Handle daily-style episodes where the episode value is a date (YYYY-MM-DD / YYYY.MM.DD).
+        target_episode_str = str(target_episode or "")
+        self.daily: Optional[re.Pattern[str]] = None
+        date_match = re.search(r'(?<!\d)((?:19|20)\d{2})[.\-_/\s](\d{1,2})[.\-_/\s](\d{1,2})(?!\d)', target_episode_str)
+        if date_match:
+            year = int(date_match.group(1))
+            month = int(date_match.group(2))
+            day = int(date_match.group(3))
+            self.daily = re.compile(rf"(?<!\d){year}[.\-_/\s]?{month:02d}[.\-_/\s]?{day:02d}(?!\d)", re.IGNORECASE)
+
+        if target_episode:
+            episode_matches = re.findall(r'\d+', str(target_episode))
+            target_episodes = [int(ep) for ep in episode_matches]
+        else:
+            target_episodes = []
+        self.has_episodes = bool(target_episodes)
+        self.season: Optional[re.Pattern[str]] = re.compile(rf"[sS]{target_season_value:02}", re.IGNORECASE) if target_season_value is not None else None
+        self.episodes = [re.compile(rf"[eE]{ep:02}", re.IGNORECASE) for ep in target_episodes]
+
+    def match(self, filename: str) -> tuple[bool, bool]:
+        """(season/episode matches, filename is a season pack of the target season)."""
+        if self.daily is not None:
+            return (bool(self.daily.search(filename)), False)
+
+        # Determine if filename represents a season pack (no explicit episode pattern)
+        is_season_pack = not self._EPISODE_RE.search(filename)
+
+        # If `target_episode` is empty, match only season packs
+        if not self.has_episodes:
+            season_matches = bool(self.season and self.season.search(filename))
+            return (season_matches and is_season_pack, season_matches)
+
+        # If `target_episode` is provided, match both season packs and episode files
+        if self.season is not None:
+            if is_season_pack:
+                return (bool(self.season.search(filename)), True)  # Match season pack
+            if self.episodes:
+                return (
+                    bool(self.season.search(filename)) and any(ep.search(filename) for ep in self.episodes),
+                    False,
+                )  # Match episode file
+
+        return (False, False)  # No match
+
+
 class DupeChecker:
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
@@ -161,6 +281,7 @@ class DupeChecker:
         is_tv_pack = meta.get('category') == "TV" and (coerce_int(meta.get('tv_pack')) or 0) == 1
         target_season_match = re.search(r'[sS](\d+)', str(target_season or ""))
         target_season_number = int(target_season_match.group(1)) if target_season_match else None
+        season_matcher = SeasonEpisodeMatcher(target_season, target_episode)
 
         filenames: list[str] = []
         filelist_value = meta.get('filelist')
@@ -174,6 +295,7 @@ class DupeChecker:
                     filenames.append(filename)
             if meta.get('debug'):
                 console.log(f"dupe checking filenames: {filenames[:10]}{'...' if len(filenames) > 10 else ''}")
+        filenames_lower = [filename.lower() for filename in filenames]
 
         attribute_checks: list[AttributeCheck] = [
             {
@@ -202,38 +324,17 @@ class DupeChecker:
             each = str(entry.get('name', ''))
             sized = entry.get('size')  # This may come as a string, such as "1.5 GB"
 
-            files_value = cast(list[Any], entry.get('files') or [])
-            files = [str(file) for file in files_value]
-
-            # Handle case where files might be comma-separated strings in a list
-            if files and len(files) == 1 and ',' in files[0]:
-                # Split comma-separated string into individual filenames
-                files = [f.strip() for f in files[0].split(',')]
-
+            fingerprint = dupe_fingerprint(entry, tracker_name)
+            files = fingerprint.files
             file_count_raw = entry.get('file_count', 0)
             file_count = coerce_int(file_count_raw) or 0
-            normalized = await DupeChecker.normalize_filename(each)
+            normalized = fingerprint.normalized
             type_id = entry.get('type', None)
             res_id = entry.get('res', None)
-
-            # Use flags field if available for more accurate HDR detection
-            flags_value = cast(list[Any], entry.get('flags') or [])
-            flags = [str(flag) for flag in flags_value]
-
-            if flags:
-                # If flags are provided, use them directly for HDR information
-                file_hdr: set[str] = set()
-                for flag in flags:
-                    flag_upper = str(flag).upper()
-                    if flag_upper == 'DV':
-                        file_hdr.add('DV')
-                    elif flag_upper in ['HDR', 'HDR10', 'HDR10+']:
-                        file_hdr.add('HDR')
-                if meta.get('debug'):
-                    console.log(f"[debug] Using flags for HDR detection: {flags} -> {file_hdr}")
-            else:
-                # Fall back to parsing filename for HDR terms
-                file_hdr = await DupeChecker.refine_hdr_terms(normalized)
+            flags = fingerprint.flags
+            file_hdr = fingerprint.file_hdr
+            if flags and meta.get('debug'):
+                console.log(f"[debug] Using flags for HDR detection: {flags} -> {file_hdr}")
 
             if meta.get('debug'):
                 console.log(f"[debug] Evaluating dupe: {each}")
@@ -282,10 +383,10 @@ class DupeChecker:
                 remember_match('trumpable_id')
 
             if not meta.get('is_disc'):
-                for file in filenames:
+                for file, file_lower in zip(filenames, filenames_lower):
                     if tracker_name in ["MTV", "AR", "RTF"]:
                         # MTV: check if any dupe file is a substring of our file (ignoring extension)
-                        if any(f.lower() in file.lower() for f in files):
+                        if any(f in file_lower for f in fingerprint.files_lower):
                             meta['filename_match'] = f"{entry.get('name')} = {entry.get('link', None)}"
                             remember_match('filename')
                             if file_count and file_count == len(filelist):
@@ -306,7 +407,7 @@ class DupeChecker:
                         if meta.get('debug'):
                             console.log(f"[debug] Comparing file: {file} against dupe files list.")
                             console.log(f"[debug] Dupe files list: {files[:10]}{'...' if len(files) > 10 else files}")
-                        if any(file.lower() == f.lower() for f in files):
+                        if file_lower in fingerprint.files_lower_set:
                             meta['filename_match'] = f"{entry.get('name')} = {entry.get('link', None)}"
                             if meta.get('debug'):
                                 console.log(f"[debug] Filename match found: {meta['filename_match']}")
@@ -381,7 +482,7 @@ class DupeChecker:
                     return False
 
             if tracker_name == "HUNO":
-                huno = HUNO(config=self.config)
+                huno = tracker_class_map["HUNO"](config=self.config)
                 huno_name_result: Any = await huno.get_name(cast(dict[str, Any], meta))
                 huno_name_map = cast(dict[str, Any], huno_name_result)
                 huno_name = str(huno_name_map.get('name', huno_name_result)) if isinstance(huno_name_result, dict) else str(huno_name_result)
@@ -483,7 +584,7 @@ class DupeChecker:
                         return True
 
             if meta.get('category') == "TV":
-                season_episode_match, is_season = await DupeChecker.is_season_episode_match(normalized, target_season, target_episode)
+                season_episode_match, is_season = season_matcher.match(normalized)
                 if meta.get('debug'):
                     console.log(f"[debug] Season/Episode match result: {season_episode_match}")
                     console.log(f"[debug] is_season: {is_season}")
@@ -636,9 +737,7 @@ class DupeChecker:
             filename = str(filename.get('name', ''))
         if not isinstance(filename, str):
             raise ValueError(f"Expected a string or a dictionary with a 'name' key, but got: {type(filename)}")
-        normalized = filename.lower().replace("-", " -").replace(" ", " ").replace(".", " ")
-
-        return normalized
+        return _normalize_name(filename)
 
     @staticmethod
     async def is_season_episode_match(
@@ -649,50 +748,7 @@ class DupeChecker:
         """
         Check if the filename matches the given season and episode.
         """
-        season_match = re.search(r'[sS](\d+)', str(target_season))
-        target_season_value = int(season_match.group(1)) if season_match else None
-
-        # Handle daily-style episodes where the episode value is a date (YYYY-MM-DD / YYYY.MM.DD).
-        target_episode_str = str(target_episode or "")
-        date_match = re.search(r'(?<!\d)((?:19|20)\d{2})[.\-_/\s](\d{1,2})[.\-_/\s](\d{1,2})(?!\d)', target_episode_str)
-        if date_match:
-            year = int(date_match.group(1))
-            month = int(date_match.group(2))
-            day = int(date_match.group(3))
-            daily_date_pattern = rf"(?<!\d){year}[.\-_/\s]?{month:02d}[.\-_/\s]?{day:02d}(?!\d)"
-            if re.search(daily_date_pattern, filename, re.IGNORECASE):
-                return (True, False)
-            return (False, False)
-
-        if target_episode:
-            episode_matches = re.findall(r'\d+', str(target_episode))
-            target_episodes = [int(ep) for ep in episode_matches]
-        else:
-            target_episodes = []
-
-        season_pattern = rf"[sS]{target_season_value:02}" if target_season_value is not None else None
-        episode_patterns = [rf"[eE]{ep:02}" for ep in target_episodes] if target_episodes else []
-
-        # Determine if filename represents a season pack (no explicit episode pattern)
-        is_season_pack = not re.search(r"[eE]\d{2}", filename, re.IGNORECASE)
-
-        # If `target_episode` is empty, match only season packs
-        if not target_episodes:
-            season_matches = bool(season_pattern and re.search(season_pattern, filename, re.IGNORECASE))
-            return (season_matches and is_season_pack, season_matches)
-
-        # If `target_episode` is provided, match both season packs and episode files
-        if season_pattern:
-            if is_season_pack:
-                return (bool(re.search(season_pattern, filename, re.IGNORECASE)), True)  # Match season pack
-            if episode_patterns:
-                return (
-                    bool(re.search(season_pattern, filename, re.IGNORECASE))
-                    and any(re.search(ep, filename, re.IGNORECASE) for ep in episode_patterns),
-                    False,
-                )  # Match episode file
-
-        return (False, False)  # No match
+        return SeasonEpisodeMatcher(target_season, target_episode).match(filename)
 
     @staticmethod
     async def refine_hdr_terms(hdr: Optional[str]) -> set[str]:
@@ -702,13 +758,7 @@ class DupeChecker:
         """
         if hdr is None:
             return set()
-        hdr_upper = str(hdr).upper()
-        terms: set[str] = set()
-        if "DV" in hdr_upper or "DOVI" in hdr_upper:
-            terms.add("DV")
-        if "HDR" in hdr_upper:  # Any HDR-related term is normalized to 'HDR'
-            terms.add("HDR")
-        return terms
+        return _hdr_terms(str(hdr))
 
     @staticmethod
     async def has_matching_hdr(file_hdr: set[str], target_hdr: set[str], meta: Meta, tracker: Optional[str] = None) -> bool:
@@ -0,0 +1,79 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Short-lived cache of tracker dupe-search responses.
+
+Every queue item searches each tracker for existing uploads, and the episodes
+of a season all send the same query (same TMDb id, category, resolution, type
+and season). Responses are kept in memory for ``dupe_search_cache_ttl``
+seconds, keyed on the tracker, URL and normalized query parameters, and a
+tracker's entries are dropped as soon as we upload to it, so the next item sees
+its own upload as a dupe.
+"""
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional, Union, cast
+
+from src.console import console
+
+DEFAULT_TTL = 300
+
+Params = Union[Mapping[str, Any], Iterable[tuple[str, Any]], None]
+
+
+class DupeSearchCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str, tuple[tuple[str, str], ...]], tuple[float, Any]] = {}
+        self.ttl = float(DEFAULT_TTL)
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, config: dict[str, Any]) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        try:
+            self.ttl = max(0.0, float(default_cfg.get('dupe_search_cache_ttl', DEFAULT_TTL)))
+        except (TypeError, ValueError):
+            self.ttl = float(DEFAULT_TTL)
+
+    @staticmethod
+    def _key(tracker: str, url: str, params: Params) -> tuple[str, str, tuple[tuple[str, str], ...]]:
+        items = params.items() if isinstance(params, Mapping) else (params or ())
+        # Parameter order and str/int differences don't change the query; whitespace around values doesn't either
+        normalized = tuple(sorted((str(k), str(v).strip()) for k, v in items if v is not None))
+        return tracker.upper(), url.rstrip('/'), normalized
+
+    def get(self, tracker: str, url: str, params: Params = None) -> Optional[Any]:
+        """The stored response data, or None when the tracker has to be asked."""
+        if self.ttl <= 0:
+            return None
+        key = self._key(tracker, url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, tracker: str, url: str, params: Params, data: Any) -> None:
+        """Store a successful response. ``data`` is shared between hits, so callers must only read it."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+            self._entries[self._key(tracker, url, params)] = (now + self.ttl, data)
+
+    def invalidate(self, tracker: str) -> None:
+        """Forget every search for ``tracker``; called after uploading to it."""
+        tracker = tracker.upper()
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != tracker}
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]Dupe search cache: {self.hits} hits, {self.misses} misses[/cyan]")
+
+
+dupe_search_cache = DupeSearchCache()
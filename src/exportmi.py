@@ -4,6 +4,7 @@ import json
 import os
 import platform
 import subprocess
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Optional, Union, cast
 
@@ -12,6 +13,10 @@ from pymediainfo import MediaInfo
 
 from src.console import console
 from src.exceptions import NoAudioMediaError
+from src.mediainfo_cache import mediainfo_cache
+
+# Files parsed concurrently when a whole pack is read at once
+BATCH_WORKERS = min(4, os.cpu_count() or 1)
 
 
 def validate_file_path(file_path: str) -> str:
@@ -159,211 +164,280 @@ async def mi_resolution(
     return resolution
 
 
+def filter_mediainfo(data: dict[str, Any]) -> dict[str, Any]:
+    media = data.get("media")
+    if not isinstance(media, dict):
+        return {
+            "creatingLibrary": data.get("creatingLibrary"),
+            "media": {"@ref": "", "track": []},
+        }
+
+    media_dict = cast(dict[str, Any], media)
+    raw_tracks = media_dict.get("track", [])
+    tracks: list[dict[str, Any]] = cast(list[dict[str, Any]], raw_tracks) if isinstance(raw_tracks, list) else []
+
+    media_tracks: list[dict[str, Any]] = []
+    media_section: dict[str, Any] = {
+        "@ref": media_dict.get("@ref", ""),
+        "track": media_tracks,
+    }
+    filtered: dict[str, Any] = {
+        "creatingLibrary": data.get("creatingLibrary"),
+        "media": media_section,
+    }
+
+    for track in tracks:
+        track_type = track.get("@type")
+        if track_type == "General":
+            media_tracks.append(
+                {
+                    "@type": track_type,
+                    "UniqueID": track.get("UniqueID", {}),
+                    "VideoCount": track.get("VideoCount", {}),
+                    "AudioCount": track.get("AudioCount", {}),
+                    "TextCount": track.get("TextCount", {}),
+                    "MenuCount": track.get("MenuCount", {}),
+                    "FileExtension": track.get("FileExtension", {}),
+                    "Format": track.get("Format", {}),
+                    "Format_Version": track.get("Format_Version", {}),
+                    "FileSize": track.get("FileSize", {}),
+                    "Duration": track.get("Duration", {}),
+                    "OverallBitRate": track.get("OverallBitRate", {}),
+                    "FrameRate": track.get("FrameRate", {}),
+                    "FrameCount": track.get("FrameCount", {}),
+                    "StreamSize": track.get("StreamSize", {}),
+                    "IsStreamable": track.get("IsStreamable", {}),
+                    "File_Created_Date": track.get("File_Created_Date", {}),
+                    "File_Created_Date_Local": track.get("File_Created_Date_Local", {}),
+                    "File_Modified_Date": track.get("File_Modified_Date", {}),
+                    "File_Modified_Date_Local": track.get("File_Modified_Date_Local", {}),
+                    "Encoded_Application": track.get("Encoded_Application", {}),
+                    "Encoded_Library": track.get("Encoded_Library", {}),
+                    "extra": track.get("extra", {}),
+                }
+            )
+        elif track_type == "Video":
+            media_tracks.append(
+                {
+                    "@type": track_type,
+                    "StreamOrder": track.get("StreamOrder", {}),
+                    "ID": track.get("ID", {}),
+                    "UniqueID": track.get("UniqueID", {}),
+                    "Format": track.get("Format", {}),
+                    "Format_Profile": track.get("Format_Profile", {}),
+                    "Format_Version": track.get("Format_Version", {}),
+                    "Format_Level": track.get("Format_Level", {}),
+                    "Format_Tier": track.get("Format_Tier", {}),
+                    "HDR_Format": track.get("HDR_Format", {}),
+                    "HDR_Format_Version": track.get("HDR_Format_Version", {}),
+                    "HDR_Format_String": track.get("HDR_Format_String", {}),
+                    "HDR_Format_Profile": track.get("HDR_Format_Profile", {}),
+                    "HDR_Format_Level": track.get("HDR_Format_Level", {}),
+                    "HDR_Format_Settings": track.get("HDR_Format_Settings", {}),
+                    "HDR_Format_Compression": track.get("HDR_Format_Compression", {}),
+                    "HDR_Format_Compatibility": track.get("HDR_Format_Compatibility", {}),
+                    "CodecID": track.get("CodecID", {}),
+                    "CodecID_Hint": track.get("CodecID_Hint", {}),
+                    "Duration": track.get("Duration", {}),
+                    "BitRate": track.get("BitRate", {}),
+                    "Width": track.get("Width", {}),
+                    "Height": track.get("Height", {}),
+                    "Stored_Height": track.get("Stored_Height", {}),
+                    "Sampled_Width": track.get("Sampled_Width", {}),
+                    "Sampled_Height": track.get("Sampled_Height", {}),
+                    "PixelAspectRatio": track.get("PixelAspectRatio", {}),
+                    "DisplayAspectRatio": track.get("DisplayAspectRatio", {}),
+                    "FrameRate_Mode": track.get("FrameRate_Mode", {}),
+                    "FrameRate": track.get("FrameRate", {}),
+                    "FrameRate_Original": track.get("FrameRate_Original", {}),
+                    "FrameRate_Num": track.get("FrameRate_Num", {}),
+                    "FrameRate_Den": track.get("FrameRate_Den", {}),
+                    "FrameCount": track.get("FrameCount", {}),
+                    "Standard": track.get("Standard", {}),
+                    "ColorSpace": track.get("ColorSpace", {}),
+                    "ChromaSubsampling": track.get("ChromaSubsampling", {}),
+                    "ChromaSubsampling_Position": track.get("ChromaSubsampling_Position", {}),
+                    "BitDepth": track.get("BitDepth", {}),
+                    "ScanType": track.get("ScanType", {}),
+                    "ScanOrder": track.get("ScanOrder", {}),
+                    "Delay": track.get("Delay", {}),
+                    "Delay_Source": track.get("Delay_Source", {}),
+                    "StreamSize": track.get("StreamSize", {}),
+                    "Language": track.get("Language", {}),
+                    "Default": track.get("Default", {}),
+                    "Forced": track.get("Forced", {}),
+                    "colour_description_present": track.get("colour_description_present", {}),
+                    "colour_description_present_Source": track.get("colour_description_present_Source", {}),
+                    "colour_range": track.get("colour_range", {}),
+                    "colour_range_Source": track.get("colour_range_Source", {}),
+                    "colour_primaries": track.get("colour_primaries", {}),
+                    "colour_primaries_Source": track.get("colour_primaries_Source", {}),
+                    "transfer_characteristics": track.get("transfer_characteristics", {}),
+                    "transfer_characteristics_Source": track.get("transfer_characteristics_Source", {}),
+                    "transfer_characteristics_Original": track.get("transfer_characteristics_Original", {}),
+                    "matrix_coefficients": track.get("matrix_coefficients", {}),
+                    "matrix_coefficients_Source": track.get("matrix_coefficients_Source", {}),
+                    "MasteringDisplay_ColorPrimaries": track.get("MasteringDisplay_ColorPrimaries", {}),
+                    "MasteringDisplay_ColorPrimaries_Source": track.get("MasteringDisplay_ColorPrimaries_Source", {}),
+                    "MasteringDisplay_Luminance": track.get("MasteringDisplay_Luminance", {}),
+                    "MasteringDisplay_Luminance_Source": track.get("MasteringDisplay_Luminance_Source", {}),
+                    "MaxCLL": track.get("MaxCLL", {}),
+                    "MaxCLL_Source": track.get("MaxCLL_Source", {}),
+                    "MaxFALL": track.get("MaxFALL", {}),
+                    "MaxFALL_Source": track.get("MaxFALL_Source", {}),
+                    "Encoded_Library_Settings": track.get("Encoded_Library_Settings", {}),
+                    "Encoded_Library": track.get("Encoded_Library", {}),
+                    "Encoded_Library_Name": track.get("Encoded_Library_Name", {}),
+                }
+            )
+        elif track_type == "Audio":
+            media_tracks.append(
+                {
+                    "@type": track_type,
+                    "StreamOrder": track.get("StreamOrder", {}),
+                    "ID": track.get("ID", {}),
+                    "UniqueID": track.get("UniqueID", {}),
+                    "Format": track.get("Format", {}),
+                    "Format_Version": track.get("Format_Version", {}),
+                    "Format_Profile": track.get("Format_Profile", {}),
+                    "Format_Settings": track.get("Format_Settings", {}),
+                    "Format_Commercial_IfAny": track.get("Format_Commercial_IfAny", {}),
+                    "Format_Settings_Endianness": track.get("Format_Settings_Endianness", {}),
+                    "Format_AdditionalFeatures": track.get("Format_AdditionalFeatures", {}),
+                    "CodecID": track.get("CodecID", {}),
+                    "Duration": track.get("Duration", {}),
+                    "BitRate_Mode": track.get("BitRate_Mode", {}),
+                    "BitRate": track.get("BitRate", {}),
+                    "Channels": track.get("Channels", {}),
+                    "ChannelPositions": track.get("ChannelPositions", {}),
+                    "ChannelLayout": track.get("ChannelLayout", {}),
+                    "Channels_Original": track.get("Channels_Original", {}),
+                    "ChannelLayout_Original": track.get("ChannelLayout_Original", {}),
+                    "SamplesPerFrame": track.get("SamplesPerFrame", {}),
+                    "SamplingRate": track.get("SamplingRate", {}),
+                    "SamplingCount": track.get("SamplingCount", {}),
+                    "FrameRate": track.get("FrameRate", {}),
+                    "FrameCount": track.get("FrameCount", {}),
+                    "Compression_Mode": track.get("Compression_Mode", {}),
+                    "Delay": track.get("Delay", {}),
+                    "Delay_Source": track.get("Delay_Source", {}),
+                    "Video_Delay": track.get("Video_Delay", {}),
+                    "StreamSize": track.get("StreamSize", {}),
+                    "Title": track.get("Title", {}),
+                    "Language": track.get("Language", {}),
+                    "ServiceKind": track.get("ServiceKind", {}),
+                    "Default": track.get("Default", {}),
+                    "Forced": track.get("Forced", {}),
+                    "extra": track.get("extra", {}),
+                }
+            )
+        elif track_type == "Text":
+            media_tracks.append(
+                {
+                    "@type": track_type,
+                    "@typeorder": track.get("@typeorder", {}),
+                    "StreamOrder": track.get("StreamOrder", {}),
+                    "ID": track.get("ID", {}),
+                    "UniqueID": track.get("UniqueID", {}),
+                    "Format": track.get("Format", {}),
+                    "CodecID": track.get("CodecID", {}),
+                    "Duration": track.get("Duration", {}),
+                    "BitRate": track.get("BitRate", {}),
+                    "FrameRate": track.get("FrameRate", {}),
+                    "FrameCount": track.get("FrameCount", {}),
+                    "ElementCount": track.get("ElementCount", {}),
+                    "StreamSize": track.get("StreamSize", {}),
+                    "Title": track.get("Title", {}),
+                    "Language": track.get("Language", {}),
+                    "Default": track.get("Default", {}),
+                    "Forced": track.get("Forced", {}),
+                }
+            )
+        elif track_type == "Menu":
+            media_tracks.append(
+                {
+                    "@type": track_type,
+                    "extra": track.get("extra", {}),
+                }
+            )
+    return filtered
+
+
+def filter_mediainfo_text(media_info: str) -> str:
+    return "\n".join(line for line in media_info.splitlines() if not line.strip().startswith("ReportBy") and not line.strip().startswith("Report created by "))
+
+
+async def write_mediainfo_exports(video: str, folder_id: str, base_dir: str, text: str, info: dict[str, Any], debug: bool = False) -> dict[str, Any]:
+    """Write MEDIAINFO.txt, MEDIAINFO_CLEANPATH.txt and MediaInfo.json for ``video`` and return a copy of ``info``."""
+    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt", "w", newline="", encoding="utf-8") as export:
+        await export.write(text.replace(video, os.path.basename(video)))
+    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO_CLEANPATH.txt", "w", newline="", encoding="utf-8") as export_cleanpath:
+        await export_cleanpath.write(text.replace(video, os.path.basename(video)))
+    if debug:
+        console.print("[bold green]MediaInfo Exported.")
+
+    info_json = json.dumps(info, indent=4)
+    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", "w", encoding="utf-8") as export:
+        await export.write(info_json)
+        if debug:
+            console.print(f"[green]JSON file written to: {base_dir}/tmp/{folder_id}/MediaInfo.json[/green]")
+
+    return cast(dict[str, Any], json.loads(info_json))
+
+
+def _parse_standard(video: str) -> tuple[str, dict[str, Any]]:
+    text = filter_mediainfo_text(MediaInfo.parse(video, output="STRING", full=False))
+    info = filter_mediainfo(json.loads(MediaInfo.parse(video, output="JSON")))
+    return text, info
+
+
+async def mediainfo_texts(videos: Sequence[str], debug: bool = False) -> dict[str, str]:
+    """
+    Filtered MediaInfo text for every file of a pack. Files missing from the cache are
+    parsed in a worker pool and stored, so later runs over the same pack parse nothing.
+    """
+    texts: dict[str, str] = {}
+    missing: list[str] = []
+    for video in dict.fromkeys(videos):
+        cached = mediainfo_cache.get(video)
+        if cached is not None:
+            texts[video] = cached[0]
+        else:
+            missing.append(video)
+    if not missing:
+        return texts
+
+    if debug:
+        console.print(f"[bold yellow]Parsing MediaInfo for {len(missing)} file(s)...")
+    semaphore = asyncio.Semaphore(min(BATCH_WORKERS, len(missing)))
+
+    async def parse(video: str) -> None:
+        async with semaphore:
+            try:
+                text, info = await asyncio.to_thread(_parse_standard, video)
+            except Exception as e:
+                console.print(f"[yellow]Could not parse MediaInfo for {os.path.basename(video)}: {e}[/yellow]")
+                return
+        mediainfo_cache.put(video, text, info)
+        texts[video] = text
+
+    await asyncio.gather(*(parse(video) for video in missing))
+    return texts
+
+
 async def exportInfo(
     video: str,
-    isdir: bool,
     folder_id: str,
     base_dir: str,
     is_dvd: bool = False,
     debug: bool = False,
 ) -> dict[str, Any]:
-    def filter_mediainfo(data: dict[str, Any]) -> dict[str, Any]:
-        media = data.get("media")
-        if not isinstance(media, dict):
-            return {
-                "creatingLibrary": data.get("creatingLibrary"),
-                "media": {"@ref": "", "track": []},
-            }
-
-        media_dict = cast(dict[str, Any], media)
-        raw_tracks = media_dict.get("track", [])
-        tracks: list[dict[str, Any]] = cast(list[dict[str, Any]], raw_tracks) if isinstance(raw_tracks, list) else []
-
-        media_tracks: list[dict[str, Any]] = []
-        media_section: dict[str, Any] = {
-            "@ref": media_dict.get("@ref", ""),
-            "track": media_tracks,
-        }
-        filtered: dict[str, Any] = {
-            "creatingLibrary": data.get("creatingLibrary"),
-            "media": media_section,
-        }
-
-        for track in tracks:
-            track_type = track.get("@type")
-            if track_type == "General":
-                media_tracks.append(
-                    {
-                        "@type": track_type,
-                        "UniqueID": track.get("UniqueID", {}),
-                        "VideoCount": track.get("VideoCount", {}),
-                        "AudioCount": track.get("AudioCount", {}),
-                        "TextCount": track.get("TextCount", {}),
-                        "MenuCount": track.get("MenuCount", {}),
-                        "FileExtension": track.get("FileExtension", {}),
-                        "Format": track.get("Format", {}),
-                        "Format_Version": track.get("Format_Version", {}),
-                        "FileSize": track.get("FileSize", {}),
-                        "Duration": track.get("Duration", {}),
-                        "OverallBitRate": track.get("OverallBitRate", {}),
-                        "FrameRate": track.get("FrameRate", {}),
-                        "FrameCount": track.get("FrameCount", {}),
-                        "StreamSize": track.get("StreamSize", {}),
-                        "IsStreamable": track.get("IsStreamable", {}),
-                        "File_Created_Date": track.get("File_Created_Date", {}),
-                        "File_Created_Date_Local": track.get("File_Created_Date_Local", {}),
-                        "File_Modified_Date": track.get("File_Modified_Date", {}),
-                        "File_Modified_Date_Local": track.get("File_Modified_Date_Local", {}),
-                        "Encoded_Application": track.get("Encoded_Application", {}),
-                        "Encoded_Library": track.get("Encoded_Library", {}),
-                        "extra": track.get("extra", {}),
-                    }
-                )
-            elif track_type == "Video":
-                media_tracks.append(
-                    {
-                        "@type": track_type,
-                        "StreamOrder": track.get("StreamOrder", {}),
-                        "ID": track.get("ID", {}),
-                        "UniqueID": track.get("UniqueID", {}),
-                        "Format": track.get("Format", {}),
-                        "Format_Profile": track.get("Format_Profile", {}),
-                        "Format_Version": track.get("Format_Version", {}),
-                        "Format_Level": track.get("Format_Level", {}),
-                        "Format_Tier": track.get("Format_Tier", {}),
-                        "HDR_Format": track.get("HDR_Format", {}),
-                        "HDR_Format_Version": track.get("HDR_Format_Version", {}),
-                        "HDR_Format_String": track.get("HDR_Format_String", {}),
-                        "HDR_Format_Profile": track.get("HDR_Format_Profile", {}),
-                        "HDR_Format_Level": track.get("HDR_Format_Level", {}),
-                        "HDR_Format_Settings": track.get("HDR_Format_Settings", {}),
-                        "HDR_Format_Compression": track.get("HDR_Format_Compression", {}),
-                        "HDR_Format_Compatibility": track.get("HDR_Format_Compatibility", {}),
-                        "CodecID": track.get("CodecID", {}),
-                        "CodecID_Hint": track.get("CodecID_Hint", {}),
-                        "Duration": track.get("Duration", {}),
-                        "BitRate": track.get("BitRate", {}),
-                        "Width": track.get("Width", {}),
-                        "Height": track.get("Height", {}),
-                        "Stored_Height": track.get("Stored_Height", {}),
-                        "Sampled_Width": track.get("Sampled_Width", {}),
-                        "Sampled_Height": track.get("Sampled_Height", {}),
-                        "PixelAspectRatio": track.get("PixelAspectRatio", {}),
-                        "DisplayAspectRatio": track.get("DisplayAspectRatio", {}),
-                        "FrameRate_Mode": track.get("FrameRate_Mode", {}),
-                        "FrameRate": track.get("FrameRate", {}),
-                        "FrameRate_Original": track.get("FrameRate_Original", {}),
-                        "FrameRate_Num": track.get("FrameRate_Num", {}),
-                        "FrameRate_Den": track.get("FrameRate_Den", {}),
-                        "FrameCount": track.get("FrameCount", {}),
-                        "Standard": track.get("Standard", {}),
-                        "ColorSpace": track.get("ColorSpace", {}),
-                        "ChromaSubsampling": track.get("ChromaSubsampling", {}),
-                        "ChromaSubsampling_Position": track.get("ChromaSubsampling_Position", {}),
-                        "BitDepth": track.get("BitDepth", {}),
-                        "ScanType": track.get("ScanType", {}),
-                        "ScanOrder": track.get("ScanOrder", {}),
-                        "Delay": track.get("Delay", {}),
-                        "Delay_Source": track.get("Delay_Source", {}),
-                        "StreamSize": track.get("StreamSize", {}),
-                        "Language": track.get("Language", {}),
-                        "Default": track.get("Default", {}),
-                        "Forced": track.get("Forced", {}),
-                        "colour_description_present": track.get("colour_description_present", {}),
-                        "colour_description_present_Source": track.get("colour_description_present_Source", {}),
-                        "colour_range": track.get("colour_range", {}),
-                        "colour_range_Source": track.get("colour_range_Source", {}),
-                        "colour_primaries": track.get("colour_primaries", {}),
-                        "colour_primaries_Source": track.get("colour_primaries_Source", {}),
-                        "transfer_characteristics": track.get("transfer_characteristics", {}),
-                        "transfer_characteristics_Source": track.get("transfer_characteristics_Source", {}),
-                        "transfer_characteristics_Original": track.get("transfer_characteristics_Original", {}),
-                        "matrix_coefficients": track.get("matrix_coefficients", {}),
-                        "matrix_coefficients_Source": track.get("matrix_coefficients_Source", {}),
-                        "MasteringDisplay_ColorPrimaries": track.get("MasteringDisplay_ColorPrimaries", {}),
-                        "MasteringDisplay_ColorPrimaries_Source": track.get("MasteringDisplay_ColorPrimaries_Source", {}),
-                        "MasteringDisplay_Luminance": track.get("MasteringDisplay_Luminance", {}),
-                        "MasteringDisplay_Luminance_Source": track.get("MasteringDisplay_Luminance_Source", {}),
-                        "MaxCLL": track.get("MaxCLL", {}),
-                        "MaxCLL_Source": track.get("MaxCLL_Source", {}),
-                        "MaxFALL": track.get("MaxFALL", {}),
-                        "MaxFALL_Source": track.get("MaxFALL_Source", {}),
-                        "Encoded_Library_Settings": track.get("Encoded_Library_Settings", {}),
-                        "Encoded_Library": track.get("Encoded_Library", {}),
-                        "Encoded_Library_Name": track.get("Encoded_Library_Name", {}),
-                    }
-                )
-            elif track_type == "Audio":
-                media_tracks.append(
-                    {
-                        "@type": track_type,
-                        "StreamOrder": track.get("StreamOrder", {}),
-                        "ID": track.get("ID", {}),
-                        "UniqueID": track.get("UniqueID", {}),
-                        "Format": track.get("Format", {}),
-                        "Format_Version": track.get("Format_Version", {}),
-                        "Format_Profile": track.get("Format_Profile", {}),
-                        "Format_Settings": track.get("Format_Settings", {}),
-                        "Format_Commercial_IfAny": track.get("Format_Commercial_IfAny", {}),
-                        "Format_Settings_Endianness": track.get("Format_Settings_Endianness", {}),
-                        "Format_AdditionalFeatures": track.get("Format_AdditionalFeatures", {}),
-                        "CodecID": track.get("CodecID", {}),
-                        "Duration": track.get("Duration", {}),
-                        "BitRate_Mode": track.get("BitRate_Mode", {}),
-                        "BitRate": track.get("BitRate", {}),
-                        "Channels": track.get("Channels", {}),
-                        "ChannelPositions": track.get("ChannelPositions", {}),
-                        "ChannelLayout": track.get("ChannelLayout", {}),
-                        "Channels_Original": track.get("Channels_Original", {}),
-                        "ChannelLayout_Original": track.get("ChannelLayout_Original", {}),
-                        "SamplesPerFrame": track.get("SamplesPerFrame", {}),
-                        "SamplingRate": track.get("SamplingRate", {}),
-                        "SamplingCount": track.get("SamplingCount", {}),
-                        "FrameRate": track.get("FrameRate", {}),
-                        "FrameCount": track.get("FrameCount", {}),
-                        "Compression_Mode": track.get("Compression_Mode", {}),
-                        "Delay": track.get("Delay", {}),
-                        "Delay_Source": track.get("Delay_Source", {}),
-                        "Video_Delay": track.get("Video_Delay", {}),
-                        "StreamSize": track.get("StreamSize", {}),
-                        "Title": track.get("Title", {}),
-                        "Language": track.get("Language", {}),
-                        "ServiceKind": track.get("ServiceKind", {}),
-                        "Default": track.get("Default", {}),
-                        "Forced": track.get("Forced", {}),
-                        "extra": track.get("extra", {}),
-                    }
-                )
-            elif track_type == "Text":
-                media_tracks.append(
-                    {
-                        "@type": track_type,
-                        "@typeorder": track.get("@typeorder", {}),
-                        "StreamOrder": track.get("StreamOrder", {}),
-                        "ID": track.get("ID", {}),
-                        "UniqueID": track.get("UniqueID", {}),
-                        "Format": track.get("Format", {}),
-                        "CodecID": track.get("CodecID", {}),
-                        "Duration": track.get("Duration", {}),
-                        "BitRate": track.get("BitRate", {}),
-                        "FrameRate": track.get("FrameRate", {}),
-                        "FrameCount": track.get("FrameCount", {}),
-                        "ElementCount": track.get("ElementCount", {}),
-                        "StreamSize": track.get("StreamSize", {}),
-                        "Title": track.get("Title", {}),
-                        "Language": track.get("Language", {}),
-                        "Default": track.get("Default", {}),
-                        "Forced": track.get("Forced", {}),
-                    }
-                )
-            elif track_type == "Menu":
-                media_tracks.append(
-                    {
-                        "@type": track_type,
-                        "extra": track.get("extra", {}),
-                    }
-                )
-        return filtered
+    variant = "dvd" if is_dvd else "default"
+    cached = mediainfo_cache.get(video, variant)
+    if cached is not None:
+        if debug:
+            console.print("[bold yellow]Using cached MediaInfo...")
+        return await write_mediainfo_exports(video, folder_id, base_dir, cached[0], cached[1], debug=debug)
 
     mediainfo_cmd = None
     mediainfo_config = None
@@ -408,9 +482,9 @@ async def exportInfo(
 
     if debug:
         console.print("[bold yellow]Exporting MediaInfo...")
-    if not isdir:
-        os.chdir(os.path.dirname(video))
 
+    # Standard MediaInfo output for a DVD is a fallback and must not be cached as the "dvd" variant
+    specialized_text = specialized_json = False
     if mediainfo_cmd and is_dvd:
         result = None
         try:
@@ -422,6 +496,7 @@ async def exportInfo(
 
             if result.returncode == 0 and result.stdout:
                 media_info = result.stdout
+                specialized_text = True
             else:
                 raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
 
@@ -443,14 +518,7 @@ async def exportInfo(
         media_info = MediaInfo.parse(video, output="STRING", full=False)
 
     # Filter out unwanted lines from media info regardless of type
-    filtered_media_info = "\n".join(line for line in media_info.splitlines() if not line.strip().startswith("ReportBy") and not line.strip().startswith("Report created by "))
-
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt", "w", newline="", encoding="utf-8") as export:
-        await export.write(filtered_media_info.replace(video, os.path.basename(video)))
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MEDIAINFO_CLEANPATH.txt", "w", newline="", encoding="utf-8") as export_cleanpath:
-        await export_cleanpath.write(filtered_media_info.replace(video, os.path.basename(video)))
-    if debug:
-        console.print("[bold green]MediaInfo Exported.")
+    filtered_media_info = filter_mediainfo_text(media_info)
 
     if mediainfo_cmd and is_dvd:
         result: Optional[subprocess.CompletedProcess[str]] = None
@@ -464,6 +532,7 @@ async def exportInfo(
             if result.returncode == 0 and result.stdout:
                 media_info_json = result.stdout
                 media_info_dict = json.loads(media_info_json)
+                specialized_json = True
             else:
                 raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
 
@@ -492,14 +561,10 @@ async def exportInfo(
         media_info_dict = json.loads(media_info_json)
 
     filtered_info = filter_mediainfo(media_info_dict)
+    if not is_dvd or (specialized_text and specialized_json):
+        mediainfo_cache.put(video, filtered_media_info, filtered_info, variant)
 
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", "w", encoding="utf-8") as export:
-        await export.write(json.dumps(filtered_info, indent=4))
-        if debug:
-            console.print(f"[green]JSON file written to: {base_dir}/tmp/{folder_id}/MediaInfo.json[/green]")
-
-    async with aiofiles.open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", encoding="utf-8") as f:
-        mi = cast(dict[str, Any], json.loads(await f.read()))
+    mi = await write_mediainfo_exports(video, folder_id, base_dir, filtered_media_info, filtered_info, debug=debug)
 
     # Cleanup: Reset library configuration if we modified it
     if is_dvd and platform.system().lower() in ["linux", "windows"]:
@@ -0,0 +1,260 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Per-file keyframe index for screenshot selection.
+
+Screenshot timestamps are snapped to the first keyframe at or after each
+candidate time, so every capture seeks straight onto an I-frame and the frame
+type for ``frame_overlay`` is known without running ffmpeg again. All candidates
+are probed with a single ffmpeg run (one seeking input per candidate, decoding
+keyframes only, stopping at the first one), and the results are stored in
+``data/cache/frames/`` under the file's identity (device, inode, size, mtime).
+
+Retakes, a second run for another tracker, or re-uploads reuse the stored
+keyframes, and keyframes that produced a blank image are remembered so later
+selections step past them.
+"""
+import asyncio
+import bisect
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import re
+import time
+from collections.abc import Awaitable, Sequence
+from typing import Any, Callable, Optional, cast
+
+import ffmpeg
+
+from src.console import console
+
+# Seconds read after a candidate time while looking for a keyframe
+PROBE_WINDOW = 12.0
+MAX_AGE = 30 * 24 * 3600
+_MATCH_TOLERANCE = 0.0005
+_SHOWINFO_RE = re.compile(r'\[Parsed_showinfo_(\d+)[^\]]*\].*?pts_time:\s*(-?\d+(?:\.\d+)?)')
+
+RunFfmpeg = Callable[[Any], Awaitable[tuple[Optional[int], bytes, bytes]]]
+
+
+class _FileFrames:
+    """Keyframes seen so far in one file, plus the windows that were fully probed."""
+
+    def __init__(self, data: Optional[dict[str, Any]] = None) -> None:
+        data = data or {}
+        self.keyframes: list[float] = sorted(float(t) for t in data.get('keyframes', []))
+        self.windows: list[tuple[float, float]] = [(float(a), float(b)) for a, b in data.get('windows', [])]
+        self.rejected: set[float] = {float(t) for t in data.get('rejected', [])}
+
+    def add_window(self, start: float, end: float) -> None:
+        """Record that there is no keyframe in [start, end) other than at ``end``; adjacent windows are merged."""
+        merged: list[tuple[float, float]] = []
+        for a, b in sorted([*self.windows, (start, end)]):
+            if merged and a <= merged[-1][1] + _MATCH_TOLERANCE * 4:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        self.windows = merged
+
+    def to_json(self) -> dict[str, Any]:
+        return {'keyframes': self.keyframes, 'windows': [list(w) for w in self.windows], 'rejected': sorted(self.rejected)}
+
+    def add_keyframe(self, ts: float) -> None:
+        ts = round(ts, 6)
+        index = bisect.bisect_left(self.keyframes, ts)
+        if index < len(self.keyframes) and abs(self.keyframes[index] - ts) <= _MATCH_TOLERANCE:
+            return
+        self.keyframes.insert(index, ts)
+
+    def is_keyframe(self, ts: float) -> bool:
+        index = bisect.bisect_left(self.keyframes, ts - _MATCH_TOLERANCE)
+        return index < len(self.keyframes) and abs(self.keyframes[index] - ts) <= _MATCH_TOLERANCE
+
+    def is_rejected(self, ts: float) -> bool:
+        return any(abs(ts - r) <= _MATCH_TOLERANCE for r in self.rejected)
+
+    def lookup(self, ts: float) -> Optional[float]:
+        """First usable keyframe at/after ``ts`` if the index can answer, else None (needs a probe)."""
+        index = bisect.bisect_left(self.keyframes, ts - _MATCH_TOLERANCE)
+        while index < len(self.keyframes):
+            candidate = self.keyframes[index]
+            if candidate - ts > PROBE_WINDOW:
+                break
+            # Only trust a hit when nothing between ts and the keyframe went unprobed
+            if not self._covered(ts, candidate):
+                return None
+            if not self.is_rejected(candidate):
+                return candidate
+            ts = candidate + _MATCH_TOLERANCE * 2
+            index += 1
+        return None
+
+    def _covered(self, start: float, end: float) -> bool:
+        return any(a <= start + _MATCH_TOLERANCE and end <= b + _MATCH_TOLERANCE for a, b in self.windows)
+
+
+class FrameIndex:
+    def __init__(self) -> None:
+        self.enabled = True
+        self.cache_dir: Optional[str] = None
+        self._files: dict[str, tuple[str, _FileFrames]] = {}
+        # Per file, so screenshots of different files never wait on each other's probe
+        self._locks: collections.defaultdict[str, asyncio.Lock] = collections.defaultdict(asyncio.Lock)
+        self._pruned = False
+        self.probes = 0
+
+    def configure(self, config: dict[str, Any], base_dir: str) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        self.enabled = bool(default_cfg.get('keyframe_index', True))
+        self.cache_dir = os.path.join(base_dir, 'data', 'cache', 'frames')
+        self._locks.clear()
+        self._pruned = False
+
+    @staticmethod
+    def _identity(path: str) -> Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return f"{os.path.abspath(path)}|{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def _entry_path(self, identity: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(identity.encode('utf-8')).hexdigest()[:32]}.json")
+
+    @staticmethod
+    def _read_entry(entry_path: str) -> _FileFrames:
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                return _FileFrames(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return _FileFrames()
+
+    @staticmethod
+    def _write_entry(cache_dir: str, entry_path: str, data: dict[str, Any], prune: bool) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(entry_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        if not prune:
+            return
+        cutoff = time.time() - MAX_AGE
+        for name in os.listdir(cache_dir):
+            stale = os.path.join(cache_dir, name)
+            with contextlib.suppress(OSError):
+                if os.path.getmtime(stale) < cutoff:
+                    os.remove(stale)
+
+    async def _load(self, path: str) -> Optional[tuple[str, _FileFrames]]:
+        identity = await asyncio.to_thread(self._identity, path)
+        if identity is None:
+            return None
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == identity:
+            return cached
+        entry_path = self._entry_path(identity)
+        frames = await asyncio.to_thread(self._read_entry, entry_path) if entry_path else _FileFrames()
+        self._files[path] = (identity, frames)
+        return identity, frames
+
+    async def _save(self, identity: str, frames: _FileFrames) -> None:
+        entry_path = self._entry_path(identity)
+        if not entry_path or not self.cache_dir:
+            return
+        # Stale entries are pruned with the first save of a run, not on every save
+        prune = not self._pruned
+        self._pruned = True
+        try:
+            await asyncio.to_thread(self._write_entry, self.cache_dir, entry_path, frames.to_json(), prune)
+        except OSError as e:
+            console.print(f"[yellow]Could not save keyframe index: {e}[/yellow]")
+
+    async def _probe(self, path: str, times: Sequence[float], frames: _FileFrames, run_ffmpeg: RunFfmpeg, meta: dict[str, Any]) -> set[int]:
+        """Find the first keyframe after each of ``times`` with one ffmpeg run."""
+        ffmpeg_module = cast(Any, ffmpeg)
+        outputs = [
+            ffmpeg_module.input(path, ss=f"{ts:.6f}", t=PROBE_WINDOW, skip_frame='nokey')['v:0']
+            .filter('showinfo')
+            .output('-', format='null', vframes=1)
+            for ts in times
+        ]
+        command = ffmpeg_module.merge_outputs(*outputs).global_args('-loglevel', 'info', '-nostats')
+        if meta.get('debug', False):
+            console.print(f"[cyan]Probing keyframes for {len(times)} timestamp(s) in {os.path.basename(path)}[/cyan]")
+        self.probes += 1
+        returncode, _, stderr = await run_ffmpeg(command)
+        if returncode != 0:
+            if meta.get('debug', False):
+                console.print(f"[yellow]Keyframe probe failed ({returncode}); using the estimated timestamps[/yellow]")
+            return set()
+
+        found: dict[int, float] = {}
+        for match in _SHOWINFO_RE.finditer(stderr.decode('utf-8', errors='replace')):
+            index = int(match.group(1))
+            pts_time = float(match.group(2))
+            if index < len(times) and index not in found and pts_time >= 0:
+                found[index] = times[index] + pts_time
+        for index, keyframe in found.items():
+            frames.add_keyframe(keyframe)
+            frames.add_window(times[index], keyframe)
+        return set(found)
+
+    async def align(self, path: str, times: Sequence[float], run_ffmpeg: RunFfmpeg, meta: dict[str, Any]) -> list[float]:
+        """Snap each time to the first usable keyframe at/after it; times that can't be resolved are returned unchanged."""
+        if not self.enabled or not times:
+            return list(times)
+        async with self._locks[path]:
+            loaded = await self._load(path)
+            if loaded is None:
+                return list(times)
+            identity, frames = loaded
+            aligned: list[Optional[float]] = [frames.lookup(ts) for ts in times]
+            unresolved: set[int] = set()
+            probed = False
+            # Further passes step past keyframes that were rejected as blank
+            for _ in range(3):
+                pending = [i for i, ts in enumerate(aligned) if ts is None and i not in unresolved]
+                if not pending:
+                    break
+                probe_times = [self._next_probe_start(frames, times[i]) for i in pending]
+                found = await self._probe(path, probe_times, frames, run_ffmpeg, meta)
+                probed = probed or bool(found)
+                for n, i in enumerate(pending):
+                    aligned[i] = frames.lookup(times[i])
+                    if aligned[i] is None and n not in found:
+                        unresolved.add(i)
+            if probed:
+                await self._save(identity, frames)
+        return [ts if ts is not None else original for ts, original in zip(aligned, times)]
+
+    @staticmethod
+    def _next_probe_start(frames: _FileFrames, ts: float) -> float:
+        # Skip over the part of the window that is already known
+        start = ts
+        for a, b in frames.windows:
+            if a <= start + _MATCH_TOLERANCE and b >= start:
+                start = b + _MATCH_TOLERANCE * 2
+        return start
+
+    def frame_info(self, path: str, ts: float, frame_rate: float) -> Optional[dict[str, Any]]:
+        """Frame info for a timestamp that is a known keyframe, without running ffmpeg."""
+        if not self.enabled:
+            return None
+        cached = self._files.get(path)
+        if cached is None or not cached[1].is_keyframe(ts):
+            return None
+        return {'frame_type': 'I', 'pts_time': ts, 'frame_number': int(ts * frame_rate)}
+
+    async def reject(self, path: str, ts: float) -> None:
+        """Remember a keyframe that produced an unusable (blank) screenshot."""
+        if not self.enabled:
+            return
+        cached = self._files.get(path)
+        if cached is None or not cached[1].is_keyframe(ts):
+            return
+        cached[1].rejected.add(round(ts, 6))
+        await self._save(*cached)
+
+
+frame_index = FrameIndex()
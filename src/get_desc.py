@@ -9,12 +9,13 @@ from typing import Any, Union, cast
 from urllib.parse import ParseResult
 
 import aiofiles
-import httpx
 from jinja2 import Template
 from pymediainfo import MediaInfo
 
 from src.bbcode import BBCODE
 from src.console import console
+from src.exportmi import mediainfo_texts
+from src.http_client import http_client_manager
 from src.languages import languages_manager
 from src.takescreens import TakeScreensManager
 from src.trackers.COMMON import COMMON
@@ -148,7 +149,7 @@ async def gen_desc(
                 path=f"{split[0]}/raw/{split[1]}" if split[0] != "/" else f"/raw{parsed.path}"
             )
             raw_url = urllib.parse.urlunparse(raw)
-            async with httpx.AsyncClient(timeout=20.0) as client:
+            async with http_client_manager.client(timeout=20.0) as client:
                 response = await client.get(raw_url)
             description_link_content = response.text
             cleaned_content = clean_text(description_link_content)
@@ -1255,6 +1256,7 @@ class DescriptionBuilder:
 
         # Second Pass: Process MediaInfo and Write Descriptions
         if len(filelist) > 1:
+            mi_texts = await mediainfo_texts(filelist[1:process_limit], debug=meta.get("debug", False)) if multi_screens != 0 else {}
             for i, file in enumerate(filelist):
                 if i >= process_limit:
                     continue
@@ -1272,9 +1274,11 @@ class DescriptionBuilder:
                 # Write filename in BBCode format with MediaInfo in spoiler if not the first file
                 if multi_screens != 0:
                     if i > 0 and char_count < max_char_limit:
-                        mi_dump = MediaInfo.parse(
-                            file, output="STRING", full=False, mediainfo_options={"inform_version": "1"}
-                        )
+                        mi_dump = mi_texts.get(file)
+                        if mi_dump is None:
+                            mi_dump = MediaInfo.parse(
+                                file, output="STRING", full=False, mediainfo_options={"inform_version": "1"}
+                            )
                         parsed_mediainfo = self.parser.parse_mediainfo(str(mi_dump))
                         formatted_bbcode = self.parser.format_bbcode(parsed_mediainfo)
                         desc_parts.append(
@@ -1,11 +1,7 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
-import json
-import os
 import sys
-import time
 from collections.abc import Mapping
-from pathlib import Path
 from types import MappingProxyType
 from typing import Any, Optional, cast
 from urllib.parse import urlparse
@@ -17,6 +13,7 @@ import requests
 from src.btnid import BtnIdManager
 from src.cleanup import cleanup_manager
 from src.console import console
+from src.rate_limit import rate_limiter
 from src.trackermeta import TrackerMetaManager
 from src.trackersetup import tracker_class_map
 
@@ -37,35 +34,17 @@ class TrackerDataManager:
     def get_tracker_config(self, tracker_name: str) -> Mapping[str, Any]:
         return self.trackers_config.get(tracker_name, MappingProxyType({}))
 
-    async def get_tracker_timestamps(self, base_dir: Optional[str] = None) -> dict[str, float]:
-        """Get tracker timestamps from the log file"""
-        timestamp_file = os.path.join(f"{base_dir}", "data", "banned", "tracker_timestamps.json")
-        try:
-            if os.path.exists(timestamp_file):
-                timestamps_text = await asyncio.to_thread(Path(timestamp_file).read_text)
-                return cast(dict[str, float], json.loads(timestamps_text))
-            return {}
-        except Exception as e:
-            console.print(f"[yellow]Warning: Could not load tracker timestamps: {e}[/yellow]")
-            return {}
+    @staticmethod
+    def _search_key(tracker_name: str) -> tuple[str, float]:
+        return f"tracker-search:{tracker_name}", 60.0 if tracker_name == "PTP" else 15.0
 
     async def save_tracker_timestamp(self, tracker_name: str, base_dir: Optional[str] = None, debug: bool = False) -> None:
-        """Save timestamp for when tracker was processed"""
-        timestamp_file = os.path.join(f"{base_dir}", "data", "banned", "tracker_timestamps.json")
-        try:
-            os.makedirs(f"{base_dir}/data/banned", exist_ok=True)
-
-            timestamps = await self.get_tracker_timestamps(base_dir)
-            timestamps[tracker_name] = time.time()
-
-            timestamps_text = json.dumps(timestamps, indent=2)
-            await asyncio.to_thread(Path(timestamp_file).write_text, timestamps_text)
-
-            if debug:
-                console.print(f"[yellow]Saved timestamp for {tracker_name} - will be available again in 60 seconds[/yellow]")
-
-        except Exception as e:
-            console.print(f"[red]Error saving tracker timestamp: {e}[/red]")
+        """Start the search cooldown for a tracker that was just queried"""
+        _ = base_dir
+        key, cooldown_seconds = self._search_key(tracker_name)
+        await rate_limiter.consume(key, cooldown_seconds)
+        if debug:
+            console.print(f"[yellow]Search cooldown started for {tracker_name} - will be available again in {cooldown_seconds:.0f} seconds[/yellow]")
 
     async def get_available_trackers(
         self,
@@ -73,22 +52,16 @@ class TrackerDataManager:
         base_dir: Optional[str] = None,
         debug: bool = False,
     ) -> tuple[list[str], list[tuple[str, float]]]:
-        """Get trackers that are available (60+ seconds since last processed)"""
-        _ = debug
-        timestamps = await self.get_tracker_timestamps(base_dir)
-        current_time = time.time()
+        """Get trackers whose search cooldown has passed (60s for PTP, 15s for the rest)"""
+        _ = base_dir, debug
         available: list[str] = []
         waiting: list[tuple[str, float]] = []
 
         for tracker in specific_trackers:
-            cooldown_seconds = 60 if tracker == "PTP" else 15
-            last_processed = timestamps.get(tracker, 0)
-            time_since_last = current_time - last_processed
-
-            if time_since_last >= cooldown_seconds:
+            wait_time = await rate_limiter.ready_in(*self._search_key(tracker))
+            if wait_time <= 0:
                 available.append(tracker)
             else:
-                wait_time = cooldown_seconds - time_since_last
                 waiting.append((tracker, wait_time))
 
         return available, waiting
@@ -0,0 +1,73 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Shared, memoized guessit parser.
+
+The same release or file name is run through guessit several times per job
+(prep, name building, season/episode, tags, edition, region, source, the TMDb
+and IMDb fallbacks), and a season queue repeats the folder name for every
+episode. ``guessit_fn`` parses each distinct (name, options) pair once per
+process and hands out copies of the stored result, so callers can still edit
+what they get back without affecting later lookups.
+"""
+import collections
+import json
+import threading
+from typing import Any, Optional, cast
+
+import guessit
+
+from src.console import console
+
+guessit_module: Any = cast(Any, guessit)
+
+# Distinct (name, options) results kept; a full season pack is a few hundred names at most
+MAX_ENTRIES = 2048
+
+
+class GuessitCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[tuple[str, str], dict[str, Any]] = collections.OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(value: str, options: Optional[dict[str, Any]]) -> tuple[str, str]:
+        return value, json.dumps(options, sort_keys=True, default=str) if options else ''
+
+    @staticmethod
+    def _copy(result: dict[str, Any]) -> dict[str, Any]:
+        # guessit values are strings, numbers, dates and babelfish objects, or lists of them
+        return {key: list(cast(list[Any], item)) if isinstance(item, list) else item for key, item in result.items()}
+
+    def guess(self, value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        key = self._key(value, options)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(cached)
+        # Parsed outside the lock; two threads racing on a new name both parse it, which is harmless
+        result = dict(cast(dict[str, Any], guessit_module.guessit(value, dict(options) if options else None)))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._copy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]guessit cache: {self.hits} hits, {self.misses} parsed[/cyan]")
+
+
+guessit_cache = GuessitCache()
+
+
+def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    return guessit_cache.guess(value, options)
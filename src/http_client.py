@@ -0,0 +1,275 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Shared, pooled HTTP client layer.
+
+Every module used to build its own ``httpx.AsyncClient()`` per request, which
+meant a fresh TCP + TLS handshake for every image host call, tracker search and
+metadata lookup. ``http_client_manager.client(...)`` keeps the exact same
+call-site shape (``async with ... as client``) but hands out lightweight
+clients that share one connection pool per (event loop, proxy, TLS) profile.
+
+Per-call state (headers, cookies, timeouts, redirects, base_url, auth) stays on
+the short-lived client, so sessions are still isolated between call sites; only
+the sockets are reused.
+
+Metadata lookups can additionally pass ``cache="tmdb"`` (etc.) to serve
+successful responses from the persistent metadata cache. Requests that do go
+out are paced per host by ``rate_limiter`` (see ``src/rate_limit.py``).
+"""
+import asyncio
+import contextlib
+import json
+import threading
+from typing import Any, Optional, cast
+
+import httpx
+
+from src.console import console
+from src.metadata_cache import metadata_cache
+from src.rate_limit import rate_limiter
+
+# Defaults match httpx's own pool limits, with a longer keep-alive so that
+# connections survive the gaps between upload phases.
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# (loop id, proxy url, verify, http2)
+ProfileKey = tuple[int, Optional[str], bool, bool]
+
+# Response headers that describe the wire encoding rather than the decoded body
+_WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+# Redirects are cached too so lookup endpoints (e.g. TVmaze /lookup) skip the extra hop
+_CACHEABLE_STATUS = {200, 301, 308}
+_CACHED_HEADERS = ('content-type', 'location')
+
+
+class _PoolStats:
+    """Counters for requests sent vs. connections opened by the shared pools."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.pools_created = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            'requests': self.requests,
+            'connections_opened': self.connections_opened,
+            'connections_reused': self.connections_reused,
+            'tls_handshakes': self.tls_handshakes,
+            'pools_created': self.pools_created,
+        }
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Non-owning view over a pooled transport.
+
+    ``httpx.AsyncClient.__aexit__`` closes its transport, so clients are handed
+    this wrapper instead: closing the client leaves the pool (and its
+    keep-alive connections) intact for the next caller.
+    """
+
+    def __init__(self, manager: "HttpClientManager", proxy: Optional[str], verify: bool, cache: Optional[str] = None) -> None:
+        self._manager = manager
+        self._proxy = proxy
+        self._verify = verify
+        self._cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._cache is None or not metadata_cache.enabled:
+            return await self._send(request)
+
+        key = metadata_cache.make_key(self._cache, request.method, str(request.url), await request.aread())
+        cached = metadata_cache.get_raw(self._cache, key)
+        if cached is not None:
+            envelope, _, body = cached.partition(b'\n')
+            try:
+                status, headers = cast(tuple[int, dict[str, str]], tuple(json.loads(envelope)))
+                return httpx.Response(status, headers=headers, content=body, request=request)
+            except (ValueError, TypeError):
+                pass
+
+        response = await self._send(request)
+        if response.status_code not in _CACHEABLE_STATUS:
+            return response
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        kept = {name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers}
+        metadata_cache.set_raw(self._cache, key, json.dumps([response.status_code, kept]).encode('utf-8') + b'\n' + body)
+        headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() not in _WIRE_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        # Resolve the pool per request so long-lived clients (tracker sessions built in
+        # __init__, outside any loop) always use a pool owned by the running loop.
+        pool = self._manager.get_pool(self._proxy, self._verify)
+        stats = self._manager.stats
+        stats.requests += 1
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        await rate_limiter.acquire_for(request.url)
+        response = await pool.handle_async_request(request)
+        rate_limiter.observe(response)
+        return response
+
+    async def aclose(self) -> None:
+        # Pool lifetime is owned by HttpClientManager
+        return None
+
+
+def _environment_proxies() -> dict[str, Optional[str]]:
+    """Proxy map from HTTP(S)_PROXY / ALL_PROXY / NO_PROXY, as httpx would apply it."""
+    try:
+        from httpx._utils import get_environment_proxies  # pyright: ignore[reportPrivateUsage]
+    except ImportError:
+        return {}
+    return get_environment_proxies()
+
+
+class HttpClientManager:
+    """Process-wide registry of pooled httpx transports."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[ProfileKey, httpx.AsyncHTTPTransport] = {}
+        self._pool_loops: dict[ProfileKey, asyncio.AbstractEventLoop] = {}
+        self.stats = _PoolStats()
+        self.max_connections = DEFAULT_MAX_CONNECTIONS
+        self.max_keepalive_connections = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        self.keepalive_expiry = DEFAULT_KEEPALIVE_EXPIRY
+        self.http2 = False
+
+    def configure(self, config: dict[str, Any]) -> None:
+        """Apply pool limits from the DEFAULT config section.
+
+        Only affects pools created afterwards; existing connections keep their limits
+        until the next ``aclose``.
+        """
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        try:
+            self.max_connections = max(1, int(default_cfg.get('http_max_connections', DEFAULT_MAX_CONNECTIONS)))
+        except (TypeError, ValueError):
+            self.max_connections = DEFAULT_MAX_CONNECTIONS
+        try:
+            self.max_keepalive_connections = max(0, int(default_cfg.get('http_max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS)))
+        except (TypeError, ValueError):
+            self.max_keepalive_connections = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        try:
+            self.keepalive_expiry = max(0.0, float(default_cfg.get('http_keepalive_expiry', DEFAULT_KEEPALIVE_EXPIRY)))
+        except (TypeError, ValueError):
+            self.keepalive_expiry = DEFAULT_KEEPALIVE_EXPIRY
+        http2 = bool(default_cfg.get('http2', False))
+        if http2:
+            try:
+                import h2  # noqa: F401  # pyright: ignore[reportMissingImports,reportUnusedImport]
+            except ImportError:
+                console.print("[yellow]http2 is enabled in config but the 'h2' package is not installed, using HTTP/1.1[/yellow]")
+                http2 = False
+        self.http2 = http2
+
+    def get_pool(self, proxy: Optional[str], verify: bool) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        key: ProfileKey = (id(loop), proxy, verify, self.http2)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None and self._pool_loops.get(key) is loop:
+                return pool
+            pool = httpx.AsyncHTTPTransport(
+                verify=verify,
+                http2=self.http2,
+                proxy=proxy,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._pools[key] = pool
+            self._pool_loops[key] = loop
+            self.stats.pools_created += 1
+            return pool
+
+    def client(
+        self,
+        *,
+        proxy: Optional[str] = None,
+        verify: bool = True,
+        trust_env: bool = True,
+        cache: Optional[str] = None,
+        **kwargs: Any,
+    ) -> httpx.AsyncClient:
+        """Return an ``httpx.AsyncClient`` backed by the shared pool.
+
+        Accepts the same keyword arguments as ``httpx.AsyncClient`` (headers, cookies,
+        timeout, follow_redirects, ...). Safe to call outside an event loop; the pool is
+        picked when the first request is sent.
+
+        ``cache`` names a metadata source (see ``metadata_cache.SOURCE_TTLS``); every
+        200 response is then cached by method + URL + body. Only use it for read-only
+        lookups, including POSTed GraphQL queries.
+        """
+        if 'transport' in kwargs or 'mounts' in kwargs:
+            raise TypeError("transport/mounts are managed by HttpClientManager")
+
+        mounts: dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+        if proxy is None and trust_env:
+            for pattern, env_proxy in _environment_proxies().items():
+                mounts[pattern] = _SharedTransport(self, env_proxy, verify, cache)
+
+        return httpx.AsyncClient(
+            transport=_SharedTransport(self, proxy, verify, cache),
+            mounts=mounts or None,
+            trust_env=trust_env,
+            **kwargs,
+        )
+
+    async def aclose(self) -> None:
+        """Close pools owned by the running loop and drop pools from dead loops."""
+        try:
+            current_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        with self._lock:
+            pools = list(self._pools.items())
+            loops = dict(self._pool_loops)
+            self._pools.clear()
+            self._pool_loops.clear()
+
+        for key, pool in pools:
+            owner = loops.get(key)
+            if owner is current_loop:
+                with contextlib.suppress(Exception):
+                    await pool.aclose()
+            elif owner is not None and not owner.is_closed():
+                # Pool belongs to another live loop (e.g. a web UI worker thread); keep it
+                with self._lock:
+                    self._pools.setdefault(key, pool)
+                    self._pool_loops.setdefault(key, owner)
+
+    def print_stats(self) -> None:
+        stats = self.stats.as_dict()
+        console.print(
+            f"[cyan]HTTP pool: {stats['requests']} requests, {stats['connections_opened']} connections opened, "
+            f"{stats['connections_reused']} reused, {stats['tls_handshakes']} TLS handshakes[/cyan]"
+        )
+
+
+http_client_manager = HttpClientManager()
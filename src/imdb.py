@@ -5,23 +5,18 @@ import sys
 from collections.abc import Mapping
 from datetime import datetime, timezone
 from difflib import SequenceMatcher
-from typing import Any, Callable, Optional, Union, cast
+from typing import Any, Optional, Union, cast
 
 import anitopy
 import cli_ui
-import guessit
 import httpx
 
 from src.cleanup import cleanup_manager
 from src.console import console
+from src.guessit_cache import guessit_fn
+from src.http_client import http_client_manager
 
 anitopy_parse_fn: Any = cast(Any, anitopy).parse
-guessit_module: Any = cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return cast(dict[str, Any], guessit_module.guessit(value, options))
 
 
 class ImdbManager:
@@ -268,7 +263,7 @@ class ImdbManager:
             """
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client_manager.client(cache="imdb") as client:
             try:
                 response = await client.post(
                     "https://api.graphql.imdb.com/",
@@ -574,7 +569,7 @@ class ImdbManager:
             }
 
             try:
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client(cache="imdb") as client:
                     response = await client.post(url, json=query, headers={"Content-Type": "application/json"}, timeout=10)
                     response.raise_for_status()
                     data = response.json()
@@ -944,7 +939,7 @@ class ImdbManager:
             """
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client_manager.client(cache="imdb") as client:
             try:
                 response = await client.post(
                     "https://api.graphql.imdb.com/",
@@ -0,0 +1,300 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Persistent filename index for library searches (Discord ``search_dir``, Web UI browse search).
+
+Walking a large NAS on every query is slow, so each root is indexed once and the
+tree is kept in ``data/cache/library_index.json``. A refresh only stats the known
+directories and re-lists those whose mtime changed, so keeping the index fresh
+costs far less than the original full walk. Refreshes run in a background thread
+once the index is older than ``REFRESH_INTERVAL``; queries are always answered
+from the last complete snapshot.
+
+Names are tokenized on whitespace, dots, dashes and underscores, and an inverted
+token index narrows whole-token queries down to a handful of candidates.
+"""
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional
+
+from src.console import console
+
+REFRESH_INTERVAL = 300
+_TOKEN_SEP_RE = re.compile(r'[\s.\-_]+')
+_INDEX_VERSION = 1
+
+
+def tokenize(name: str) -> list[str]:
+    return [t for t in _TOKEN_SEP_RE.split(name.lower()) if t]
+
+
+def ordered_tokens_match(query_tokens: Sequence[str], name_tokens: Sequence[str]) -> bool:
+    """Check if query tokens appear as whole-word ordered subsequence in the name tokens."""
+    pos = 0
+    for qt in query_tokens:
+        found = False
+        while pos < len(name_tokens):
+            if name_tokens[pos] == qt:
+                pos += 1
+                found = True
+                break
+            pos += 1
+        if not found:
+            return False
+    return True
+
+
+class IndexEntry:
+    __slots__ = ('hidden', 'is_dir', 'lower_name', 'name', 'path', 'tokens')
+
+    def __init__(self, path: str, name: str, is_dir: bool, hidden: bool) -> None:
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.hidden = hidden
+        self.lower_name = name.lower()
+        self.tokens = tokenize(name)
+
+
+class _Dir:
+    """Listing of one directory as of ``mtime_ns``: child dirs as (name, is_symlink) and file names."""
+
+    __slots__ = ('dirs', 'files', 'mtime_ns')
+
+    def __init__(self, mtime_ns: int, dirs: list[tuple[str, bool]], files: list[str]) -> None:
+        self.mtime_ns = mtime_ns
+        self.dirs = dirs
+        self.files = files
+
+
+class _RootIndex:
+    def __init__(self, root: str, dirs: dict[str, _Dir], built_at: float) -> None:
+        self.root = root
+        self.dirs = dirs
+        self.built_at = built_at
+        self.entries: list[IndexEntry] = []
+        self.postings: dict[str, list[int]] = {}
+        for rel, listing in dirs.items():
+            dir_path = os.path.join(root, rel) if rel else root
+            parent_hidden = any(part.startswith('.') for part in rel.split(os.sep) if part)
+            for name, _is_link in listing.dirs:
+                self._add(IndexEntry(os.path.join(dir_path, name), name, True, parent_hidden or name.startswith('.')))
+            for name in listing.files:
+                self._add(IndexEntry(os.path.join(dir_path, name), name, False, parent_hidden or name.startswith('.')))
+
+    def _add(self, entry: IndexEntry) -> None:
+        index = len(self.entries)
+        self.entries.append(entry)
+        for token in set(entry.tokens):
+            self.postings.setdefault(token, []).append(index)
+
+    def candidates(self, query_tokens: Sequence[str]) -> Iterable[IndexEntry]:
+        lists: list[list[int]] = []
+        for token in set(query_tokens):
+            postings = self.postings.get(token)
+            if postings is None:
+                return []
+            lists.append(postings)
+        lists.sort(key=len)
+        matched = set(lists[0])
+        for postings in lists[1:]:
+            matched.intersection_update(postings)
+            if not matched:
+                return []
+        return (self.entries[i] for i in sorted(matched))
+
+
+def _scan(root: str, previous: dict[str, _Dir]) -> tuple[dict[str, _Dir], bool]:
+    """Walk ``root`` reusing unchanged directory listings from ``previous``."""
+    dirs: dict[str, _Dir] = {}
+    changed = False
+    stack = ['']
+    while stack:
+        rel = stack.pop()
+        full = os.path.join(root, rel) if rel else root
+        try:
+            mtime_ns = os.stat(full).st_mtime_ns
+        except OSError:
+            continue
+        listing = previous.get(rel)
+        if listing is None or listing.mtime_ns != mtime_ns:
+            listing = _list_dir(full, mtime_ns)
+            changed = True
+        dirs[rel] = listing
+        # Like os.walk: symlinked directories are listed but not descended into
+        stack.extend(os.path.join(rel, name) for name, is_link in reversed(listing.dirs) if not is_link)
+    return dirs, changed or dirs.keys() != previous.keys()
+
+
+def _list_dir(path: str, mtime_ns: int) -> _Dir:
+    dirs: list[tuple[str, bool]] = []
+    files: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                is_dir = _is_dir(entry)
+                if is_dir:
+                    dirs.append((entry.name, entry.is_symlink()))
+                elif is_dir is not None:
+                    files.append(entry.name)
+    except OSError:
+        pass
+    return _Dir(mtime_ns, dirs, files)
+
+
+def _is_dir(entry: os.DirEntry[str]) -> Optional[bool]:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return None
+
+
+class LibraryIndex:
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self.cache_path = cache_path or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache', 'library_index.json')
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._roots: dict[str, _RootIndex] = {}
+        self._persisted: Optional[dict[str, Any]] = None
+        self._refreshing: dict[str, threading.Thread] = {}
+
+    def _load_persisted(self, root: str) -> Optional[_RootIndex]:
+        if self._persisted is None:
+            self._persisted = {}
+            try:
+                with open(self.cache_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get('version') == _INDEX_VERSION and isinstance(data.get('roots'), dict):
+                    self._persisted = data['roots']
+            except (OSError, ValueError):
+                pass
+        stored = self._persisted.pop(root, None)
+        if not isinstance(stored, dict):
+            return None
+        try:
+            dirs = {
+                rel: _Dir(int(value[0]), [(str(name), bool(is_link)) for name, is_link in value[1]], [str(name) for name in value[2]])
+                for rel, value in stored['dirs'].items()
+            }
+            return _RootIndex(root, dirs, float(stored['built_at']))
+        except (KeyError, TypeError, ValueError, IndexError):
+            return None
+
+    def _save(self) -> None:
+        with self._lock:
+            roots = dict(self._roots)
+            # Keep roots from the previous run that haven't been queried yet
+            stored: dict[str, Any] = dict(self._persisted or {})
+        stored.update({
+            root: {
+                'built_at': index.built_at,
+                'dirs': {rel: [d.mtime_ns, [[name, int(is_link)] for name, is_link in d.dirs], d.files] for rel, d in index.dirs.items()},
+            }
+            for root, index in roots.items()
+        })
+        payload: dict[str, Any] = {'version': _INDEX_VERSION, 'roots': stored}
+        tmp_path = f"{self.cache_path}.tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, separators=(',', ':'))
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                console.print(f"[yellow]Could not save library index: {e}[/yellow]")
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+    def refresh(self, root: str) -> None:
+        """Rescan ``root`` now, re-listing only directories whose mtime changed."""
+        with self._lock:
+            current = self._roots.get(root)
+        dirs, changed = _scan(root, current.dirs if current is not None else {})
+        index = _RootIndex(root, dirs, time.time()) if changed or current is None else current
+        index.built_at = time.time()
+        with self._lock:
+            self._roots[root] = index
+        if changed:
+            self._save()
+
+    def _refresh_in_background(self, root: str) -> threading.Thread:
+        with self._lock:
+            thread = self._refreshing.get(root)
+            if thread is not None and thread.is_alive():
+                return thread
+
+            def run() -> None:
+                try:
+                    self.refresh(root)
+                except Exception as e:
+                    console.print(f"[yellow]Library index refresh failed for {root}: {e}[/yellow]")
+                finally:
+                    with self._lock:
+                        self._refreshing.pop(root, None)
+
+            thread = threading.Thread(target=run, name=f"library-index:{root}", daemon=True)
+            self._refreshing[root] = thread
+            thread.start()
+            return thread
+
+    def warm(self, roots: Iterable[str]) -> None:
+        """Start building/refreshing the index for ``roots`` without waiting for it."""
+        for root in roots:
+            root = os.path.abspath(root)
+            if os.path.isdir(root):
+                self._root_index(root, wait=False)
+
+    def _root_index(self, root: str, wait: bool = True) -> Optional[_RootIndex]:
+        with self._lock:
+            index = self._roots.get(root)
+            if index is None:
+                index = self._load_persisted(root)
+                if index is not None:
+                    self._roots[root] = index
+        if index is None:
+            # Nothing to answer from yet; the first build has to finish before we can
+            thread = self._refresh_in_background(root)
+            if not wait:
+                return None
+            thread.join()
+            with self._lock:
+                return self._roots.get(root)
+        if time.time() - index.built_at > REFRESH_INTERVAL:
+            self._refresh_in_background(root)
+        return index
+
+    def _indexes(self, roots: Iterable[str]) -> list[_RootIndex]:
+        indexes: list[_RootIndex] = []
+        for root in roots:
+            root = os.path.abspath(root)
+            if not os.path.isdir(root):
+                continue
+            index = self._root_index(root)
+            if index is not None:
+                indexes.append(index)
+        return indexes
+
+    def search_tokens(self, roots: Iterable[str], query_tokens: Sequence[str], include_hidden: bool = False) -> Iterable[IndexEntry]:
+        """Entries whose name contains ``query_tokens`` as an ordered whole-token subsequence."""
+        if not query_tokens:
+            return
+        for index in self._indexes(roots):
+            for entry in index.candidates(query_tokens):
+                if entry.hidden and not include_hidden:
+                    continue
+                if ordered_tokens_match(query_tokens, entry.tokens):
+                    yield entry
+
+    def search_words(self, roots: Iterable[str], words: Sequence[str], is_dir: bool) -> Iterable[IndexEntry]:
+        """Entries whose lower-cased name contains every word as a substring."""
+        for index in self._indexes(roots):
+            for entry in index.entries:
+                if entry.is_dir == is_dir and all(word in entry.lower_name for word in words):
+                    yield entry
+
+
+library_index = LibraryIndex()
@@ -0,0 +1,158 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Batched hardlink/symlink creation.
+
+Linking a release for a torrent client (per-tracker link folders, cross-seed
+trees) or into the Emby library is planned first: every source/destination pair
+is collected in one pass, then the destination directories are created and the
+links made by a few worker threads in batches, instead of one thread hop per
+``makedirs``/``link`` call. A file that can't be linked is recorded and the rest
+of the plan still runs; the caller decides whether a partial result is usable.
+
+With ``reflink_fallback``, a failed hardlink is retried as a copy-on-write clone
+(Linux FICLONE: btrfs, XFS, bcachefs), which shares the data blocks without
+sharing the inode, e.g. when a file already has the maximum number of links.
+"""
+import asyncio
+import contextlib
+import os
+import platform
+from typing import Optional
+
+from src.console import console
+
+# Links made per worker-thread call, and worker threads per plan
+BATCH_SIZE = 256
+MAX_WORKERS = 4
+# ioctl request number of FICLONE (linux/fs.h)
+_FICLONE = 0x40049409
+
+
+class LinkResult:
+    def __init__(self) -> None:
+        self.linked = 0
+        self.reflinked = 0
+        self.existing = 0
+        self.failed: list[tuple[str, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def merge(self, other: 'LinkResult') -> None:
+        self.linked += other.linked
+        self.reflinked += other.reflinked
+        self.existing += other.existing
+        self.failed.extend(other.failed)
+
+    def print_failures(self, kind: str, limit: int = 10) -> None:
+        for label, error in self.failed[:limit]:
+            console.print(f"[yellow]{kind} failed for file {label}: {error}")
+        if len(self.failed) > limit:
+            console.print(f"[yellow]... and {len(self.failed) - limit} more files could not be linked")
+
+
+def _reflink(src: str, dst: str) -> None:
+    import fcntl
+
+    with open(src, 'rb') as source, open(dst, 'xb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            with contextlib.suppress(OSError):
+                os.remove(dst)
+            raise
+
+
+class LinkPlan:
+    def __init__(self, mode: str = 'hardlink', reflink_fallback: bool = False) -> None:
+        if mode not in ('hardlink', 'symlink'):
+            raise ValueError(f"Unknown link mode: {mode}")
+        self.mode = mode
+        self.reflink_fallback = reflink_fallback and mode == 'hardlink' and platform.system() == 'Linux'
+        self._ops: list[tuple[str, str, str]] = []
+        self._dirs: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def add_file(self, src: str, dst: str, label: Optional[str] = None) -> None:
+        self._ops.append((src, dst, label or os.path.basename(dst)))
+        parent = os.path.dirname(dst)
+        if parent:
+            self._dirs.add(parent)
+
+    def add_dir(self, path: str) -> None:
+        self._dirs.add(path)
+
+    def add_tree(self, src_dir: str, dst_dir: str) -> None:
+        """Plan a link for every file under ``src_dir`` at the same relative path under ``dst_dir``. Walks the disk, so run it off the event loop."""
+        self.add_dir(dst_dir)
+        for root, _dirs, files in os.walk(src_dir):
+            for file in files:
+                src_path = os.path.join(root, file)
+                rel_path = os.path.relpath(src_path, src_dir)
+                self.add_file(src_path, os.path.join(dst_dir, rel_path), rel_path)
+
+    def _link(self, src: str, dst: str) -> bool:
+        """Create one link; returns True when it had to be a reflink."""
+        if self.mode == 'symlink':
+            if platform.system() == "Windows":
+                os.symlink(src, dst, target_is_directory=False)
+            else:
+                os.symlink(src, dst)
+            return False
+        try:
+            os.link(src, dst)
+            return False
+        except FileExistsError:
+            raise
+        except OSError:
+            if not self.reflink_fallback:
+                raise
+        _reflink(src, dst)
+        return True
+
+    def _run_batch(self, ops: list[tuple[str, str, str]]) -> LinkResult:
+        result = LinkResult()
+        for src, dst, label in ops:
+            try:
+                if self._link(src, dst):
+                    result.reflinked += 1
+                else:
+                    result.linked += 1
+            except FileExistsError:  # noqa: PERF203 - one bad file must not stop the batch
+                result.existing += 1
+            except OSError as e:
+                result.failed.append((label, str(e)))
+        return result
+
+    def _make_dirs(self) -> None:
+        # Parents sort before their children, so each makedirs only creates the last level
+        for path in sorted(self._dirs):
+            # A directory that can't be created shows up as failures of the links inside it
+            with contextlib.suppress(OSError):
+                os.makedirs(path, exist_ok=True)
+
+    def execute(self) -> LinkResult:
+        """Run the whole plan in the calling thread."""
+        self._make_dirs()
+        return self._run_batch(self._ops)
+
+    async def run(self) -> LinkResult:
+        """Run the plan in batches on worker threads."""
+        await asyncio.to_thread(self._make_dirs)
+        result = LinkResult()
+        if not self._ops:
+            return result
+        batches = [self._ops[i:i + BATCH_SIZE] for i in range(0, len(self._ops), BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(MAX_WORKERS)
+
+        async def run_batch(batch: list[tuple[str, str, str]]) -> LinkResult:
+            async with semaphore:
+                return await asyncio.to_thread(self._run_batch, batch)
+
+        for batch_result in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+            result.merge(batch_result)
+        return result
@@ -0,0 +1,141 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Cache of filtered MediaInfo output.
+
+``exportInfo`` keeps the filtered text report and the filtered JSON for every
+file it parses in ``data/cache/mediainfo.sqlite3``, keyed on the file's path and
+identity (device, inode, size, mtime). Re-running a failed upload, a ``--queue``
+pass over the same library, or a tracker that lists MediaInfo for every episode
+of a pack then reads the stored output instead of parsing the file again.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, cast
+
+from src.console import console
+
+# Entries not used for this long are dropped when the database is opened
+MAX_AGE = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mediainfo (
+    file_key TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    text TEXT NOT NULL,
+    json TEXT NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (file_key, variant)
+)
+"""
+
+
+class MediaInfoCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, config: dict[str, Any], base_dir: str) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        self.enabled = bool(default_cfg.get('mediainfo_cache', True))
+        db_path = os.path.join(base_dir, 'data', 'cache', 'mediainfo.sqlite3')
+        if db_path != self._db_path:
+            self.close()
+            self._db_path = db_path
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        if not self._db_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute("DELETE FROM mediainfo WHERE accessed < ?", (time.time() - MAX_AGE,))
+            conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            console.print(f"[yellow]MediaInfo cache unavailable, continuing without it: {e}[/yellow]")
+            self.enabled = False
+            return None
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def file_key(path: str) -> Optional[str]:
+        # The text report embeds the complete path, so the path is part of the key
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return f"{os.path.abspath(path)}|{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def get(self, path: str, variant: str = 'default') -> Optional[tuple[str, dict[str, Any]]]:
+        """Filtered text and JSON stored for ``path``, or None when the file has to be parsed."""
+        if not self.enabled:
+            return None
+        file_key = self.file_key(path)
+        if file_key is None:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT text, json FROM mediainfo WHERE file_key = ? AND variant = ?", (file_key, variant)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE mediainfo SET accessed = ? WHERE file_key = ? AND variant = ?", (time.time(), file_key, variant))
+                conn.commit()
+            except sqlite3.Error:
+                return None
+        try:
+            data = json.loads(row[1])
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        self.hits += 1
+        return str(row[0]), cast(dict[str, Any], data)
+
+    def put(self, path: str, text: str, data: dict[str, Any], variant: str = 'default') -> None:
+        if not self.enabled:
+            return
+        file_key = self.file_key(path)
+        if file_key is None:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO mediainfo (file_key, variant, text, json, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (file_key, variant, text, json.dumps(data, separators=(',', ':')), time.time()),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                with contextlib.suppress(sqlite3.Error):
+                    conn.rollback()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    self._conn.close()
+                self._conn = None
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]MediaInfo cache: {self.hits} hits, {self.misses} parsed[/cyan]")
+
+
+mediainfo_cache = MediaInfoCache()
@@ -0,0 +1,199 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Persistent response cache for metadata lookups (TMDB, IMDb, TVDB, TVmaze).
+
+Queue runs and season packs resolve the same series over and over; this keeps
+successful lookups in ``data/cache/metadata.sqlite3`` so the network is hit once
+per series instead of once per file. Entries expire after a per-source TTL and
+the least recently used ones are evicted once the database grows past
+``metadata_cache_max_mb``.
+
+HTTP lookups are cached transparently by passing ``cache="<source>"`` to
+``http_client_manager.client(...)``; library-backed lookups (TVDB) call
+``get``/``set`` directly.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, cast
+
+from src.console import console
+
+DEFAULT_MAX_MB = 128
+
+# Seconds before an entry is considered stale. Episode lists change as seasons
+# air, so they expire faster than movie/series metadata.
+SOURCE_TTLS: dict[str, int] = {
+    'tmdb': 3 * 24 * 3600,
+    'imdb': 3 * 24 * 3600,
+    'anilist': 7 * 24 * 3600,
+    'tvdb': 24 * 3600,
+    'tvmaze': 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+class MetadataCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self._total_size = 0
+        self.enabled = True
+        self.refresh = False
+        self.max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, config: dict[str, Any], base_dir: str) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        self.enabled = bool(default_cfg.get('metadata_cache', True))
+        try:
+            self.max_bytes = max(1, int(default_cfg.get('metadata_cache_max_mb', DEFAULT_MAX_MB))) * 1024 * 1024
+        except (TypeError, ValueError):
+            self.max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+        db_path = os.path.join(base_dir, 'data', 'cache', 'metadata.sqlite3')
+        if db_path != self._db_path:
+            self.close()
+            self._db_path = db_path
+
+    def set_mode(self, no_cache: bool = False, refresh_cache: bool = False) -> None:
+        """Apply --no-cache (skip reads and writes) / --refresh-cache (skip reads only)."""
+        if no_cache:
+            self.enabled = False
+        self.refresh = refresh_cache
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        if not self._db_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            # Drop anything that can never be served again
+            now = time.time()
+            for source, ttl in SOURCE_TTLS.items():
+                conn.execute("DELETE FROM entries WHERE source = ? AND created < ?", (source, now - ttl))
+            conn.commit()
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._total_size = int(row[0]) if row else 0
+        except (sqlite3.Error, OSError) as e:
+            console.print(f"[yellow]Metadata cache unavailable, continuing without it: {e}[/yellow]")
+            self.enabled = False
+            return None
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(source: str, *parts: Any) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return f"{source}:{digest.hexdigest()}"
+
+    def get_raw(self, source: str, key: str) -> Optional[bytes]:
+        if not self.enabled or self.refresh:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None or time.time() - float(row[1]) > SOURCE_TTLS.get(source, DEFAULT_TTL):
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+            except sqlite3.Error:
+                return None
+            self.hits += 1
+            return bytes(row[0])
+
+    def set_raw(self, source: str, key: str, value: bytes) -> None:
+        if not self.enabled:
+            return
+        size = len(value)
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            now = time.time()
+            try:
+                old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, source, value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, source, sqlite3.Binary(value), size, now, now),
+                )
+                self._total_size += size - (int(old[0]) if old else 0)
+                if self._total_size > self.max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error:
+                with contextlib.suppress(sqlite3.Error):
+                    conn.rollback()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Trim to 90% so we don't evict on every subsequent write
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall()
+        evict: list[tuple[str]] = []
+        for key, size in rows:
+            if self._total_size <= target:
+                break
+            evict.append((key,))
+            self._total_size -= int(size)
+        conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+
+    def get(self, source: str, *parts: Any) -> Any:
+        raw = self.get_raw(source, self.make_key(source, *parts))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set(self, source: str, value: Any, *parts: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            raw = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        except (TypeError, ValueError):
+            return
+        self.set_raw(source, self.make_key(source, *parts), raw)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    self._conn.close()
+                self._conn = None
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]Metadata cache: {self.hits} hits, {self.misses} misses[/cyan]")
+
+
+metadata_cache = MetadataCache()
@@ -3,12 +3,12 @@ import asyncio
 import datetime
 import os
 import re
-import subprocess
 from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import Any, Optional, cast
 
 from src.console import console
+from src.link_plan import LinkPlan
 
 Meta = dict[str, Any]
 
@@ -297,59 +297,23 @@ class NfoLinkManager:
                 return None
 
             # Handle single file vs folder content
+            plan = LinkPlan('symlink')
             if len(filelist) == 1 and os.path.isfile(filelist[0]) and not meta.get('keep_folder'):
                 # Single file - create symlink in the target folder
                 src_file = filelist[0]
-                filename = os.path.basename(src_file)
-                target_file = os.path.join(target_dir, filename)
-
-                try:
-                    cmd = ['cmd', '/c', 'mklink', target_file, src_file] if os.name == 'nt' else ['ln', '-s', src_file, target_file]
-                    await asyncio.to_thread(
-                        subprocess.run,
-                        cmd,
-                        check=True,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                    )
-
-                    if meta.get('debug'):
-                        console.print(f"[green]Created symlink: {target_file}")
-
-                except subprocess.CalledProcessError:
-                    meta['linking_failed'] = True
-
+                plan.add_file(src_file, os.path.join(target_dir, os.path.basename(src_file)))
             else:
                 # Folder content - symlink all files from the source folder
                 src_dir = path if os.path.isdir(path) else os.path.dirname(path)
-
-                # Get all files in the source directory
-                for root, _dirs, files in os.walk(src_dir):
-                    for file in files:
-                        src_file = os.path.join(root, file)
-                        # Create relative path structure in target
-                        rel_path = os.path.relpath(src_file, src_dir)
-                        target_file = os.path.join(target_dir, rel_path)
-
-                        # Create subdirectories if needed
-                        target_file_dir = os.path.dirname(target_file)
-                        os.makedirs(target_file_dir, exist_ok=True)
-
-                        try:
-                            cmd = ['cmd', '/c', 'mklink', target_file, src_file] if os.name == 'nt' else ['ln', '-s', src_file, target_file]
-                            await asyncio.to_thread(
-                                subprocess.run,
-                                cmd,
-                                check=True,
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL,
-                            )
-
-                            if meta.get('debug'):
-                                console.print(f"[green]Created symlink: {file}")
-
-                        except subprocess.CalledProcessError:
-                            meta['linking_failed'] = True
+                await asyncio.to_thread(plan.add_tree, src_dir, target_dir)
+
+            result = await plan.run()
+            if result.failed:
+                meta['linking_failed'] = True
+                if meta.get('debug'):
+                    result.print_failures("Symlink")
+            if meta.get('debug'):
+                console.print(f"[green]Created {result.linked} symlinks in {target_dir}")
 
             console.print(f"[green]Movie folder created: {target_dir}")
             return target_dir
@@ -0,0 +1,346 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Incremental piece hashing for torrent creation.
+
+Piece hashes are stored per file in ``data/cache/pieces.sqlite3``, keyed on the
+file identity (device, inode, size, mtime) plus the piece size and the file's
+offset within the piece grid. When the same content is hashed again (a failed
+upload retry, ``--keep-folder``, an NFO added to the torrent) only the pieces
+whose bytes can't be attributed to an unchanged file are read from disk; for a
+single-file or disc torrent that is usually nothing at all.
+
+Hashes are recorded from both the torf path and mkbrr output, so a retry can
+skip mkbrr entirely when the cache already covers the content.
+"""
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Callable, Optional, cast
+
+from torf import Torrent
+
+from src.console import console
+
+# Entries not used for this long are dropped when the database is opened
+MAX_AGE = 30 * 24 * 3600
+# Retries may skip mkbrr when at most this fraction of pieces still needs hashing
+MIN_REUSE_COVERAGE = 0.95
+_CALLBACK_INTERVAL = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pieces (
+    file_key TEXT NOT NULL,
+    piece_size INTEGER NOT NULL,
+    phase INTEGER NOT NULL,
+    tail INTEGER NOT NULL,
+    hashes BLOB NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (file_key, piece_size, phase, tail)
+)
+"""
+
+
+class FileSpan:
+    """A file's position in the piece stream and the pieces that lie entirely inside it."""
+
+    __slots__ = ('end', 'file_key', 'first_piece', 'last_piece', 'path', 'phase', 'size', 'start', 'tail')
+
+    def __init__(self, path: str, start: int, size: int, total: int, piece_size: int) -> None:
+        self.path = path
+        self.start = start
+        self.size = size
+        self.end = start + size
+        self.file_key = PieceHashCache.file_key(path, size)
+        self.phase = start % piece_size
+        # The short final piece only belongs to this file when the file ends the torrent
+        self.tail = self.end == total
+        self.first_piece = math.ceil(start / piece_size)
+        self.last_piece = math.ceil(total / piece_size) if self.tail else self.end // piece_size
+        if self.last_piece < self.first_piece:
+            self.last_piece = self.first_piece
+
+    @property
+    def piece_count(self) -> int:
+        return self.last_piece - self.first_piece
+
+
+def plan_layout(files: Sequence[tuple[str, int]], piece_size: int) -> list[FileSpan]:
+    total = sum(size for _, size in files)
+    spans: list[FileSpan] = []
+    offset = 0
+    for path, size in files:
+        spans.append(FileSpan(path, offset, size, total, piece_size))
+        offset += size
+    return spans
+
+
+class PieceHashCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self.enabled = True
+        self.reused = 0
+        self.hashed = 0
+
+    def configure(self, config: dict[str, Any], base_dir: str) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        self.enabled = bool(default_cfg.get('piece_hash_cache', True))
+        db_path = os.path.join(base_dir, 'data', 'cache', 'pieces.sqlite3')
+        if db_path != self._db_path:
+            self.close()
+            self._db_path = db_path
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+        if not self._db_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute("DELETE FROM pieces WHERE accessed < ?", (time.time() - MAX_AGE,))
+            conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            console.print(f"[yellow]Piece hash cache unavailable, continuing without it: {e}[/yellow]")
+            self.enabled = False
+            return None
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def file_key(path: str, expected_size: int) -> Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != expected_size or not st.st_ino:
+            return None
+        return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def lookup(self, span: FileSpan, piece_size: int) -> Optional[bytes]:
+        if not self.enabled or span.file_key is None or span.piece_count == 0:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT hashes FROM pieces WHERE file_key = ? AND piece_size = ? AND phase = ? AND tail = ?",
+                    (span.file_key, piece_size, span.phase, int(span.tail)),
+                ).fetchone()
+                if row is None or len(row[0]) != span.piece_count * 20:
+                    return None
+                conn.execute(
+                    "UPDATE pieces SET accessed = ? WHERE file_key = ? AND piece_size = ? AND phase = ? AND tail = ?",
+                    (time.time(), span.file_key, piece_size, span.phase, int(span.tail)),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                return None
+            return bytes(row[0])
+
+    def store(self, spans: Sequence[FileSpan], piece_size: int, hashes: bytes) -> None:
+        if not self.enabled:
+            return
+        rows = [
+            (span.file_key, piece_size, span.phase, int(span.tail), sqlite3.Binary(hashes[span.first_piece * 20:span.last_piece * 20]), time.time())
+            for span in spans
+            if span.file_key is not None and span.piece_count > 0
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pieces (file_key, piece_size, phase, tail, hashes, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+            except sqlite3.Error:
+                with contextlib.suppress(sqlite3.Error):
+                    conn.rollback()
+
+    def piece_sizes(self, file_key: Optional[str]) -> list[int]:
+        """Piece sizes that have hashes recorded for this file, largest first."""
+        if not self.enabled or file_key is None:
+            return []
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            try:
+                rows = conn.execute("SELECT DISTINCT piece_size FROM pieces WHERE file_key = ? ORDER BY piece_size DESC", (file_key,)).fetchall()
+            except sqlite3.Error:
+                return []
+        return [int(row[0]) for row in rows]
+
+    def _cached_pieces(self, spans: Sequence[FileSpan], piece_size: int, piece_count: int) -> list[Optional[bytes]]:
+        pieces: list[Optional[bytes]] = [None] * piece_count
+        for span in spans:
+            hashes = self.lookup(span, piece_size)
+            if hashes is None:
+                continue
+            for i in range(span.piece_count):
+                pieces[span.first_piece + i] = hashes[i * 20:(i + 1) * 20]
+        return pieces
+
+    def coverage(self, files: Sequence[tuple[str, int]], piece_size: int) -> float:
+        """Fraction of pieces that would be served from the cache."""
+        total = sum(size for _, size in files)
+        if not self.enabled or total <= 0:
+            return 0.0
+        piece_count = math.ceil(total / piece_size)
+        pieces = self._cached_pieces(plan_layout(files, piece_size), piece_size, piece_count)
+        return sum(1 for piece in pieces if piece is not None) / piece_count
+
+    def hash_files(
+        self,
+        files: Sequence[tuple[str, int]],
+        piece_size: int,
+        callback: Optional[Callable[[str, int, int], None]] = None,
+    ) -> bytes:
+        """Return the concatenated SHA-1 piece hashes for ``files``, reading only uncached pieces."""
+        total = sum(size for _, size in files)
+        piece_count = math.ceil(total / piece_size)
+        spans = plan_layout(files, piece_size)
+        pieces = self._cached_pieces(spans, piece_size, piece_count)
+        missing = [index for index, piece in enumerate(pieces) if piece is None]
+        self.reused += piece_count - len(missing)
+        self.hashed += len(missing)
+
+        done = piece_count - len(missing)
+        last_report = 0.0
+        current_path = files[0][0] if files else ""
+        if missing:
+            workers = max(1, min(os.cpu_count() or 1, 8))
+            in_flight: collections.deque[tuple[int, concurrent.futures.Future[bytes]]] = collections.deque()
+            with _PieceReader(spans, piece_size) as reader, concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for index in missing:
+                    data, current_path = reader.read(index)
+                    in_flight.append((index, executor.submit(_sha1, data)))
+                    while len(in_flight) >= workers * 2:
+                        done_index, future = in_flight.popleft()
+                        pieces[done_index] = future.result()
+                        done += 1
+                    if callback is not None and time.time() - last_report >= _CALLBACK_INTERVAL:
+                        last_report = time.time()
+                        callback(current_path, done, piece_count)
+                while in_flight:
+                    done_index, future = in_flight.popleft()
+                    pieces[done_index] = future.result()
+                    done += 1
+        if callback is not None:
+            callback(current_path, done, piece_count)
+
+        hashes = b''.join(cast(list[bytes], pieces))
+        if missing:
+            self.store(spans, piece_size, hashes)
+        return hashes
+
+    def generate(self, torrent: Torrent, callback: Optional[Callable[[Torrent, str, int, int], None]] = None) -> bool:
+        """Drop-in for ``torrent.generate()``; returns False when the cache is disabled."""
+        if not self.enabled or torrent.path is None:
+            return False
+        files = [(str(filepath), int(file.size)) for filepath, file in zip(torrent.filepaths, torrent.files)]
+        if not files or sum(size for _, size in files) < 1:
+            return False
+
+        def report(path: str, done: int, total: int) -> None:
+            if callback is not None:
+                callback(torrent, path, done, total)
+
+        torrent.metainfo['info']['pieces'] = self.hash_files(files, int(torrent.piece_size), report)
+        return True
+
+    def record_torrent(self, torrent_path: str, content_path: str) -> None:
+        """Store the piece hashes of a torrent made elsewhere (mkbrr) for ``content_path``."""
+        if not self.enabled:
+            return
+        try:
+            torrent = Torrent.read(torrent_path)
+            hashes = cast(bytes, torrent.metainfo['info']['pieces'])
+            parent = os.path.dirname(os.path.abspath(content_path))
+            if torrent.mode == 'singlefile':
+                files = [(os.path.abspath(content_path), int(torrent.size))]
+            else:
+                files = [(os.path.join(parent, str(file)), int(file.size)) for file in torrent.files]
+            piece_size = int(torrent.piece_size)
+        except Exception:
+            return
+        if len(hashes) != math.ceil(sum(size for _, size in files) / piece_size) * 20:
+            return
+        self.store(plan_layout(files, piece_size), piece_size, hashes)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    self._conn.close()
+                self._conn = None
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]Piece hash cache: {self.reused} pieces reused, {self.hashed} hashed[/cyan]")
+
+
+def _sha1(data: bytes) -> bytes:
+    return hashlib.sha1(data).digest()  # nosec B324 - BitTorrent v1 piece hash
+
+
+class _PieceReader:
+    """Reads pieces across file boundaries, keeping the current file open between reads."""
+
+    def __init__(self, spans: Sequence[FileSpan], piece_size: int) -> None:
+        self._spans = [span for span in spans if span.size > 0]
+        self._piece_size = piece_size
+        self._index = -1
+        self._handle: Optional[Any] = None
+
+    def __enter__(self) -> '_PieceReader':
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _open(self, index: int) -> Any:
+        if index != self._index:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = open(self._spans[index].path, 'rb')  # noqa: SIM115
+            self._index = index
+        return self._handle
+
+    def read(self, piece_index: int) -> tuple[bytes, str]:
+        start = piece_index * self._piece_size
+        end = start + self._piece_size
+        chunks: list[bytes] = []
+        path = ""
+        for index, span in enumerate(self._spans):
+            if span.end <= start:
+                continue
+            if span.start >= end:
+                break
+            handle = self._open(index)
+            offset = max(start, span.start) - span.start
+            handle.seek(offset)
+            chunks.append(handle.read(min(end, span.end) - span.start - offset))
+            path = span.path
+        return b''.join(chunks), path
+
+
+piece_hash_cache = PieceHashCache()
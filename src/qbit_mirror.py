@@ -0,0 +1,201 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+In-process mirror of qBittorrent's torrent list.
+
+Searching the client for an existing torrent used to fetch the full
+``torrents/info`` listing and scan it in Python, once per lookup. A
+``QbitMirror`` instead follows ``sync/maindata``: the first sync returns every
+torrent, later syncs send the ``rid`` of the previous response and only get
+the torrents that changed or were removed since. The mirrored torrents are
+indexed by name, content path and infohash, so a lookup is one small delta
+request plus a dict access.
+
+Mirrors are shared per logged-in client for the life of the process. Searches
+through the qui proxy use qui's own search endpoint instead; ``ProxyQbitMirror``
+follows a proxied client for the completion waits in ``src/qbitwait.py``.
+"""
+import asyncio
+import os
+from collections.abc import Iterable
+from typing import Any, Optional, cast
+
+import aiohttp
+
+from src.console import console
+
+# Fields that feed an index; updating any of them re-indexes the torrent
+_INDEXED_FIELDS = ('name', 'content_path', 'infohash_v1', 'infohash_v2')
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class QbitMirror:
+    def __init__(self, qbt_client: Any) -> None:
+        self.client = qbt_client
+        self._inflight: Optional[asyncio.Future[None]] = None
+        self.rid = 0
+        self.syncs = 0
+        self.torrents: dict[str, dict[str, Any]] = {}
+        self._by_name: dict[str, set[str]] = {}
+        self._by_path: dict[str, set[str]] = {}
+        self._by_hash: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.torrents)
+
+    @staticmethod
+    def _index_keys(torrent: dict[str, Any]) -> tuple[str, str]:
+        name = str(torrent.get('name') or '').lower()
+        content_path = torrent.get('content_path')
+        return name, _path_key(str(content_path)) if content_path else ''
+
+    def _index(self, torrent_hash: str, torrent: dict[str, Any]) -> None:
+        name, path = self._index_keys(torrent)
+        if name:
+            self._by_name.setdefault(name, set()).add(torrent_hash)
+        if path:
+            self._by_path.setdefault(path, set()).add(torrent_hash)
+        for key in ('hash', 'infohash_v1', 'infohash_v2'):
+            value = torrent.get(key)
+            if value:
+                self._by_hash[str(value).lower()] = torrent_hash
+
+    def _unindex(self, torrent_hash: str, torrent: dict[str, Any]) -> None:
+        for index, key in zip((self._by_name, self._by_path), self._index_keys(torrent)):
+            hashes = index.get(key)
+            if hashes is not None:
+                hashes.discard(torrent_hash)
+                if not hashes:
+                    del index[key]
+        for key in ('hash', 'infohash_v1', 'infohash_v2'):
+            value = torrent.get(key)
+            if value and self._by_hash.get(str(value).lower()) == torrent_hash:
+                del self._by_hash[str(value).lower()]
+
+    def _clear(self) -> None:
+        self.torrents.clear()
+        self._by_name.clear()
+        self._by_path.clear()
+        self._by_hash.clear()
+
+    def apply(self, data: dict[str, Any]) -> None:
+        """Merge one ``sync/maindata`` response into the mirror."""
+        if data.get('full_update'):
+            self._clear()
+        torrents_value = data.get('torrents')
+        changed = cast(dict[str, Any], torrents_value) if isinstance(torrents_value, dict) else {}
+        for torrent_hash, fields_value in changed.items():
+            fields = cast(dict[str, Any], fields_value) if isinstance(fields_value, dict) else {}
+            torrent = self.torrents.get(torrent_hash)
+            if torrent is None:
+                # maindata keys torrents by hash and leaves it out of the fields
+                torrent = {'hash': torrent_hash, **fields}
+                self.torrents[torrent_hash] = torrent
+                self._index(torrent_hash, torrent)
+            elif any(field in fields for field in _INDEXED_FIELDS):
+                self._unindex(torrent_hash, torrent)
+                torrent.update(fields)
+                self._index(torrent_hash, torrent)
+            else:
+                torrent.update(fields)
+        removed_value = data.get('torrents_removed')
+        removed = cast(list[Any], removed_value) if isinstance(removed_value, list) else []
+        for torrent_hash in removed:
+            torrent = self.torrents.pop(str(torrent_hash), None)
+            if torrent is not None:
+                self._unindex(str(torrent_hash), torrent)
+        rid = data.get('rid')
+        if isinstance(rid, int):
+            self.rid = rid
+
+    async def _fetch(self) -> dict[str, Any]:
+        data = await asyncio.to_thread(self.client.sync_maindata, rid=self.rid)
+        return dict(cast(dict[str, Any], data))
+
+    async def _sync(self) -> None:
+        try:
+            self.apply(await self._fetch())
+            self.syncs += 1
+        finally:
+            self._inflight = None
+
+    async def refresh(self) -> None:
+        """Bring the mirror up to date; callers that arrive while a sync is in flight share its request."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._sync())
+        # Shielded, so one caller giving up doesn't cancel the sync the others are waiting on
+        await asyncio.shield(self._inflight)
+
+    def _snapshot(self, hashes: Iterable[str]) -> list[dict[str, Any]]:
+        # Copies, so callers can't edit the mirrored state
+        return [dict(self.torrents[torrent_hash]) for torrent_hash in hashes if torrent_hash in self.torrents]
+
+    def by_name(self, *names: str) -> list[dict[str, Any]]:
+        """Torrents whose name equals any of ``names``, ignoring case."""
+        hashes: dict[str, None] = {}
+        for name in names:
+            hashes.update(dict.fromkeys(self._by_name.get(name.lower(), ())))
+        return self._snapshot(hashes)
+
+    def by_content_path(self, path: str) -> list[dict[str, Any]]:
+        """Torrents whose content path is ``path``."""
+        return self._snapshot(self._by_path.get(_path_key(path), ()))
+
+    def by_hash(self, infohash: str) -> Optional[dict[str, Any]]:
+        """The torrent with this v1 or v2 infohash."""
+        torrent_hash = self._by_hash.get(infohash.lower())
+        if torrent_hash is None:
+            return None
+        snapshot = self._snapshot((torrent_hash,))
+        return snapshot[0] if snapshot else None
+
+
+class ProxyQbitMirror(QbitMirror):
+    """A mirror of a client behind the qui proxy, synced over the proxied Web API."""
+
+    def __init__(self, proxy_url: str) -> None:
+        super().__init__(None)
+        self.proxy_url = proxy_url.rstrip('/')
+
+    async def _fetch(self) -> dict[str, Any]:
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session, session.get(f"{self.proxy_url}/api/v2/sync/maindata", params={'rid': self.rid}) as response:
+            if response.status != 200:
+                raise RuntimeError(f"sync/maindata via proxy failed: {response.status}")
+            return cast(dict[str, Any], await response.json())
+
+
+class QbitMirrors:
+    def __init__(self) -> None:
+        self._mirrors: dict[tuple[Any, ...], QbitMirror] = {}
+
+    def get(self, client_key: tuple[Any, ...], qbt_client: Any) -> QbitMirror:
+        mirror = self._mirrors.get(client_key)
+        if mirror is None:
+            mirror = QbitMirror(qbt_client)
+            self._mirrors[client_key] = mirror
+        elif mirror.client is not qbt_client:
+            # Another login to the same client: keep the mirror, the server sends a full update if the rid is foreign to it
+            mirror.client = qbt_client
+        return mirror
+
+    def proxy(self, proxy_url: str) -> QbitMirror:
+        """The mirror of a client behind the qui proxy at ``proxy_url``."""
+        proxy_url = proxy_url.rstrip('/')
+        mirror = self._mirrors.get(('qui', proxy_url))
+        if mirror is None:
+            mirror = ProxyQbitMirror(proxy_url)
+            self._mirrors[('qui', proxy_url)] = mirror
+        return mirror
+
+    def print_stats(self) -> None:
+        if not self._mirrors:
+            return
+        torrents = sum(len(mirror) for mirror in self._mirrors.values())
+        syncs = sum(mirror.syncs for mirror in self._mirrors.values())
+        console.print(f"[cyan]qBittorrent mirror: {torrents} torrents in {len(self._mirrors)} clients, {syncs} syncs[/cyan]")
+
+
+qbit_mirrors = QbitMirrors()
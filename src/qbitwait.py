@@ -2,12 +2,86 @@
 import asyncio
 import os
 import traceback
-from typing import Any, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
 
 import aiohttp
-import qbittorrentapi
 
 from src.console import console
+from src.qbit_mirror import QbitMirror, qbit_mirrors
+
+if TYPE_CHECKING:
+    import qbittorrentapi
+
+COMPLETED_STATES = {'pausedUP', 'seeding', 'completed', 'stalledUP', 'uploading'}
+CHECKING_STATES = {'checkingUP', 'checkingDL', 'checkingResumeData'}
+
+TorrentCheck = Callable[[dict[str, Any]], bool]
+
+
+class TorrentWatcher:
+    """
+    One sync/maindata poll loop shared by every wait on the same client.
+
+    Each ``wait_for`` registers a hash and a check. While anything is waiting,
+    the loop syncs the client's torrent list (one delta request, however many
+    hashes are watched), runs every check against the fresh state and resolves
+    the waits whose check passed. The loop stops when the last wait finishes;
+    the mirror is kept, so the next wait starts from a delta as well.
+    """
+
+    def __init__(self, mirror: QbitMirror) -> None:
+        self.mirror = mirror
+        self.loop = asyncio.get_running_loop()
+        self._waiters: dict[str, list[tuple[TorrentCheck, float, asyncio.Future[Optional[dict[str, Any]]]]]] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def wait_for(self, infohash: str, check: TorrentCheck, interval: float = 3) -> Optional[dict[str, Any]]:
+        """Wait until ``check`` passes for the torrent; returns its state then, or None if the client doesn't have it."""
+        infohash = infohash.lower()
+        waiter = (check, float(interval), self.loop.create_future())
+        self._waiters.setdefault(infohash, []).append(waiter)
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self._run())
+        try:
+            return await waiter[2]
+        finally:
+            waiters = self._waiters.get(infohash, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(infohash, None)
+
+    async def _run(self) -> None:
+        while self._waiters:
+            try:
+                await self.mirror.refresh()
+            except Exception as e:
+                for waiters in self._waiters.values():
+                    for _check, _interval, future in waiters:
+                        if not future.done():
+                            future.set_exception(e)
+                return
+            for infohash, waiters in list(self._waiters.items()):
+                torrent = self.mirror.by_hash(infohash)
+                for check, _interval, future in list(waiters):
+                    if future.done():
+                        continue
+                    if torrent is None:
+                        future.set_result(None)
+                        continue
+                    try:
+                        if check(torrent):
+                            future.set_result(torrent)
+                    except Exception as e:
+                        future.set_exception(e)
+            intervals = [interval for waiters in self._waiters.values() for _check, interval, future in waiters if not future.done()]
+            if not intervals:
+                return
+            await asyncio.sleep(min(intervals))
+
+
+# Watchers by client, so concurrent waits on one client share a poll loop
+torrent_watchers: dict[str, TorrentWatcher] = {}
 
 
 class Wait:
@@ -18,9 +92,13 @@ class Wait:
         self.qbt_proxy_url: Optional[str] = None
         self.qbt_session: Optional[aiohttp.ClientSession] = None
         self.qbt_client: Optional[qbittorrentapi.Client] = None
+        self.client_key = ''
+        # Same key as the qBittorrent client code, so waits and searches share one mirror
+        self.mirror_key: tuple[Any, ...] = ()
         self.qbt_client = self._connect_qbittorrent()
 
-    def _connect_qbittorrent(self) -> Optional[qbittorrentapi.Client]:
+    def _connect_qbittorrent(self) -> "Optional[qbittorrentapi.Client]":
+        import qbittorrentapi
         config_map = self.config
         default_section = cast(dict[str, Any], config_map.get('DEFAULT', {}))
         clients_section = cast(dict[str, Any], config_map.get('TORRENT_CLIENTS', {}))
@@ -42,6 +120,7 @@ class Wait:
         if self.proxy_url:
             # Use qui proxy URL format
             self.qbt_proxy_url = self.proxy_url.rstrip('/')
+            self.client_key = self.qbt_proxy_url
             return None  # No traditional client needed for proxy
         else:
             # Use traditional qbittorrent API client
@@ -78,60 +157,43 @@ class Wait:
 
             try:
                 qbt_client.auth_log_in()
+                self.client_key = f"{host}:{port}:{username}"
+                self.mirror_key = (client.get('qbit_url'), client.get('qbit_port'), client.get('qbit_user'))
                 return qbt_client
             except qbittorrentapi.LoginFailed as e:
                 raise RuntimeError(f"qBittorrent login failed: {e}") from e
 
+    def _watcher(self) -> TorrentWatcher:
+        loop = asyncio.get_running_loop()
+        mirror = qbit_mirrors.proxy(self.qbt_proxy_url) if self.qbt_proxy_url else qbit_mirrors.get(self.mirror_key, self.qbt_client)
+        watcher = torrent_watchers.get(self.client_key)
+        if watcher is None or watcher.loop is not loop or watcher.mirror is not mirror:
+            watcher = TorrentWatcher(mirror)
+            torrent_watchers[self.client_key] = watcher
+        return watcher
+
     async def wait_for_completion(self, infohash: str, check_interval: int = 3) -> None:
+        """Wait until the torrent is complete; raises if the client can't be polled or no longer has it."""
         if not self.proxy_url and not self.qbt_client:
             raise Exception("[ERROR] qBittorrent is not configured.")
 
         console.print(f"Waiting for torrent {infohash} to complete...", markup=False)
 
-        if self.proxy_url:
-            self.qbt_session = aiohttp.ClientSession()
+        def completed(torrent: dict[str, Any]) -> bool:
+            state_value = torrent.get('state')
+            state_str = str(state_value) if state_value is not None else 'unknown'
+            console.print(f"[DEBUG] Torrent {infohash} state: {state_str}", markup=False)
+            return state_str in COMPLETED_STATES
 
         try:
-            while True:
-                if self.proxy_url:
-                    if self.qbt_session is None:
-                        raise RuntimeError("qbt_session is not initialized")
-                    async with self.qbt_session.get(
-                        f"{self.qbt_proxy_url}/api/v2/torrents/info",
-                        params={'hashes': infohash}
-                    ) as response:
-                        if response.status == 200:
-                            torrents_data = cast(list[dict[str, Any]], await response.json())
-                            target_torrent = torrents_data[0] if torrents_data else None
-                        else:
-                            console.print(f"[ERROR] Failed to get torrent info via proxy: {response.status}", markup=False)
-                            break
-                else:
-                    if self.qbt_client is None:
-                        raise RuntimeError("qbt_client is not initialized")
-                    torrents = self.qbt_client.torrents_info(hashes=infohash)
-                    target_torrent = next((t for t in torrents if t.hash == infohash), None)
-
-                if target_torrent:
-                    if self.proxy_url:
-                        target_dict = cast(dict[str, Any], target_torrent)
-                        state_value = target_dict.get('state')
-                    else:
-                        state_value = getattr(target_torrent, 'state', None)
-                    state_str = str(state_value) if state_value is not None else 'unknown'
-                    console.print(f"[DEBUG] Torrent {infohash} state: {state_str}", markup=False)
-
-                    if state_str in {'pausedUP', 'seeding', 'completed', 'stalledUP', 'uploading'}:
-                        console.print(f"[INFO] Torrent {infohash} has completed!", markup=False)
-                        return
-                else:
-                    console.print(f"[ERROR] Torrent with hash {infohash} not found!", markup=False)
-                    break
-
-                await asyncio.sleep(check_interval)
-        finally:
-            if self.qbt_session:
-                await self.qbt_session.close()
+            target_torrent = await self._watcher().wait_for(infohash, completed, check_interval)
+        except Exception as e:
+            console.print(f"[ERROR] Failed to get torrent info: {e}", markup=False)
+            raise
+
+        if target_torrent is None:
+            raise Exception(f"Torrent with hash {infohash} not found")
+        console.print(f"[INFO] Torrent {infohash} has completed!", markup=False)
 
     async def select_and_recheck_best_torrent(self, meta: dict[str, Any], path: str, check_interval: int = 5) -> bool:
         if not self.proxy_url and not self.qbt_client:
@@ -218,110 +280,30 @@ class Wait:
             console.print(f"[bold red]Failed to recheck torrent: {e}")
             return False
 
+        def recheck_finished(torrent: dict[str, Any]) -> bool:
+            state = torrent.get('state')
+            state_str = str(state) if state is not None else 'unknown'
+            try:
+                progress_float = float(torrent.get('progress', 0) or 0)
+            except (TypeError, ValueError):
+                progress_float = 0.0
+            console.print(f"\r[INFO] Torrent is at {progress_float * 100:.2f}% progress of {state_str}...", end='', markup=False)
+            return state_str not in CHECKING_STATES
+
         try:
-            while True:
-                if self.proxy_url:
-                    if self.qbt_session is None:
-                        console.print("[bold red]qbt_session is not initialized")
-                        return False
-                    if self.qbt_proxy_url is None:
-                        console.print("[bold red]Proxy URL is not configured correctly")
-                        return False
-                    async with self.qbt_session.get(
-                        f"{self.qbt_proxy_url}/api/v2/torrents/info",
-                        params={'hashes': torrent_hash}
-                    ) as response:
-                        if response.status == 200:
-                            torrents_data = cast(list[dict[str, Any]], await response.json())
-                            if torrents_data:
-                                torrent = torrents_data[0]
-                                state = torrent.get('state')
-                                progress = torrent.get('progress', 0)
-                                state_str = str(state) if state is not None else 'unknown'
-                                try:
-                                    progress_float = float(progress or 0)
-                                except (TypeError, ValueError):
-                                    progress_float = 0.0
-                            else:
-                                raise Exception("No torrents found in response")
-                        else:
-                            console.print(f"[bold red]Failed to get torrent info via proxy: {response.status}")
-                            return False
-                else:
-                    if self.qbt_client is None:
-                        console.print("[bold red]qbt_client is not initialized")
-                        return False
-                    torrent_list_raw = cast(Any, self.qbt_client.torrents_info(hashes=torrent_hash))
-                    if torrent_list_raw is None:
-                        raise Exception("qBittorrent returned no torrent info")
-                    if isinstance(torrent_list_raw, list):
-                        torrent_candidates = cast(list[Any], torrent_list_raw)
-                    elif isinstance(torrent_list_raw, tuple):
-                        torrent_candidates = list(cast(tuple[Any, ...], torrent_list_raw))
-                    else:
-                        torrent_candidates = [torrent_list_raw]
-                    if not torrent_candidates:
-                        raise Exception("No torrents found in TorrentInfoList")
-                    torrent = torrent_candidates[0]
-                    state = getattr(torrent, 'state', None)
-                    progress = getattr(torrent, 'progress', 0)
-                    state_str = str(state) if state is not None else 'unknown'
-                    progress_float = float(progress or 0)
-
-                console.print(f"\r[INFO] Torrent is at {progress_float * 100:.2f}% progress of {state_str}...", end='', markup=False)
-
-                if state_str not in ('checkingUP', 'checkingDL', 'checkingResumeData'):
-                    console.print("", markup=False)
-                    break
-
-                await asyncio.sleep(check_interval)
-
-            # Get final torrent info
-            if self.proxy_url:
-                if self.qbt_session is None:
-                    console.print("[bold red]qbt_session is not initialized")
-                    return False
-                if self.qbt_proxy_url is None:
-                    console.print("[bold red]Proxy URL is not configured correctly")
-                    return False
-                async with self.qbt_session.get(
-                    f"{self.qbt_proxy_url}/api/v2/torrents/info",
-                    params={'hashes': torrent_hash}
-                ) as response:
-                    if response.status == 200:
-                        torrents_data = cast(list[dict[str, Any]], await response.json())
-                        if torrents_data:
-                            torrent = torrents_data[0]
-                            final_state = torrent.get('state')
-                            final_progress = torrent.get('progress', 0)
-                        else:
-                            raise Exception("No torrents found in response")
-                    else:
-                        console.print(f"[bold red]Failed to get final torrent info via proxy: {response.status}")
-                        return False
-            else:
-                if self.qbt_client is None:
-                    console.print("[bold red]qbt_client is not initialized")
-                    return False
-                torrent_list_raw = cast(Any, self.qbt_client.torrents_info(hashes=torrent_hash))
-                if torrent_list_raw is None:
-                    raise Exception("qBittorrent returned no torrent info")
-                if isinstance(torrent_list_raw, list):
-                    torrent_candidates = cast(list[Any], torrent_list_raw)
-                elif isinstance(torrent_list_raw, tuple):
-                    torrent_candidates = list(cast(tuple[Any, ...], torrent_list_raw))
-                else:
-                    torrent_candidates = [torrent_list_raw]
-                if not torrent_candidates:
-                    raise Exception("No torrents found in TorrentInfoList")
-                torrent = torrent_candidates[0]
-                final_state = getattr(torrent, 'state', 'unknown')
-                final_progress = float(getattr(torrent, 'progress', 0) or 0)
+            torrent = await self._watcher().wait_for(torrent_hash, recheck_finished, check_interval)
+            console.print("", markup=False)
+            if torrent is None:
+                raise Exception("No torrents found in TorrentInfoList")
+
+            # The state that ended the recheck is the final one
+            final_state = torrent.get('state', 'unknown')
+            final_progress = float(torrent.get('progress', 0) or 0)
 
             console.print(f"[green]Recheck completed. State: {final_state}, Progress: {final_progress*100:.2f}%[/green]")
             meta['we_rechecked_torrent'] = True
 
-            if final_state not in {'pausedUP', 'seeding', 'completed', 'stalledUP', 'uploading'}:
+            if final_state not in COMPLETED_STATES:
                 console.print("[yellow]Torrent needs to download missing data. Waiting for completion...[/yellow]")
                 await self.wait_for_completion(torrent_hash, check_interval)
 
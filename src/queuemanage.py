@@ -5,9 +5,9 @@ import glob
 import json
 import os
 import re
-from collections.abc import Mapping, MutableMapping, Sequence
+from collections.abc import Awaitable, Mapping, MutableMapping, Sequence
 from pathlib import Path
-from typing import Any, Optional, Union, cast
+from typing import Any, Callable, Optional, Union, cast
 
 import cli_ui
 import click
@@ -20,6 +20,12 @@ from src.console import console
 QueueItem: TypeAlias = dict[str, Any]
 QueueList: TypeAlias = Union[list[str], list[QueueItem]]
 
+DISC_FOLDERS = ("BDMV", "VIDEO_TS", "HVDVD_TS")
+
+# Per-log locks so concurrently finishing queue items don't overwrite each other's entries.
+# Created lazily so they bind to the running event loop.
+_log_locks: dict[str, asyncio.Lock] = {}
+
 
 async def _read_json_file(path: str) -> Any:
     content = await asyncio.to_thread(Path(path).read_text, encoding="utf-8")
@@ -110,24 +116,34 @@ class QueueManager:
         # Return the path for processing
         return cast(str, queue_item['path'])
 
+    @staticmethod
+    def log_lock(log_file: str) -> asyncio.Lock:
+        """Lock guarding read-modify-write updates of a processed-files log."""
+        key = os.path.abspath(log_file)
+        lock = _log_locks.get(key)
+        if lock is None:
+            lock = _log_locks[key] = asyncio.Lock()
+        return lock
+
     @staticmethod
     async def save_processed_path(processed_files_log: str, path: str) -> None:
-        processed_paths: set[str] = set()
+        async with QueueManager.log_lock(processed_files_log):
+            processed_paths: set[str] = set()
 
-        # Load existing processed paths
-        if os.path.exists(processed_files_log):
-            with contextlib.suppress(json.JSONDecodeError, OSError):
-                processed_paths = set(cast(list[str], await _read_json_file(processed_files_log)))
+            # Load existing processed paths
+            if os.path.exists(processed_files_log):
+                with contextlib.suppress(json.JSONDecodeError, OSError):
+                    processed_paths = set(cast(list[str], await _read_json_file(processed_files_log)))
 
-        # Add the new path
-        processed_paths.add(path)
+            # Add the new path
+            processed_paths.add(path)
 
-        # Save back to file
-        try:
-            os.makedirs(os.path.dirname(processed_files_log), exist_ok=True)
-            await _write_json_file(processed_files_log, list(processed_paths), indent=4)
-        except OSError as e:
-            console.print(f"[red]Error saving processed path: {e}[/red]")
+            # Save back to file
+            try:
+                os.makedirs(os.path.dirname(processed_files_log), exist_ok=True)
+                await _write_json_file(processed_files_log, list(processed_paths), indent=4)
+            except OSError as e:
+                console.print(f"[red]Error saving processed path: {e}[/red]")
 
     @staticmethod
     async def get_log_file(base_dir: str, queue_name: str) -> str:
@@ -636,6 +652,78 @@ class QueueManager:
 
         return queue, log_file
 
+    @staticmethod
+    def is_disc_path(path: str) -> bool:
+        """True if ``path`` is (or directly contains) a BDMV/VIDEO_TS/HVDVD_TS disc structure."""
+        if not os.path.isdir(path):
+            return False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    if entry.name.upper() in DISC_FOLDERS:
+                        return True
+                    with contextlib.suppress(OSError):
+                        if any(os.path.isdir(os.path.join(entry.path, folder)) for folder in DISC_FOLDERS):
+                            return True
+        except OSError:
+            return False
+        return os.path.basename(os.path.normpath(path)).upper() in DISC_FOLDERS
+
+    @staticmethod
+    async def run_queue_items(
+        queue: Sequence[Any],
+        process_item: Callable[[Any], Awaitable[bool]],
+        max_parallel: int = 1,
+        is_exclusive: Optional[Callable[[Any], bool]] = None,
+        can_start: Optional[Callable[[int], bool]] = None,
+    ) -> None:
+        """Run ``process_item`` for each queue entry, up to ``max_parallel`` at a time.
+
+        ``process_item`` returns True to stop the queue (e.g. --limit-queue reached); items
+        already running are allowed to finish. ``can_start`` is asked (with the number of
+        running items) before each new item is started. Items flagged by ``is_exclusive``
+        run on their own, after the running items have drained.
+        """
+        pending = list(queue)
+        running: dict[asyncio.Task[bool], bool] = {}
+        stop = False
+
+        try:
+            while pending or running:
+                while pending and not stop and len(running) < max(1, max_parallel):
+                    if any(running.values()):
+                        break
+                    exclusive = bool(is_exclusive(pending[0])) if is_exclusive is not None else False
+                    if exclusive and running:
+                        break
+                    if can_start is not None and not can_start(len(running)):
+                        break
+                    item = pending.pop(0)
+                    running[asyncio.create_task(process_item(item))] = exclusive
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.pop(task, None)
+                    if task.cancelled():
+                        continue
+                    error = task.exception()
+                    if error is not None:
+                        console.print(f"[bold red]Queue item failed: {error}[/bold red]")
+                    elif task.result():
+                        stop = True
+                if stop:
+                    pending.clear()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
 
 async def process_site_upload_queue(meta: Mapping[str, Any], base_dir: str) -> tuple[list[QueueItem], Optional[str]]:
     return await QueueManager.process_site_upload_queue(meta, base_dir)
@@ -699,3 +787,17 @@ async def handle_queue(
     base_dir: str,
 ) -> tuple[QueueList, Optional[str]]:
     return await QueueManager.handle_queue(path, meta, paths, base_dir)
+
+
+def is_disc_path(path: str) -> bool:
+    return QueueManager.is_disc_path(path)
+
+
+async def run_queue_items(
+    queue: Sequence[Any],
+    process_item: Callable[[Any], Awaitable[bool]],
+    max_parallel: int = 1,
+    is_exclusive: Optional[Callable[[Any], bool]] = None,
+    can_start: Optional[Callable[[int], bool]] = None,
+) -> None:
+    await QueueManager.run_queue_items(queue, process_item, max_parallel=max_parallel, is_exclusive=is_exclusive, can_start=can_start)
@@ -0,0 +1,285 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Per-host request pacing.
+
+Sites that need a gap between requests (the PTP API, blu-ray.com's scraper
+protection, the SN upload endpoint) get a token bucket here instead of a fixed
+sleep after every call. The pooled HTTP transport waits on the bucket for the
+request's host before sending, so a request only waits when earlier requests
+have actually used up the allowance, and concurrent queue items share the same
+buckets.
+
+A 429/503 response with ``Retry-After`` holds its host back for that long, and
+callers that detect a soft block themselves can do the same with ``defer()``.
+Non-HTTP keys (e.g. ``tracker-search:PTP``) use the same buckets through
+``ready_in()`` / ``consume()``.
+
+The paced buckets (the rules above and the non-HTTP keys) are also kept in
+``data/cache/rate_limits.sqlite3``, so back-to-back CLI runs and Web UI jobs
+running in separate processes pace together. Retry-After holds stay per process.
+"""
+import asyncio
+import contextlib
+import email.utils
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar, Union, cast
+
+import httpx
+
+from src.console import console
+
+# host (or host + path prefix) -> (seconds between requests, burst, random extra delay)
+DEFAULT_RULES: dict[str, tuple[float, int, float]] = {
+    'passthepopcorn.me': (1.0, 1, 0.0),
+    'blu-ray.com': (2.0, 1, 2.0),
+    'swarmazon.club/api/upload.php': (16.0, 1, 0.0),
+}
+# Longest Retry-After that is honoured, so a bogus header can't stall a run
+MAX_RETRY_AFTER = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tat REAL NOT NULL,
+    blocked_until REAL NOT NULL
+)
+"""
+
+_T = TypeVar('_T')
+
+
+class _Bucket:
+    """GCRA token bucket: ``tat`` is when the bucket would be full again."""
+
+    __slots__ = ('blocked_until', 'burst', 'interval', 'jitter', 'tat')
+
+    def __init__(self, interval: float, burst: int = 1, jitter: float = 0.0) -> None:
+        self.interval = max(0.0, interval)
+        self.burst = max(1, burst)
+        self.jitter = max(0.0, jitter)
+        self.tat = 0.0
+        self.blocked_until = 0.0
+
+    def available_at(self, now: float) -> float:
+        return max(now, self.tat - (self.burst - 1) * self.interval, self.blocked_until)
+
+    def reserve(self, now: float, not_before: float = 0.0) -> float:
+        """Claim the next slot and return the monotonic time it starts."""
+        start = max(self.available_at(now), not_before)
+        if self.jitter:
+            start += random.uniform(0, self.jitter)  # nosec B311 - request pacing, not cryptographic
+        self.tat = max(self.tat, start) + self.interval
+        return start
+
+
+def _seconds(value: Any) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return min(max(0.0, when.timestamp() - time.time()), MAX_RETRY_AFTER)
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        # _lock guards the in-memory buckets and is only held briefly; _db_lock serialises the
+        # shared connection, whose busy wait runs in a worker thread (see _shared)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._rules: dict[str, tuple[float, int, float]] = dict(DEFAULT_RULES)
+        self._buckets: dict[str, _Bucket] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self.waited = 0.0
+        self.deferrals = 0
+
+    def configure(self, config: dict[str, Any], base_dir: Optional[str] = None) -> None:
+        """Merge ``rate_limits`` ({host: seconds between requests}) from the DEFAULT config section and share state under ``base_dir``."""
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        rules = dict(DEFAULT_RULES)
+        overrides = default_cfg.get('rate_limits')
+        if isinstance(overrides, dict):
+            for host, value in cast(dict[str, Any], overrides).items():
+                interval = _seconds(value)
+                if interval is not None:
+                    rules[str(host).lower()] = (interval, 1, 0.0)
+        with self._lock:
+            self._rules = rules
+            # Keep the pacing state of live buckets; a config reload between queue items must not reset it
+            for key, bucket in self._buckets.items():
+                rule = rules.get(key)
+                if rule is not None:
+                    bucket.interval, bucket.burst, bucket.jitter = rule
+        if base_dir is not None:
+            db_path = os.path.join(base_dir, 'data', 'cache', 'rate_limits.sqlite3')
+            with self._db_lock:
+                if db_path != self._db_path:
+                    self._close()
+                    self._db_path = db_path
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        # Called with self._db_lock held
+        if self._conn is not None:
+            return self._conn
+        if not self._db_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+            # Autocommit, so each update can take the write lock up front with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self._db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            now = time.time()
+            conn.execute("DELETE FROM buckets WHERE tat < ? AND blocked_until < ?", (now, now))
+        except (sqlite3.Error, OSError) as e:
+            console.print(f"[yellow]Shared rate limit state unavailable, pacing this process only: {e}[/yellow]")
+            self._db_path = None
+            return None
+        self._conn = conn
+        return conn
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            with contextlib.suppress(sqlite3.Error):
+                self._conn.close()
+            self._conn = None
+
+    def _local(self, key: str, interval: Optional[float], action: Callable[[_Bucket, float], _T]) -> _T:
+        with self._lock:
+            return action(self._bucket(key, interval), time.monotonic())
+
+    def _sync_shared(self, key: str, interval: Optional[float], action: Callable[[_Bucket, float], _T], write: bool) -> _T:
+        # Blocking: BEGIN IMMEDIATE can wait up to the busy timeout for another process
+        with self._db_lock:
+            conn = self._connect()
+            if conn is None:
+                return self._local(key, interval, action)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error:
+                return self._local(key, interval, action)
+            try:
+                row = conn.execute("SELECT tat, blocked_until FROM buckets WHERE key = ?", (key,)).fetchone()
+                with self._lock:
+                    now = time.monotonic()
+                    # Stored times are wall clock; monotonic clocks are per process
+                    offset = time.time() - now
+                    bucket = self._bucket(key, interval)
+                    if row is not None:
+                        bucket.tat = max(bucket.tat, float(row[0]) - offset)
+                        bucket.blocked_until = max(bucket.blocked_until, float(row[1]) - offset)
+                    result = action(bucket, now)
+                    stored = (key, bucket.tat + offset, bucket.blocked_until + offset)
+                if write:
+                    conn.execute("INSERT OR REPLACE INTO buckets (key, tat, blocked_until) VALUES (?, ?, ?)", stored)
+                conn.execute("COMMIT")
+                return result
+            except sqlite3.Error:
+                with contextlib.suppress(sqlite3.Error):
+                    conn.execute("ROLLBACK")
+                return self._local(key, interval, action)
+
+    async def _shared(self, key: str, interval: Optional[float], action: Callable[[_Bucket, float], _T], write: bool = True) -> _T:
+        """Run ``action(bucket, now)`` on ``key`` with the bucket synced to the state other processes saved."""
+        if not self._db_path:
+            return self._local(key, interval, action)
+        return await asyncio.to_thread(self._sync_shared, key, interval, action, write)
+
+    def _rule_key(self, url: httpx.URL) -> Optional[str]:
+        host = url.host.lower()
+        path = url.path
+        best: Optional[str] = None
+        for rule in self._rules:
+            rule_host, _, rule_path = rule.partition('/')
+            if host != rule_host and not host.endswith(f".{rule_host}"):
+                continue
+            if rule_path and not path.lstrip('/').startswith(rule_path):
+                continue
+            if best is None or len(rule) > len(best):
+                best = rule
+        return best
+
+    def _bucket(self, key: str, interval: Optional[float] = None) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rule = self._rules.get(key)
+            bucket = _Bucket(*rule) if rule is not None else _Bucket(interval or 0.0)
+            self._buckets[key] = bucket
+        elif interval is not None:
+            bucket.interval = interval
+        return bucket
+
+    def _url_keys(self, url: Union[httpx.URL, str]) -> tuple[str, Optional[str]]:
+        url = httpx.URL(url) if isinstance(url, str) else url
+        return url.host.lower(), self._rule_key(url)
+
+    async def acquire_for(self, url: Union[httpx.URL, str]) -> None:
+        """Wait until a request to ``url`` may be sent: the host's rule plus any Retry-After hold."""
+        host, rule_key = self._url_keys(url)
+        with self._lock:
+            now = time.monotonic()
+            held = self._buckets.get(host)
+            not_before = held.available_at(now) if held is not None and rule_key != host else now
+        delay = not_before - now
+        if rule_key is not None:
+            # The shared state may take a while to lock, so the delay is measured from when the slot was claimed
+            start = await self._shared(rule_key, None, lambda bucket, now: bucket.reserve(now, not_before))
+            delay = start - time.monotonic()
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+    def defer(self, url_or_key: Union[httpx.URL, str], seconds: float) -> None:
+        """Hold back every request to this host (or key) for ``seconds``."""
+        key = self._url_keys(url_or_key)[0] if isinstance(url_or_key, httpx.URL) or '://' in url_or_key else url_or_key
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + min(max(0.0, seconds), MAX_RETRY_AFTER))
+            self.deferrals += 1
+
+    def observe(self, response: httpx.Response) -> None:
+        """Honour Retry-After on 429/503 responses."""
+        if response.status_code not in (429, 503):
+            return
+        seconds = parse_retry_after(response.headers.get('retry-after'))
+        if seconds is None and response.status_code == 429:
+            seconds = 1.0
+        if seconds:
+            self.defer(response.request.url, seconds)
+
+    async def ready_in(self, key: str, interval: Optional[float] = None) -> float:
+        """Seconds until ``key`` has a free slot, without claiming it."""
+        return await self._shared(key, interval, lambda bucket, now: bucket.available_at(now) - now, write=False)
+
+    async def consume(self, key: str, interval: Optional[float] = None) -> None:
+        """Record a use of ``key`` now, whether or not a slot was free."""
+
+        def use(bucket: _Bucket, now: float) -> None:
+            bucket.tat = max(bucket.tat, now) + bucket.interval
+
+        await self._shared(key, interval, use)
+
+    def print_stats(self) -> None:
+        console.print(f"[cyan]Rate limiter: {self.waited:.1f}s spent waiting, {self.deferrals} Retry-After/backoff holds[/cyan]")
+
+
+rate_limiter = RateLimiter()
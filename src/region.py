@@ -1,15 +1,8 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import re
-from typing import Any, Callable, Optional, Union, cast
+from typing import Any, Optional, Union
 
-import guessit
-
-guessit_module: Any = cast(Any, guessit)
-GuessitFn = Callable[[str, Optional[dict[str, Any]]], dict[str, Any]]
-
-
-def guessit_fn(value: str, options: Optional[dict[str, Any]] = None) -> dict[str, Any]:
-    return cast(dict[str, Any], guessit_module.guessit(value, options))
+from src.guessit_cache import guessit_fn
 
 
 async def get_region(bdinfo: dict[str, Any], region: Optional[str] = None) -> str:
@@ -0,0 +1,79 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Shared concurrency budgets for parallel queue runs.
+
+When ``queue_parallel_items`` > 1, several queue items are processed at once and
+the expensive phases draw from named budgets instead of each item assuming it has
+the machine to itself:
+
+- ``ffmpeg``: screenshot capture runs (each run already caps its own ffmpeg processes
+  with ``process_limit``)
+- ``hashing``: torrent creation (one at a time by default, like before)
+- ``tracker``: per-tracker dupe searches and uploads
+
+Outside a parallel run ``slot()`` is a no-op, so sequential behaviour is unchanged.
+"""
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any, Optional, cast
+
+DEFAULT_PARALLEL_ITEMS = 1
+DEFAULT_SLOTS: dict[str, int] = {
+    'ffmpeg': 1,
+    'hashing': 1,
+    'tracker': 4,
+}
+# config['DEFAULT'] key for each budget
+SLOT_CONFIG_KEYS: dict[str, str] = {
+    'ffmpeg': 'queue_ffmpeg_slots',
+    'hashing': 'queue_hashing_slots',
+    'tracker': 'queue_tracker_slots',
+}
+
+
+def _positive_int(value: Any, default: int) -> int:
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+class ResourceLimits:
+    def __init__(self) -> None:
+        self.parallel_items = DEFAULT_PARALLEL_ITEMS
+        self.slots: dict[str, int] = dict(DEFAULT_SLOTS)
+        self.active = False
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def configure(self, config: dict[str, Any]) -> None:
+        default_cfg = cast(dict[str, Any], config.get('DEFAULT', {})) if isinstance(config.get('DEFAULT'), dict) else {}
+        self.parallel_items = _positive_int(default_cfg.get('queue_parallel_items'), DEFAULT_PARALLEL_ITEMS)
+        for name, key in SLOT_CONFIG_KEYS.items():
+            self.slots[name] = _positive_int(default_cfg.get(key), DEFAULT_SLOTS[name])
+
+    def start(self) -> None:
+        """Enable the budgets for the duration of a parallel queue run."""
+        self._semaphores = {name: asyncio.Semaphore(count) for name, count in self.slots.items()}
+        self.active = True
+
+    def stop(self) -> None:
+        self.active = False
+        self._semaphores = {}
+
+    def semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        return self._semaphores.get(name) if self.active else None
+
+    @contextlib.asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[None]:
+        semaphore = self.semaphore(name)
+        if semaphore is None:
+            yield
+            return
+        async with semaphore:
+            yield
+
+
+resource_limits = ResourceLimits()
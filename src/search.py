@@ -1,8 +1,9 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
-import os
+import asyncio
 from typing import Any, Optional, cast
 
 from src.console import console
+from src.library_index import library_index
 
 
 class Search:
@@ -12,7 +13,8 @@ class Search:
 
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
-        pass
+        # Start indexing the search dirs now so the first query doesn't wait on a full walk
+        library_index.warm(self._get_search_dirs())
 
     def _get_search_dirs(self) -> list[str]:
         config_dir = self.config.get('DISCORD', {}).get('search_dir', [])
@@ -25,52 +27,29 @@ class Search:
 
     async def searchFile(self, filename: str) -> Optional[list[str]]:
         filename = filename.lower()
-        files_total: list[str] = []
         if filename == "":
             console.print("nothing entered")
             return None
         words = filename.split()
+        search_dirs = self._get_search_dirs()
+        console.print(f"Searching {', '.join(search_dirs)}")
 
-        async def search_file(search_dir: str) -> list[str]:
-            files_total_search: list[str] = []
-            console.print(f"Searching {search_dir}")
-            for root, _dirs, files in os.walk(search_dir, topdown=False):
-                for name in files:
-                    if not name.endswith('.nfo'):
-                        l_name = name.lower()
-                        if await self.file_search(l_name, words):
-                            files_total_search.append(os.path.join(root, name))
-            return files_total_search
-        for each in self._get_search_dirs():
-            files = await search_file(each)
-            files_total.extend(files)
-        return files_total
+        def search_files() -> list[str]:
+            return [entry.path for entry in library_index.search_words(search_dirs, words, is_dir=False) if not entry.name.endswith('.nfo')]
+        return await asyncio.to_thread(search_files)
 
     async def searchFolder(self, foldername: str) -> Optional[list[str]]:
         foldername = foldername.lower()
-        folders_total: list[str] = []
         if foldername == "":
             console.print("nothing entered")
             return None
         words = foldername.split()
+        search_dirs = self._get_search_dirs()
+        console.print(f"Searching {', '.join(search_dirs)}")
 
-        async def search_dir(search_dir: str) -> list[str]:
-            console.print(f"Searching {search_dir}")
-            folders_total_search: list[str] = []
-            for root, dirs, _files in os.walk(search_dir, topdown=False):
-
-                for name in dirs:
-                    l_name = name.lower()
-
-                    if await self.file_search(l_name, words):
-                        folders_total_search.append(os.path.join(root, name))
-
-            return folders_total_search
-        for each in self._get_search_dirs():
-            folders = await search_dir(each)
-            folders_total.extend(folders)
-
-        return folders_total
+        def search_folders() -> list[str]:
+            return [entry.path for entry in library_index.search_words(search_dirs, words, is_dir=True)]
+        return await asyncio.to_thread(search_folders)
 
     async def file_search(self, name: str, name_words: list[str]) -> bool:
         check = True
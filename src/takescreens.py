@@ -12,14 +12,16 @@ import time
 import traceback
 from collections.abc import Awaitable, Mapping
 from pathlib import Path
-from typing import Any, Optional, Union, cast
+from typing import Any, Callable, Optional, Union, cast
 
 import ffmpeg
 import psutil
 from pymediainfo import MediaInfo
 
-from src.cleanup import cleanup_manager
+from src.cleanup import cleanup_manager, protected_pids
 from src.console import console
+from src.frame_index import frame_index
+from src.resource_limits import resource_limits
 
 default_config: dict[str, Any] = {}
 task_limit = 1
@@ -178,8 +180,7 @@ async def disc_screenshots(
     keyframe = 'nokey' if "VC-1" in bdinfo['video'][0]['codec'] or bdinfo['video'][0]['hdr_dv'] != "" else 'none'
     if meta['debug']:
         console.print(f"File: {file_path}, Length: {length}, Frame Rate: {frame_rate}", markup=False)
-    os.chdir(f"{base_dir}/tmp/{folder_id}")
-    existing_screens = glob.glob(f"{sanitized_filename}-*.png")
+    existing_screens = glob.glob(os.path.join(glob.escape(f"{base_dir}/tmp/{folder_id}"), f"{glob.escape(sanitized_filename)}-*.png"))
     total_existing = len(existing_screens) + len(existing_images)
     num_screens = max(0, screens - total_existing) if not force_screenshots else num_screens
 
@@ -197,6 +198,7 @@ async def disc_screenshots(
         hdr_tonemap = False
 
     ss_times = await valid_ss_time([], num_screens, length, frame_rate or 24.0, meta, retake=force_screenshots)
+    ss_times = await align_to_keyframes(file_path, ss_times, meta)
 
     if meta.get('frame_overlay', False):
         console.print("[yellow]Getting frame information for overlays...")
@@ -300,27 +302,12 @@ async def disc_screenshots(
             if image_size <= 75000:
                 console.print(f"[yellow]Image {image_path} is incredibly small, retaking.")
                 retake = True
+            elif image_meets_host_requirements(image_size, img_host):
+                if meta['debug']:
+                    console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
             else:
-                if img_host and "imgbb" in img_host:
-                    if image_size <= 31000000:
-                        if meta['debug']:
-                            console.print(f"[green]Image {image_path} meets size requirements for imgbb.[/green]")
-                    else:
-                        console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for imgbb, retaking.")
-                        retake = True
-                elif img_host and img_host in ["imgbox", "pixhost"]:
-                    if 75000 < image_size <= 10000000:
-                        if meta['debug']:
-                            console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
-                    else:
-                        console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for {img_host}, retaking.")
-                        retake = True
-                elif img_host and img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"]:
-                    if meta['debug']:
-                        console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
-                else:
-                    console.print(f"[red]Unknown image host or image doesn't meet requirements for host: {img_host}, retaking.")
-                    retake = True
+                console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for image host {img_host}, retaking.")
+                retake = True
 
             if retake:
                 retry_attempts = 3
@@ -336,21 +323,9 @@ async def disc_screenshots(
                             index, file_path, str(random_time), image_path, keyframe, loglevel, hdr_tonemap, meta
                         )
                         new_size = os.path.getsize(image_path)
-                        valid_image = False
-
-                        if img_host and "imgbb" in img_host:
-                            if new_size > 75000 and new_size <= 31000000:
-                                console.print(f"[green]Successfully retaken screenshot for: {image_path} ({new_size} bytes)[/green]")
-                                valid_image = True
-                        elif img_host and img_host in ["imgbox", "pixhost"]:
-                            if new_size > 75000 and new_size <= 10000000:
-                                console.print(f"[green]Successfully retaken screenshot for: {image_path} ({new_size} bytes)[/green]")
-                                valid_image = True
-                        elif img_host and img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"] and new_size > 75000:
-                            console.print(f"[green]Successfully retaken screenshot for: {image_path} ({new_size} bytes)[/green]")
-                            valid_image = True
 
-                        if valid_image:
+                        if image_meets_host_requirements(new_size, img_host):
+                            console.print(f"[green]Successfully retaken screenshot for: {image_path} ({new_size} bytes)[/green]")
                             valid_results.append(image_path)
                             break
                         else:
@@ -583,7 +558,6 @@ async def dvd_screenshots(
         return fallback_duration, 0.0
 
     main_set = meta['discs'][disc_num]['main_set'][1:] if len(meta['discs'][disc_num]['main_set']) > 1 else meta['discs'][disc_num]['main_set']
-    os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
     voblength, _vob_index = await _is_vob_good(0, 0, num_screens)
     ss_times = await valid_ss_time([], num_screens, voblength, frame_rate, meta, retake=retry_cap)
     capture_tasks: list[Awaitable[tuple[int, Optional[str]]]] = []
@@ -865,6 +839,7 @@ async def screenshots(
         num_screens: int = 0,
         force_screenshots: bool = False,
         manual_frames: Union[str, list[str]] = "",
+        on_capture: Optional[Callable[[str], None]] = None,
 ) -> Union[list[str], None]:
     img_host = await get_image_host(meta)
     screens = meta['screens']
@@ -939,7 +914,6 @@ async def screenshots(
         return None
     meta['frame_rate'] = frame_rate
     loglevel = 'verbose' if meta.get('ffdebug', False) else 'quiet'
-    os.chdir(f"{base_dir}/tmp/{folder_id}")
 
     if manual_frames and meta['debug']:
         console.print(f"[yellow]Using manual frames: {manual_frames}")
@@ -983,6 +957,7 @@ async def screenshots(
 
     if not ss_times:
         ss_times = await valid_ss_time([], num_capture, length, frame_rate, meta, retake=force_screenshots)
+        ss_times = await align_to_keyframes(path, ss_times, meta)
 
     if meta.get('frame_overlay', False):
         if meta['debug']:
@@ -1050,7 +1025,13 @@ async def screenshots(
 
     async def capture_with_semaphore(args: tuple[int, str, float, str, float, float, float, float, str, bool, dict[str, Any]]) -> Optional[tuple[int, Optional[str]]]:
         async with semaphore:
-            return await capture_screenshot(args)
+            result = await capture_screenshot(args)
+        # Hand finished images straight to the uploader; ones that need a retake are sent after retaking
+        if on_capture is not None and result is not None and result[1] and await asyncio.to_thread(os.path.exists, result[1]):
+            size = await asyncio.to_thread(os.path.getsize, result[1])
+            if manual_frames or image_meets_host_requirements(size, img_host):
+                on_capture(result[1])
+        return result
 
     capture_tasks: list[Awaitable[Optional[tuple[int, Optional[str]]]]] = []
     for i in range(num_capture):
@@ -1117,27 +1098,12 @@ async def screenshots(
             if image_size <= 75000:
                 console.print(f"[yellow]Image {image_path} is incredibly small, retaking.")
                 retake = True
+            elif image_meets_host_requirements(image_size, img_host):
+                if meta['debug']:
+                    console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
             else:
-                if img_host and "imgbb" in img_host:
-                    if image_size <= 31000000:
-                        if meta['debug']:
-                            console.print(f"[green]Image {image_path} meets size requirements for imgbb.[/green]")
-                    else:
-                        console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for imgbb, retaking.")
-                        retake = True
-                elif img_host and img_host in ["imgbox", "pixhost"]:
-                    if 75000 < image_size <= 10000000:
-                        if meta['debug']:
-                            console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
-                    else:
-                        console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for {img_host}, retaking.")
-                        retake = True
-                elif img_host and img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"]:
-                    if meta['debug']:
-                        console.print(f"[green]Image {image_path} meets size requirements for {img_host}.[/green]")
-                else:
-                    console.print(f"[red]Unknown image host or image doesn't meet requirements for host: {img_host}, retaking.")
-                    retake = True
+                console.print(f"[red]Image {image_path} with size {image_size} bytes: does not meet size requirements for image host {img_host}, retaking.")
+                retake = True
 
         if retake:
             retry_attempts = 5
@@ -1145,6 +1111,9 @@ async def screenshots(
             frame_rate = meta.get('frame_rate', 24.0)
             original_index = int(image_path.rsplit('-', 1)[-1].split('.')[0])
             original_time = ss_times[original_index] if original_index < len(ss_times) else None
+            if original_time is not None and image_size <= 75000:
+                # Blank/flat frame: don't pick this keyframe again for this file
+                await frame_index.reject(path, float(original_time))
 
             for attempt in range(1, retry_attempts + 1):
                 if original_time is not None:
@@ -1168,22 +1137,12 @@ async def screenshots(
                                 continue
 
                             new_size = os.path.getsize(screenshot_path)
-                            valid_image = False
-
-                            if img_host and "imgbb" in img_host:
-                                if 75000 < new_size <= 31000000:
-                                    console.print(f"[green]Successfully retaken screenshot for: {screenshot_path} ({new_size} bytes)[/green]")
-                                    valid_image = True
-                            elif img_host and img_host in ["imgbox", "pixhost"]:
-                                if 75000 < new_size <= 10000000:
-                                    console.print(f"[green]Successfully retaken screenshot for: {screenshot_path} ({new_size} bytes)[/green]")
-                                    valid_image = True
-                            elif img_host and img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"] and new_size > 75000:
-                                console.print(f"[green]Successfully retaken screenshot for: {screenshot_path} ({new_size} bytes)[/green]")
-                                valid_image = True
 
-                            if valid_image:
+                            if image_meets_host_requirements(new_size, img_host):
+                                console.print(f"[green]Successfully retaken screenshot for: {screenshot_path} ({new_size} bytes)[/green]")
                                 valid_results.append(screenshot_path)
+                                if on_capture is not None:
+                                    on_capture(screenshot_path)
                                 break
                         except Exception as e:
                             console.print(f"[red]Error retaking screenshot for {image_path} at {adjusted_time:.2f}s: {e}[/red]")
@@ -1211,19 +1170,11 @@ async def screenshots(
                             continue
 
                         new_size = os.path.getsize(screenshot_path)
-                        valid_image = False
-
-                        if img_host and "imgbb" in img_host:
-                            if 75000 < new_size <= 31000000:
-                                valid_image = True
-                        elif img_host and img_host in ["imgbox", "pixhost"]:
-                            if 75000 < new_size <= 10000000:
-                                valid_image = True
-                        elif img_host and img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"] and new_size > 75000:
-                            valid_image = True
-
-                        if valid_image:
+
+                        if image_meets_host_requirements(new_size, img_host):
                             valid_results.append(screenshot_path)
+                            if on_capture is not None:
+                                on_capture(screenshot_path)
                             break
                     except Exception as e:
                         console.print(f"[red]Error retaking screenshot for {image_path} at random time {random_time:.2f}s: {e}[/red]")
@@ -1259,6 +1210,17 @@ async def screenshots(
     return valid_results if valid_results else None
 
 
+def image_meets_host_requirements(image_size: int, img_host: Optional[str]) -> bool:
+    """Whether a screenshot's size is acceptable for ``img_host``; anything else is retaken."""
+    if image_size <= 75000 or not img_host:
+        return False
+    if "imgbb" in img_host:
+        return image_size <= 31000000
+    if img_host in ["imgbox", "pixhost"]:
+        return image_size <= 10000000
+    return img_host in ["ptpimg", "lensdump", "ptscreens", "onlyimage", "dalexni", "zipline", "passtheimage", "seedpool_cdn", "sharex", "utppm"]
+
+
 async def capture_screenshot(args: tuple[int, str, float, str, float, float, float, float, str, bool, dict[str, Any]]) -> Optional[tuple[int, Optional[str]]]:
     index, path, ss_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap, meta = args
 
@@ -1599,9 +1561,13 @@ async def valid_ss_time(ss_times: list[str], num_screens: int, length: float, fr
 
 async def kill_all_child_processes() -> None:
     """Ensures all child processes are terminated."""
+    if cleanup_manager.deferred:
+        # Parallel queue run: the other items' ffmpeg/mkbrr processes are children too
+        return
     try:
         current_process = psutil.Process()
-        children = current_process.children(recursive=True)  # Get child processes once
+        # Get child processes once, leaving protected background work (BASE hashing) alone
+        children = [child for child in current_process.children(recursive=True) if child.pid not in protected_pids]
 
         for child in children:
             console.print(f"[red]Killing stuck worker process: {child.pid}[/red]")
@@ -1618,8 +1584,23 @@ async def kill_all_child_processes() -> None:
         console.print(f"[yellow]Warning: Error during child process cleanup: {e}[/yellow]")
 
 
+async def align_to_keyframes(path: str, ss_times: list[str], meta: dict[str, Any]) -> list[str]:
+    """Move each screenshot time onto the next keyframe, using the persistent keyframe index."""
+    aligned = await frame_index.align(path, [float(ss_time) for ss_time in ss_times], run_ffmpeg, meta)
+    result: list[str] = []
+    seen: set[float] = set()
+    for original, ss_time in zip(ss_times, aligned):
+        # Close candidates can land on the same keyframe; keep the original time for the later ones
+        result.append(original if ss_time in seen else str(ss_time))
+        seen.add(ss_time)
+    return result
+
+
 async def get_frame_info(path: str, ss_time: Union[str, float], meta: dict[str, Any]) -> dict[str, Any]:
     """Get frame information (type, exact timestamp) for a specific frame"""
+    cached_info = frame_index.frame_info(path, float(ss_time), meta.get('frame_rate', 24.0))
+    if cached_info is not None:
+        return cached_info
     try:
         ss_time_value = float(ss_time)
         ffmpeg_module = cast(Any, ffmpeg)
@@ -1832,18 +1813,19 @@ class TakeScreensManager:
             num_screens: int = 0,
             force_screenshots: bool = False
     ) -> None:
-        await disc_screenshots(
-            meta,
-            filename,
-            bdinfo,
-            folder_id,
-            base_dir,
-            use_vs,
-            image_list,
-            ffdebug,
-            num_screens,
-            force_screenshots
-        )
+        async with resource_limits.slot('ffmpeg'):
+            await disc_screenshots(
+                meta,
+                filename,
+                bdinfo,
+                folder_id,
+                base_dir,
+                use_vs,
+                image_list,
+                ffdebug,
+                num_screens,
+                force_screenshots
+            )
 
     async def capture_disc_task(
             self,
@@ -1865,7 +1847,8 @@ class TakeScreensManager:
             num_screens: int = 0,
             retry_cap: bool = False
     ) -> None:
-        await dvd_screenshots(meta, disc_num, num_screens, retry_cap)
+        async with resource_limits.slot('ffmpeg'):
+            await dvd_screenshots(meta, disc_num, num_screens, retry_cap)
 
     async def capture_dvd_screenshot(
             self,
@@ -1883,8 +1866,10 @@ class TakeScreensManager:
             num_screens: int = 0,
             force_screenshots: bool = False,
             manual_frames: Union[str, list[str]] = "",
+            on_capture: Optional[Callable[[str], None]] = None,
     ) -> Optional[list[str]]:
-        return await screenshots(path, filename, folder_id, base_dir, meta, num_screens, force_screenshots, manual_frames)
+        async with resource_limits.slot('ffmpeg'):
+            return await screenshots(path, filename, folder_id, base_dir, meta, num_screens, force_screenshots, manual_frames, on_capture)
 
     async def capture_screenshot(
             self,
@@ -10,18 +10,22 @@ import traceback
 import urllib.parse
 from collections.abc import Awaitable
 from pathlib import Path
-from typing import Any, Callable, Optional, TypedDict, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypedDict, Union, cast
 
 import aiohttp
-import qbittorrentapi
 from torf import Torrent
 
 from cogs.redaction import Redaction
 from src.console import console
+from src.link_plan import LinkPlan
+from src.qbit_mirror import QbitMirror, qbit_mirrors
 from src.torrentcreate import TorrentCreator
 
+if TYPE_CHECKING:
+    import qbittorrentapi
+
 # These have to be global variables to be shared across all instances since a new instance is made every time
-qbittorrent_cached_clients: dict[tuple[str, int, str], qbittorrentapi.Client] = {}  # Cache for qbittorrent clients that have been successfully logged into
+qbittorrent_cached_clients: "dict[tuple[str, int, str], qbittorrentapi.Client]" = {}  # Cache for qbittorrent clients that have been successfully logged into
 qbittorrent_locks: collections.defaultdict[tuple[str, int, str], asyncio.Lock] = collections.defaultdict(asyncio.Lock)  # Locks for qbittorrent clients to prevent concurrent logins
 
 
@@ -104,11 +108,17 @@ class QbittorrentClientMixin:
                 try:
                     if qbt_client is None:
                         raise RuntimeError("qbt_client should not be None")
-                    torrent_properties = await self.retry_qbt_operation(
-                        lambda: asyncio.to_thread(qbt_client.torrents_properties, torrent_hash=info_hash_v1),
-                        f"Get torrent properties for hash {info_hash_v1}",
-                        initial_timeout=14.0
-                    )
+                    mirror = await self.synced_qbit_mirror(client, qbt_client)
+                    mirrored = mirror.by_hash(info_hash_v1)
+                    # qBittorrent 5 lists the comment with the torrent; older versions need the properties call
+                    if mirrored is not None and 'comment' in mirrored:
+                        torrent_properties = mirrored
+                    else:
+                        torrent_properties = await self.retry_qbt_operation(
+                            lambda: asyncio.to_thread(qbt_client.torrents_properties, torrent_hash=info_hash_v1),
+                            f"Get torrent properties for hash {info_hash_v1}",
+                            initial_timeout=14.0
+                        )
                     if meta['debug']:
                         console.print(f"[cyan]Retrieved torrent properties via client for hash: {info_hash_v1}")
 
@@ -258,9 +268,10 @@ class QbittorrentClientMixin:
                     console.print(f"[bold red]{operation_name} failed after {max_retries + 1} attempts (final timeout: {timeout}s)")
                     raise  # Re-raise the TimeoutError so caller can handle it
 
-    async def init_qbittorrent_client(self, client: dict[str, Any]) -> Optional[qbittorrentapi.Client]:
+    async def init_qbittorrent_client(self, client: dict[str, Any]) -> "Optional[qbittorrentapi.Client]":
         # Creates and logs into a qbittorrent client, with caching to avoid redundant logins
         # If login fails, returns None
+        import qbittorrentapi
         client_key = (client['qbit_url'], client['qbit_port'], client['qbit_user'])
         async with qbittorrent_locks[client_key]:
             # We lock to further prevent concurrent logins for the same client. If two clients try to init at the same time, if the first one succeeds, the second one can use the cached client.
@@ -293,7 +304,14 @@ class QbittorrentClientMixin:
                 qbittorrent_cached_clients[client_key] = qbt_client
                 return qbt_client
 
-    async def search_qbit_for_torrent(self, meta: dict[str, Any], client: dict[str, Any], qbt_client: Optional[qbittorrentapi.Client] = None, qbt_session: Optional[aiohttp.ClientSession] = None, proxy_url: Optional[str] = None) -> Optional[str]:
+    async def synced_qbit_mirror(self, client: dict[str, Any], qbt_client: "qbittorrentapi.Client") -> QbitMirror:
+        """The torrent list mirror for a logged-in client, brought up to date with one sync/maindata delta."""
+        mirror = qbit_mirrors.get((client['qbit_url'], client['qbit_port'], client['qbit_user']), qbt_client)
+        await self.retry_qbt_operation(mirror.refresh, "Sync torrents list", initial_timeout=14.0)
+        return mirror
+
+    async def search_qbit_for_torrent(self, meta: dict[str, Any], client: dict[str, Any], qbt_client: "Optional[qbittorrentapi.Client]" = None, qbt_session: Optional[aiohttp.ClientSession] = None, proxy_url: Optional[str] = None) -> Optional[str]:
+        import qbittorrentapi
         trackers_config = cast(dict[str, Any], self.config.get('TRACKERS', {}))
         mtv_config_value = trackers_config.get('MTV', {})
         mtv_config = cast(dict[str, Any], mtv_config_value) if isinstance(mtv_config_value, dict) else {}
@@ -344,6 +362,7 @@ class QbittorrentClientMixin:
             # **Step 1: Find correct torrents using content_path**
             best_match: Optional[dict[str, Any]] = None
             matching_torrents: list[dict[str, Any]] = []
+            torrent_total: Optional[int] = None
 
             try:
                 if proxy_url:
@@ -400,11 +419,9 @@ class QbittorrentClientMixin:
                     if qbt_client is None:
                         console.print("[bold red]qBittorrent client not initialized")
                         return None
-                    torrents = await self.retry_qbt_operation(
-                        lambda: asyncio.to_thread(qbt_client.torrents_info),
-                        "Get torrents list",
-                        initial_timeout=14.0
-                    )
+                    mirror = await self.synced_qbit_mirror(client, qbt_client)
+                    torrents = self._build_mock_torrents(mirror.by_name(str(meta['uuid'])))
+                    torrent_total = len(mirror)
             except asyncio.TimeoutError:
                 console.print("[bold red]Getting torrents list timed out after retries")
                 return None
@@ -431,7 +448,7 @@ class QbittorrentClientMixin:
 
                 matching_torrents.append({'hash': torrent.hash, 'name': torrent.name})
 
-            console.print(f"[cyan]DEBUG: Checked {torrent_count} total torrents in qBittorrent[/cyan]")
+            console.print(f"[cyan]DEBUG: Checked {torrent_total if torrent_total is not None else torrent_count} total torrents in qBittorrent[/cyan]")
             if not matching_torrents:
                 console.print("[yellow]No matching torrents found in qBittorrent.")
                 return None
@@ -553,6 +570,7 @@ class QbittorrentClientMixin:
                 await qbt_session.close()
 
     async def qbittorrent(self, path: str, torrent: Torrent, local_path: str, remote_path: str, client: dict[str, Any], _is_disc: bool, filelist: list[str], meta: dict[str, Any], tracker: str, cross: bool = False) -> None:
+        import qbittorrentapi
         qbt_proxy_url = ""
         if meta.get('keep_folder'):
             path = os.path.dirname(path)
@@ -579,6 +597,7 @@ class QbittorrentClientMixin:
             console.print("Linking method:", linking_method)
         use_symlink = linking_method == "symlink"
         use_hardlink = linking_method == "hardlink"
+        reflink_fallback = bool(client.get('reflink_fallback', False))
 
         # Get linked folder for this drive
         linked_folder = self._coerce_str_list(client.get('linked_folder', []))
@@ -697,7 +716,8 @@ class QbittorrentClientMixin:
                     meta=meta,
                     torrent=torrent,
                     tracker_dir=tracker_dir,
-                    use_hardlink=use_hardlink
+                    use_hardlink=use_hardlink,
+                    reflink_fallback=reflink_fallback
                 )
             else:
                 src_name = os.path.basename(src.rstrip(os.sep))
@@ -706,7 +726,8 @@ class QbittorrentClientMixin:
                     src=src,
                     dst=dst,
                     use_hardlink=use_hardlink,
-                    debug=meta.get('debug', False)
+                    debug=meta.get('debug', False),
+                    reflink_fallback=reflink_fallback
                 )
 
             allow_fallback = client.get('allow_fallback', True)
@@ -1231,8 +1252,9 @@ class QbittorrentClientMixin:
 
         matching_torrents.sort(key=get_priority_score)
 
-    async def _search_single_qbit_client(self, client_config: dict[str, Any], _content_path: str, meta: dict[str, Any], client_name: str) -> list[dict[str, Any]]:
+    async def _search_single_qbit_client(self, client_config: dict[str, Any], content_path: str, meta: dict[str, Any], client_name: str) -> list[dict[str, Any]]:
         """Search a single qBittorrent client for matching torrents."""
+        import qbittorrentapi
         qbt_session: Optional[aiohttp.ClientSession] = None
         qbt_client: Optional[qbittorrentapi.Client] = None
         qbt_proxy_url = ''
@@ -1280,6 +1302,7 @@ class QbittorrentClientMixin:
                     qbt_client = potential_qbt_client
 
             search_term = meta['uuid'].replace('[', '.').replace(']', '.')
+            path_hashes: set[str] = set()
             try:
                 if proxy_url:
                     # Build qui's enhanced filter options with expression support
@@ -1336,11 +1359,15 @@ class QbittorrentClientMixin:
                 else:
                     if qbt_client is None:
                         return []
-                    torrents = await self.retry_qbt_operation(
-                        lambda: asyncio.to_thread(qbt_client.torrents_info),
-                        "Get torrents list",
-                        initial_timeout=14.0
-                    )
+                    mirror = await self.synced_qbit_mirror(client_config, qbt_client)
+                    candidate_names = [str(meta['uuid'])]
+                    if meta.get('is_disc', "") in ("", None) and len(meta.get('filelist', [])) == 1:
+                        candidate_names.append(os.path.basename(meta['filelist'][0]))
+                    # A torrent renamed in the client is still found through the path it points at
+                    by_path = mirror.by_content_path(content_path)
+                    path_hashes = {str(torrent['hash']) for torrent in by_path}
+                    candidates = {torrent['hash']: torrent for torrent in [*mirror.by_name(*candidate_names), *by_path]}
+                    torrents = self._build_mock_torrents(list(candidates.values()))
             except asyncio.TimeoutError:
                 console.print("[bold red]Getting torrents list timed out after retries")
                 if qbt_session:
@@ -1363,7 +1390,7 @@ class QbittorrentClientMixin:
                             console.print("[yellow]Skipping torrent with missing name attribute")
                         continue
 
-                    if not self._torrent_name_matches(torrent_name, meta):
+                    if not self._torrent_name_matches(torrent_name, meta) and torrent.hash not in path_hashes:
                         continue
 
                     torrent_properties: dict[str, Any] = {}
@@ -1884,7 +1911,7 @@ async def match_tracker_url(tracker_urls: list[str], meta: dict[str, Any]) -> No
         console.print(f"[bold cyan]Storing matched tracker IDs for later removal: {remove_trackers}")
 
 
-async def create_cross_seed_links(meta: dict[str, Any], torrent: Torrent, tracker_dir: str, use_hardlink: bool) -> bool:
+async def create_cross_seed_links(meta: dict[str, Any], torrent: Torrent, tracker_dir: str, use_hardlink: bool, reflink_fallback: bool = False) -> bool:
     debug = meta.get('debug', False)
     metainfo_raw = getattr(torrent, 'metainfo', {})
     metainfo: dict[str, Any] = cast(dict[str, Any], metainfo_raw) if isinstance(metainfo_raw, dict) else cast(dict[str, Any], {})
@@ -1933,10 +1960,8 @@ async def create_cross_seed_links(meta: dict[str, Any], torrent: Torrent, tracke
         })
 
     destination_root = os.path.join(tracker_dir, torrent_name) if multi_file else tracker_dir
-    if multi_file:
-        await asyncio.to_thread(os.makedirs, destination_root, exist_ok=True)
-    else:
-        await asyncio.to_thread(os.makedirs, tracker_dir, exist_ok=True)
+    plan = LinkPlan('hardlink' if use_hardlink else 'symlink', reflink_fallback=reflink_fallback)
+    plan.add_dir(destination_root)
 
     release_root_value = meta.get('path')
     release_root = str(release_root_value) if isinstance(release_root_value, str) else None
@@ -2050,25 +2075,22 @@ async def create_cross_seed_links(meta: dict[str, Any], torrent: Torrent, tracke
         if match_reason == 'fallback' and debug:
             console.print(f"[yellow]Cross-seed mapping fallback used for: {relative_path}")
 
-        dest_parent = os.path.dirname(dest_file_path)
-        if dest_parent:
-            await asyncio.to_thread(os.makedirs, dest_parent, exist_ok=True)
-        if await asyncio.to_thread(os.path.exists, dest_file_path):
-            if debug:
-                console.print(f"[yellow]Cross-seed link already exists, keeping: {dest_file_path}")
-            continue
+        plan.add_file(source_file, dest_file_path, relative_path)
 
-        linked = await async_link_directory(source_file, dest_file_path, use_hardlink=use_hardlink, debug=debug)
-        if not linked:
-            console.print(f"[bold red]Linking failed for cross-seed file: {relative_path}")
-            return False
+    # Existing links are kept as they are
+    result = await plan.run()
+    if not result.ok:
+        result.print_failures("Cross-seed link")
+        return False
 
     if debug:
+        if result.existing:
+            console.print(f"[yellow]Kept {result.existing} existing cross-seed links")
         console.print(f"[green]Prepared cross-seed link tree at {os.path.join(tracker_dir, torrent_name) if multi_file else tracker_dir}")
     return True
 
 
-async def async_link_directory(src: str, dst: str, use_hardlink: bool = True, debug: bool = False) -> bool:
+async def async_link_directory(src: str, dst: str, use_hardlink: bool = True, debug: bool = False, reflink_fallback: bool = False) -> bool:
     try:
         # Create destination directory
         await asyncio.to_thread(os.makedirs, os.path.dirname(dst), exist_ok=True)
@@ -2108,46 +2130,13 @@ async def async_link_directory(src: str, dst: str, use_hardlink: bool = True, de
         else:
             if use_hardlink:
                 # For hardlinks, we need to recreate the directory structure
-                await asyncio.to_thread(os.makedirs, dst, exist_ok=True)
-
-                # Get all files in the source directory
-                def _collect_files(src: str, dst: str) -> list[tuple[str, str, str]]:
-                    items: list[tuple[str, str, str]] = []
-                    for root, _dirs, files in os.walk(src):
-                        for file in files:
-                            src_path = os.path.join(root, file)
-                            rel_path = os.path.relpath(src_path, src)
-                            items.append((src_path, os.path.join(dst, rel_path), rel_path))
-                    return items
-
-                all_items = await asyncio.to_thread(_collect_files, src, dst)
-
-                # Create subdirectories first (to avoid race conditions)
-                subdirs: set[str] = set()
-                for _, dst_path, _ in all_items:
-                    subdir = os.path.dirname(dst_path)
-                    if subdir and subdir not in subdirs:
-                        subdirs.add(subdir)
-                        await asyncio.to_thread(os.makedirs, subdir, exist_ok=True)
-
-                def _try_hardlink(src_path: str, dst_path: str, rel_path: str) -> bool:
-                    try:
-                        os.link(src_path, dst_path)
-                        if debug and rel_path == os.path.relpath(all_items[0][0], src):
-                            console.print(f"[green]Hard link created for file: {dst_path} -> {src_path}")
-                        return True
-                    except OSError as e:
-                        console.print(f"[yellow]Hard link failed for file {rel_path}: {e}")
-                        return False
-
-                # Create hardlinks for all files
-                success = True
-                for src_path, dst_path, rel_path in all_items:
-                    if not await asyncio.to_thread(_try_hardlink, src_path, dst_path, rel_path):
-                        success = False
-                        break
-
-                return success
+                plan = LinkPlan('hardlink', reflink_fallback=reflink_fallback)
+                await asyncio.to_thread(plan.add_tree, src, dst)
+                result = await plan.run()
+                if debug:
+                    console.print(f"[green]Hard linked {result.linked + result.reflinked} files into {dst} ({result.reflinked} reflinked, {result.existing} already present)")
+                result.print_failures("Hard link")
+                return result.ok
             else:
                 # For symlinks, just link the directory itself
                 try:
@@ -0,0 +1,198 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""
+Bencode-level editing of .torrent files.
+
+Per-tracker torrents only differ from BASE.torrent in a handful of small keys
+(announce, comment, source, entropy), so instead of decoding the whole metainfo,
+validating it and encoding it again for every tracker, the file is split once
+into raw top-level and ``info`` values. Edits replace individual values, and the
+untouched ones (including the piece table) are written straight from the original
+buffer. The infohash is computed over the same raw slices.
+"""
+import collections
+import hashlib
+import os
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional, Union
+
+Chunk = Union[bytes, memoryview]
+
+_MAX_CACHED = 8
+_cache: collections.OrderedDict[str, tuple[int, int, 'RawTorrent']] = collections.OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def bencode(value: Any) -> bytes:
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b'i%de' % value
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if isinstance(value, (bytes, bytearray)):
+        return b'%d:%s' % (len(value), bytes(value))
+    if isinstance(value, Mapping):
+        items = sorted((key.encode('utf-8') if isinstance(key, str) else bytes(key), item) for key, item in value.items())
+        return b'd' + b''.join(bencode(key) + bencode(item) for key, item in items) + b'e'
+    if isinstance(value, Iterable):
+        return b'l' + b''.join(bencode(item) for item in value) + b'e'
+    raise ValueError(f"Cannot bencode {type(value).__name__}")
+
+
+def _skip(data: bytes, pos: int) -> int:
+    """Return the offset just past the bencoded value starting at ``pos``."""
+    token = data[pos:pos + 1]
+    if token == b'i':
+        return data.index(b'e', pos) + 1
+    if token in (b'l', b'd'):
+        pos += 1
+        while data[pos:pos + 1] != b'e':
+            if pos >= len(data):
+                raise ValueError("Truncated bencoded data")
+            pos = _skip(data, pos)
+        return pos + 1
+    if token.isdigit():
+        colon = data.index(b':', pos)
+        end = colon + 1 + int(data[pos:colon])
+        if end > len(data):
+            raise ValueError("Truncated bencoded string")
+        return end
+    raise ValueError(f"Invalid bencoded data at offset {pos}")
+
+
+def _split_dict(data: bytes, pos: int) -> tuple[dict[bytes, tuple[int, int]], int]:
+    """Map each key of the dict at ``pos`` to the (start, end) span of its raw value."""
+    if data[pos:pos + 1] != b'd':
+        raise ValueError(f"Expected a bencoded dict at offset {pos}")
+    spans: dict[bytes, tuple[int, int]] = {}
+    pos += 1
+    while data[pos:pos + 1] != b'e':
+        if pos >= len(data):
+            raise ValueError("Truncated bencoded dict")
+        key_end = _skip(data, pos)
+        key = data[data.index(b':', pos) + 1:key_end]
+        value_end = _skip(data, key_end)
+        spans[key] = (key_end, value_end)
+        pos = value_end
+    return spans, pos + 1
+
+
+class RawTorrent:
+    """A .torrent file split into raw top-level and ``info`` values."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._view = memoryview(data)
+        self.top, _ = _split_dict(data, 0)
+        if b'info' not in self.top:
+            raise ValueError("Torrent has no info dict")
+        self.info, _ = _split_dict(data, self.top[b'info'][0])
+
+    @classmethod
+    def load(cls, path: str, cache: bool = False) -> 'RawTorrent':
+        """
+        Read ``path``. With ``cache``, the parsed file is reused while its size and mtime
+        are unchanged; meant for BASE.torrent, which every tracker patches.
+        """
+        if not cache:
+            with open(path, 'rb') as f:
+                return cls(f.read())
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                _cache.move_to_end(key)
+                return cached[2]
+        with open(path, 'rb') as f:
+            torrent = cls(f.read())
+        with _cache_lock:
+            _cache[key] = (st.st_mtime_ns, st.st_size, torrent)
+            while len(_cache) > _MAX_CACHED:
+                _cache.popitem(last=False)
+        return torrent
+
+    def raw(self, span: tuple[int, int]) -> memoryview:
+        return self._view[span[0]:span[1]]
+
+    def string(self, key: bytes, info: bool = False) -> Optional[str]:
+        span = (self.info if info else self.top).get(key)
+        if span is None:
+            return None
+        raw = self._data[span[0]:span[1]]
+        colon = raw.find(b':')
+        if colon < 1 or not raw[:colon].isdigit():
+            return None
+        return raw[colon + 1:].decode('utf-8', errors='replace')
+
+    def patch(self) -> 'TorrentPatch':
+        return TorrentPatch(self)
+
+
+class TorrentPatch:
+    """Pending edits to a ``RawTorrent``; unedited values are emitted from the original bytes."""
+
+    def __init__(self, base: RawTorrent) -> None:
+        self._base = base
+        self._top: dict[bytes, Optional[bytes]] = {}
+        self._info: dict[bytes, Optional[bytes]] = {}
+
+    def set(self, key: str, value: Any) -> 'TorrentPatch':
+        self._top[key.encode('utf-8')] = bencode(value)
+        return self
+
+    def delete(self, key: str) -> 'TorrentPatch':
+        self._top[key.encode('utf-8')] = None
+        return self
+
+    def keep_only(self, keys: Iterable[str]) -> 'TorrentPatch':
+        keep = {key.encode('utf-8') for key in keys} | {b'info'}
+        for key in self._base.top:
+            if key not in keep:
+                self._top[key] = None
+        return self
+
+    def set_info(self, key: str, value: Any) -> 'TorrentPatch':
+        if key == 'pieces':
+            raise ValueError("pieces can't be patched")
+        self._info[key.encode('utf-8')] = bencode(value)
+        return self
+
+    @staticmethod
+    def _dict_chunks(base: RawTorrent, spans: dict[bytes, tuple[int, int]], edits: dict[bytes, Optional[bytes]], nested: Optional[dict[bytes, list[Chunk]]] = None) -> list[Chunk]:
+        chunks: list[Chunk] = [b'd']
+        for key in sorted(spans.keys() | edits.keys()):
+            if key in edits:
+                value = edits[key]
+                if value is None:
+                    continue
+                chunks += [bencode(key), value]
+            elif nested is not None and key in nested:
+                chunks.append(bencode(key))
+                chunks += nested[key]
+            else:
+                chunks += [bencode(key), base.raw(spans[key])]
+        chunks.append(b'e')
+        return chunks
+
+    def info_chunks(self) -> list[Chunk]:
+        if not self._info:
+            return [self._base.raw(self._base.top[b'info'])]
+        return self._dict_chunks(self._base, self._base.info, self._info)
+
+    def info_hash(self) -> str:
+        digest = hashlib.sha1(usedforsecurity=False)  # SHA1 required for torrent info hash
+        for chunk in self.info_chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def chunks(self) -> list[Chunk]:
+        return self._dict_chunks(self._base, self._base.top, self._top, {b'info': self.info_chunks()})
+
+    def dump(self) -> bytes:
+        return b''.join(self.chunks())
+
+    def write(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.writelines(self.chunks())
@@ -21,7 +21,10 @@ import torf
 from torf import Torrent
 from typing_extensions import TypeAlias
 
+from src.cleanup import protected_pids
 from src.console import console
+from src.piece_cache import MIN_REUSE_COVERAGE, piece_hash_cache
+from src.resource_limits import resource_limits
 
 PIECE_SIZE_MIN = 32 * 1024  # 32 KiB
 PIECE_SIZE_MAX = 134_217_728  # 128 MiB
@@ -193,15 +196,23 @@ class TorrentCreator:
         output_filename: str,
         tracker_url: Optional[str] = None,
         piece_size: int = 0,
+        background: bool = False,
     ) -> Union[str, Torrent]:
-        # Ensure only one torrent creation runs at a time
+        """Hash ``path`` into ``tmp/<uuid>/<output_filename>.torrent``.
+
+        ``background=True`` is used when hashing runs alongside screenshot capture: the mkbrr
+        process is shielded from the mid-run child-process cleanup, and is terminated if the
+        awaiting task is cancelled instead.
+        """
+        # Ensure only one torrent creation runs at a time (or queue_hashing_slots in a parallel queue run)
+        semaphore = resource_limits.semaphore('hashing') or cls._create_torrent_semaphore
         wait_started: Optional[float] = None
-        if cls._create_torrent_semaphore.locked():
+        if semaphore.locked():
             wait_started = time.time()
             if meta.get('debug', False):
                 console.print("[yellow]Waiting for create_torrent slot...[/yellow]")
 
-        async with cls._create_torrent_semaphore:
+        async with semaphore:
             cls._create_torrent_inflight += 1
             if meta.get('debug', False):
                 wait_msg = ""
@@ -244,7 +255,6 @@ class TorrentCreator:
                         exclude = []
                     elif not meta.get('tv_pack', False):
                         path_dir = os.fspath(path)
-                        os.chdir(path_dir)
                         globs = [os.path.basename(f) for f in glob.glob(os.path.join(path_dir, "*.mkv"))] + [
                             os.path.basename(f) for f in glob.glob(os.path.join(path_dir, "*.mp4"))
                         ] + [os.path.basename(f) for f in glob.glob(os.path.join(path_dir, "*.ts"))]
@@ -267,6 +277,14 @@ class TorrentCreator:
                     exclude = ["*.*", "*sample.mkv", "!sample*.*"] if not meta['is_disc'] else []
                     include = ["*.mkv", "*.mp4", "*.ts"] if not meta['is_disc'] else []
 
+                # A retry of content we've already hashed doesn't need another full read from mkbrr
+                if meta.get('mkbrr') and piece_hash_cache.enabled:
+                    cached_torrent = await asyncio.to_thread(
+                        cls._create_from_piece_cache, meta, path, output_filename, tracker_url, piece_size, include, exclude
+                    )
+                    if cached_torrent is not None:
+                        return cached_torrent
+
                 # If using mkbrr, run the external application
                 if meta.get('mkbrr'):
                     try:
@@ -319,9 +337,14 @@ class TorrentCreator:
                         if meta['debug']:
                             console.print(f"[cyan]mkbrr cmd: {cmd}")
 
+                        mkbrr_processes: list[subprocess.Popen[str]] = []
+
                         # Run mkbrr subprocess in thread to avoid blocking
                         def run_mkbrr() -> int:
                             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+                            mkbrr_processes.append(process)
+                            if background:
+                                protected_pids.add(process.pid)
 
                             if process.stdout is None:
                                 return process.wait()
@@ -363,7 +386,16 @@ class TorrentCreator:
                             # Wait for the process to finish
                             return process.wait()
 
-                        result = await asyncio.to_thread(run_mkbrr)
+                        try:
+                            result = await asyncio.to_thread(run_mkbrr)
+                        except asyncio.CancelledError:
+                            for process in mkbrr_processes:
+                                with contextlib.suppress(OSError):
+                                    process.terminate()
+                            raise
+                        finally:
+                            for process in mkbrr_processes:
+                                protected_pids.discard(process.pid)
 
                         # Verify the torrent was actually created
                         if result != 0:
@@ -374,6 +406,7 @@ class TorrentCreator:
                             console.print("[bold red]mkbrr did not create a torrent file!")
                             raise FileNotFoundError(f"Expected torrent file {output_path} was not created")
                         else:
+                            await asyncio.to_thread(piece_hash_cache.record_torrent, output_path, os.fspath(path))
                             return output_path
 
                     except subprocess.CalledProcessError as e:
@@ -417,7 +450,8 @@ class TorrentCreator:
 
                 # Run torrent generation in thread to avoid blocking the event loop
                 def generate_torrent() -> None:
-                    torrent.generate(callback=cls.torf_cb, interval=5)
+                    if not piece_hash_cache.generate(torrent, callback=cls.torf_cb):
+                        torrent.generate(callback=cls.torf_cb, interval=5)
                     torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
                     torrent.verify_filesize(path)
 
@@ -438,6 +472,63 @@ class TorrentCreator:
                 if meta.get('debug', False):
                     console.print(f"[cyan]create_torrent end | in-flight={cls._create_torrent_inflight}[/cyan]")
 
+    @classmethod
+    def _create_from_piece_cache(
+        cls,
+        meta: Meta,
+        path: Union[str, os.PathLike[str]],
+        output_filename: str,
+        tracker_url: Optional[str],
+        piece_size: int,
+        include: list[str],
+        exclude: list[str],
+    ) -> Optional[str]:
+        """Write the torrent from cached piece hashes if they cover (nearly) all of the content."""
+        try:
+            torrent = CustomTorrent(
+                meta=meta,
+                path=path,
+                trackers=[tracker_url or "https://fake.tracker"],
+                source="UA",
+                private=True,
+                exclude_globs=exclude or [],
+                include_globs=include or [],
+                creation_date=datetime.now(timezone.utc),
+                comment="Created by Upload Assistant",
+                created_by="Upload Assistant",
+            )
+            files = [(str(filepath), int(file.size)) for filepath, file in zip(torrent.filepaths, torrent.files)]
+        except Exception:
+            return None
+        if not files:
+            return None
+
+        # Same ceiling mkbrr would apply for this call
+        max_size = PIECE_SIZE_MAX
+        if piece_size:
+            with contextlib.suppress(ValueError, TypeError):
+                max_size = 2 ** min(27, max(16, math.floor(math.log2(int(piece_size) * 1024 * 1024))))
+        elif any(tracker in meta.get('trackers', []) for tracker in ['HDB', 'PTP', 'MTV']):
+            max_size = 16 * 1024 * 1024
+
+        largest_path, largest_size = max(files, key=lambda item: item[1])
+        for cached_size in piece_hash_cache.piece_sizes(piece_hash_cache.file_key(largest_path, largest_size)):
+            if not PIECE_SIZE_MIN <= cached_size <= max_size:
+                continue
+            if piece_hash_cache.coverage(files, cached_size) < MIN_REUSE_COVERAGE:
+                continue
+
+            output_path = os.path.join(meta['base_dir'], "tmp", meta['uuid'], f"{output_filename}.torrent")
+            torrent.piece_size = cached_size
+            if not piece_hash_cache.generate(torrent, callback=cls.torf_cb):
+                return None
+            if int(meta.get('randomized', 0)) >= 1:
+                torrent.metainfo['info']['entropy'] = random.randint(1, 999999)  # type: ignore  # nosec B311
+            torrent.write(output_path, overwrite=True)
+            console.print(f"[green]Reused cached piece hashes for {output_filename} ({cached_size // 1024} KiB pieces)")
+            return output_path
+        return None
+
     @staticmethod
     def torf_cb(torrent: Torrent, _filepath: str, pieces_done: int, pieces_total: int) -> None:
         if pieces_done == 0:
@@ -555,6 +646,7 @@ async def create_torrent(
     output_filename: str,
     tracker_url: Optional[str] = None,
     piece_size: int = 0,
+    background: bool = False,
 ) -> Union[str, Torrent]:
     return await TorrentCreator.create_torrent(
         meta=meta,
@@ -562,6 +654,7 @@ async def create_torrent(
         output_filename=output_filename,
         tracker_url=tracker_url,
         piece_size=piece_size,
+        background=background,
     )
 
 
@@ -11,10 +11,10 @@ from typing_extensions import TypeAlias
 
 from cogs.redaction import Redaction
 from src.cleanup import cleanup_manager
+from src.dupe_search_cache import dupe_search_cache
 from src.get_desc import DescriptionBuilder
 from src.manualpackage import ManualPackageManager
-from src.trackers.PTP import PTP
-from src.trackers.THR import THR
+from src.resource_limits import resource_limits
 from src.trackersetup import TRACKER_SETUP
 
 Meta: TypeAlias = dict[str, Any]
@@ -161,7 +161,7 @@ async def process_trackers(
                     print_tracker_result(tracker, tracker_class, status, False)
                     console.print(f"[red]{tracker} upload failed or returned data error.[/red]")
 
-        elif tracker in other_api_trackers:
+        elif tracker in other_api_trackers or tracker in http_trackers:
             tracker_status = cast(StatusDict, meta.get('tracker_status') or {})
             upload_status = cast(Mapping[str, Any], tracker_status.get(tracker, {})).get('upload', False)
             if upload_status:
@@ -176,41 +176,6 @@ async def process_trackers(
                         console.print(f"[red]Upload failed: {e}")
                         console.print(traceback.format_exc())
                         return
-                    if tracker == 'SN':
-                        await asyncio.sleep(16)
-                except Exception:
-                    console.print(traceback.format_exc())
-                    return
-
-                # Detect and handle None return value from upload method
-                if is_uploaded is None:
-                    console.print(f"[yellow]Warning: {tracker_class.tracker} upload method returned None instead of boolean. Treating as failed upload.[/yellow]")
-                    is_uploaded = False
-
-                status = cast(StatusDict, meta.get('tracker_status') or {}).get(tracker_class.tracker, {})
-                if is_uploaded and 'status_message' in status and "data error" not in str(status['status_message']):
-                    await client.add_to_client(meta, tracker_class.tracker)
-                    print_tracker_result(tracker, tracker_class, status, True)
-                else:
-                    print_tracker_result(tracker, tracker_class, status, False)
-                    console.print(f"[red]{tracker} upload failed or returned data error.[/red]")
-
-        elif tracker in http_trackers:
-            tracker_status = cast(StatusDict, meta.get('tracker_status') or {})
-            upload_status = cast(Mapping[str, Any], tracker_status.get(tracker, {})).get('upload', False)
-            if upload_status:
-                try:
-                    is_uploaded = False
-                    try:
-                        upload_start_time = time.time()
-                        is_uploaded = await tracker_class.upload(meta, disctype_value)
-                        upload_duration = time.time() - upload_start_time
-                        meta[f'{tracker}_upload_duration'] = upload_duration
-                    except Exception as e:
-                        console.print(f"[red]Upload failed: {e}")
-                        console.print(traceback.format_exc())
-                        return
-
                 except Exception:
                     console.print(traceback.format_exc())
                     return
@@ -259,7 +224,7 @@ async def process_trackers(
             tracker_status = cast(StatusDict, meta.get('tracker_status') or {})
             upload_status = cast(Mapping[str, Any], tracker_status.get(tracker, {})).get('upload', False)
             if upload_status:
-                thr = THR(config=config)
+                thr = tracker_class_map['THR'](config=config)
                 thr_any = cast(Any, thr)
                 is_uploaded = False
                 try:
@@ -285,7 +250,7 @@ async def process_trackers(
             upload_status = cast(Mapping[str, Any], tracker_status.get(tracker, {})).get('upload', False)
             if upload_status:
                 try:
-                    ptp = PTP(config=config)
+                    ptp = tracker_class_map['PTP'](config=config)
                     groupID = meta.get('ptp_groupID', None)
                     ptpUrl, ptpData = await ptp.fill_upload_form(groupID, meta)
                     is_uploaded = False
@@ -310,6 +275,16 @@ async def process_trackers(
                     console.print(traceback.format_exc())
                     return
 
+    async def process_tracker_with_slot(tracker: str) -> None:
+        async with resource_limits.slot('tracker'):
+            try:
+                await process_single_tracker(tracker)
+            finally:
+                # Whatever we just uploaded has to show up in the next item's dupe search
+                tracker_status = cast(StatusDict, meta.get('tracker_status') or {})
+                if cast(Mapping[str, Any], tracker_status.get(tracker, {})).get('upload', False):
+                    dupe_search_cache.invalidate(tracker)
+
     multi_screens = int(config['DEFAULT'].get('multiScreens', 2))
     discs = cast(list[Any], meta.get('discs') or [])
     one_disc = True
@@ -322,7 +297,7 @@ async def process_trackers(
         # Run all tracker tasks concurrently with individual error handling
         tasks: list[tuple[str, asyncio.Task[None]]] = []
         for tracker in enabled_trackers:
-            task = asyncio.create_task(process_single_tracker(tracker))
+            task = asyncio.create_task(process_tracker_with_slot(tracker))
             tasks.append((tracker, task))
 
         # Wait for all tasks to complete, but don't let one tracker's failure stop others
@@ -337,6 +312,6 @@ async def process_trackers(
     else:
         # Process each tracker sequentially
         for tracker in enabled_trackers:
-            await process_single_tracker(tracker)
+            await process_tracker_with_slot(tracker)
 
     console.print("[green]All tracker uploads processed.[/green]")
@@ -1,17 +1,18 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
+import contextlib
 import io
 import os
 import sys
 from collections.abc import Mapping, MutableMapping, Sequence
-from io import BytesIO
 from pathlib import Path
-from typing import Any, Optional, cast
+from typing import Any, BinaryIO, Callable, Optional, cast
+from urllib.parse import urlparse
 
 import aiohttp
 import cli_ui
 import click
-from PIL import Image
+from PIL import Image, ImageFile
 from typing_extensions import TypeAlias
 
 from src.bbcode import BBCODE
@@ -30,6 +31,12 @@ ImageDict: TypeAlias = dict[str, Any]
 
 expected_images = 0
 
+# Bytes requested to read an image's size from its header; PNG needs 33, JPEG usually a few KB
+IMAGE_PROBE_BYTES = 64 * 1024
+# Concurrent image downloads per image host
+IMAGE_HOST_CONNECTIONS = 4
+IMAGE_READ_CHUNK = 64 * 1024
+
 
 def _apply_config(next_config: dict[str, Any]) -> None:
     global config, default_config, trackers_config, expected_images
@@ -138,9 +145,22 @@ async def check_images_concurrently(imagelist: Sequence[ImageDict], meta: Meta)
     # Function to check each image's URL, host, and log resolution
     save_directory = os.path.join(str(meta.get('base_dir', '')), 'tmp', str(meta.get('uuid', '')))
 
+    # Applies to each request once it holds a host slot; waiting for the slot is not timed
     timeout = aiohttp.ClientTimeout(total=15, connect=5, sock_connect=5, sock_read=5)
+    host_slots: dict[str, asyncio.Semaphore] = {}
+    lower_bound = expected_vertical_resolution * 0.70
+    upper_bound = expected_vertical_resolution * (1.30 if meta.get('is_disc') == "DVD" else 1.00)
+
+    def height_ok(img_url: str, vertical_resolution: int) -> bool:
+        if lower_bound <= vertical_resolution <= upper_bound:
+            return True
+        console.print(
+            f"[red]Image {img_url} resolution ({vertical_resolution}p) "
+            f"is outside the allowed range ({int(lower_bound)}-{int(upper_bound)}p). Skipping.[/red]"
+        )
+        return False
 
-    async def check_and_collect(image_dict: ImageDict) -> Optional[ImageDict]:
+    async def check_and_collect(session: aiohttp.ClientSession, image_dict: ImageDict) -> Optional[ImageDict]:
         img_url = cast(Optional[str], image_dict.get('raw_url'))
         if not img_url:
             return None
@@ -157,76 +177,36 @@ async def check_images_concurrently(imagelist: Sequence[ImageDict], meta: Meta)
         if "tmdb.org" in img_url:
             return None
 
-        # Verify the image link
+        image_filename = os.path.join(save_directory, os.path.basename(img_url))
+        host = (urlparse(img_url).hostname or '').lower()
+        slot = host_slots.setdefault(host, asyncio.Semaphore(IMAGE_HOST_CONNECTIONS))
         try:
-            if await check_image_link(img_url, timeout):
-                try:
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        try:
-                            async with session.get(img_url) as response:
-                                if response.status == 200:
-                                    image_content = await response.read()
-
-                                    try:
-                                        image = Image.open(BytesIO(image_content))
-                                        vertical_resolution = image.height
-                                        lower_bound = expected_vertical_resolution * 0.70
-                                        upper_bound = expected_vertical_resolution * (1.30 if meta.get('is_disc') == "DVD" else 1.00)
-
-                                        if not (lower_bound <= vertical_resolution <= upper_bound):
-                                            console.print(
-                                                f"[red]Image {img_url} resolution ({vertical_resolution}p) "
-                                                f"is outside the allowed range ({int(lower_bound)}-{int(upper_bound)}p). Skipping.[/red]"
-                                            )
-                                            return None
-
-                                        # Save image
-                                        os.makedirs(save_directory, exist_ok=True)
-                                        image_filename = os.path.join(save_directory, os.path.basename(img_url))
-                                        await asyncio.to_thread(Path(image_filename).write_bytes, image_content)
-
-                                        console.print(f"Saved {img_url} as {image_filename}")
-
-                                        meta['image_sizes'][img_url] = len(image_content)
-
-                                        if meta['debug']:
-                                            console.print(
-                                                f"Valid image {img_url} with resolution {image.width}x{image.height} "
-                                                f"and size {len(image_content) / 1024:.2f} KiB"
-                                            )
-                                        return image_dict
-                                    except Exception as e:
-                                        console.print(f"[red]Failed to process image {img_url}: {e}")
-                                        return None
-                                else:
-                                    console.print(f"[red]Failed to fetch image {img_url}. Status: {response.status}. Skipping.")
-                                    return None
-                        except asyncio.TimeoutError:
-                            console.print(f"[red]Timeout downloading image: {img_url}")
-                            return None
-                        except aiohttp.ClientError as e:
-                            console.print(f"[red]Client error downloading image: {img_url} - {e}")
-                            return None
-                except Exception as e:
-                    console.print(f"[red]Session error for image: {img_url} - {e}")
-                    return None
-            else:
-                return None
+            async with slot:
+                fetched = await fetch_image(session, img_url, image_filename, lambda height: height_ok(img_url, height))
+        except asyncio.TimeoutError:
+            console.print(f"[red]Timeout downloading image: {img_url}")
+            return None
+        except aiohttp.ClientError as e:
+            console.print(f"[red]Client error downloading image: {img_url} - {e}")
+            return None
         except Exception as e:
             console.print(f"[red]Error checking image: {img_url} - {e}")
             return None
+        if fetched is None:
+            return None
 
-    # Run image verification concurrently but with a limit to prevent too many simultaneous connections
-    semaphore = asyncio.Semaphore(2)  # Limit concurrent requests to 2
-
-    async def bounded_check(image_dict: ImageDict) -> Optional[ImageDict]:
-        async with semaphore:
-            return await check_and_collect(image_dict)
-
-    tasks = [bounded_check(image_dict) for image_dict in unique_images]
+        width, height, size = fetched
+        console.print(f"Saved {img_url} as {image_filename}")
+        meta['image_sizes'][img_url] = size
+        if meta['debug']:
+            console.print(f"Valid image {img_url} with resolution {width}x{height} and size {size / 1024:.2f} KiB")
+        return image_dict
 
+    # One session for all images. Concurrency per image host is capped by host_slots rather than the
+    # connector's limit_per_host, since time queued in the connector counts against the request timeout.
     try:
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(*(check_and_collect(session, image_dict) for image_dict in unique_images), return_exceptions=False)
     except Exception as e:
         console.print(f"[red]Error during image processing: {e}")
         results = []
@@ -239,6 +219,105 @@ async def check_images_concurrently(imagelist: Sequence[ImageDict], meta: Meta)
     return valid_images
 
 
+def _content_range_total(response: aiohttp.ClientResponse) -> Optional[int]:
+    # "bytes 0-65535/10485760"
+    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+async def _read_header(response: aiohttp.ClientResponse, parser: ImageFile.Parser) -> bytes:
+    """Read the response until PIL knows the image size (or the body ends); returns the bytes read."""
+    head = bytearray()
+    async for chunk in response.content.iter_chunked(IMAGE_READ_CHUNK):
+        head += chunk
+        parser.feed(chunk)
+        if parser.image is not None:
+            break
+    return bytes(head)
+
+
+async def _stream_to(response: aiohttp.ClientResponse, file: BinaryIO) -> None:
+    async for chunk in response.content.iter_chunked(IMAGE_READ_CHUNK):
+        await asyncio.to_thread(file.write, chunk)
+
+
+def _verify_image(path: str) -> tuple[int, int]:
+    with Image.open(path) as image:
+        size = image.size
+        image.verify()  # This will check if the image is broken
+    return size
+
+
+async def fetch_image(session: aiohttp.ClientSession, url: str, save_path: str, accept_height: Callable[[int], bool]) -> Optional[tuple[int, int, int]]:
+    """Save an image whose height passes ``accept_height``, downloading it at most once.
+
+    The first request asks for only the first ``IMAGE_PROBE_BYTES``; an image of
+    the wrong height is rejected from that header alone. An accepted image is
+    completed from where the probe stopped (or, if the host ignores Range, from
+    the same response) and streamed into ``save_path``. Returns
+    ``(width, height, size)``, or None when the image was rejected or broken.
+    """
+    partial_path = save_path + ".part"
+    parser = ImageFile.Parser()
+    async with session.get(url, headers={'Range': f"bytes=0-{IMAGE_PROBE_BYTES - 1}"}) as response:
+        if response.status not in (200, 206):
+            console.print(f"[red]Failed to fetch image {url}. Status: {response.status}. Skipping.")
+            return None
+        if 'image' not in response.headers.get('Content-Type', '').lower():
+            console.print(f"[red]Content type is not an image: {url}[/red]")
+            return None
+        ranged = response.status == 206
+        total = _content_range_total(response) if ranged else response.content_length
+        head = await _read_header(response, parser)
+        if parser.image is None and not ranged:
+            console.print(f"[red]Failed to process image {url}: unrecognized or truncated image data")
+            return None
+        if parser.image is not None and not accept_height(parser.image.size[1]):
+            # Leaving the block closes the connection without reading the rest of the body
+            return None
+
+        await asyncio.to_thread(os.makedirs, os.path.dirname(save_path) or ".", exist_ok=True)
+        file = await asyncio.to_thread(open, partial_path, "wb")
+        try:
+            await asyncio.to_thread(file.write, head)
+            if not ranged:
+                await _stream_to(response, file)
+        except BaseException:
+            file.close()
+            with contextlib.suppress(OSError):
+                os.remove(partial_path)
+            raise
+
+    try:
+        if ranged and (total is None or len(head) < total):
+            async with session.get(url, headers={'Range': f"bytes={len(head)}-"}) as rest:
+                if rest.status in (200, 206):
+                    if rest.status == 200:
+                        # The host sent the whole image after all
+                        await asyncio.to_thread(file.seek, 0)
+                        await asyncio.to_thread(file.truncate)
+                    await _stream_to(rest, file)
+                elif rest.status != 416 or total is not None:
+                    # Except a 416 after "bytes 0-N/*": the probe already held the whole image, verification decides
+                    console.print(f"[red]Failed to fetch image {url}. Status: {rest.status}. Skipping.")
+                    return None
+        file.close()
+        try:
+            width, height = await asyncio.to_thread(_verify_image, partial_path)
+        except (OSError, SyntaxError) as e:
+            console.print(f"[red]Image verification failed (corrupt image): {url} {e}[/red]")
+            return None
+        # Only known now when the header didn't fit in the probe
+        if parser.image is None and not accept_height(height):
+            return None
+        await asyncio.to_thread(os.replace, partial_path, save_path)
+        return width, height, await asyncio.to_thread(os.path.getsize, save_path)
+    finally:
+        file.close()
+        with contextlib.suppress(OSError):
+            os.remove(partial_path)
+
+
 async def check_image_link(url: str, timeout: Optional[aiohttp.ClientTimeout] = None) -> bool:
     # Handle when pixhost url points to web_url and convert to raw_url
     if url.startswith("https://pixhost.to/show/"):
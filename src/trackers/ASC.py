@@ -9,12 +9,12 @@ from typing import Any, Optional, Union, cast
 
 import aiofiles
 import cli_ui
-import httpx
 from bs4 import BeautifulSoup
 from pymediainfo import MediaInfo
 
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
+from src.http_client import http_client_manager
 from src.languages import languages_manager
 from src.tmdb import TmdbManager
 from src.trackers.COMMON import COMMON
@@ -34,7 +34,7 @@ class ASC:
         self.torrent_url = 'https://cliente.amigos-share.club/torrents-details.php?id='
         self.requests_url = f'{self.base_url}/pedidos.php'
         self.layout = self.config['TRACKERS'][self.tracker].get('custom_layout', '2')
-        self.session = httpx.AsyncClient(headers={
+        self.session = http_client_manager.client(headers={
             'User-Agent': f'Upload Assistant ({platform.system()} {platform.release()})'
         }, timeout=60.0)
 
@@ -4,11 +4,11 @@ import traceback
 from typing import Any, Optional, Union, cast
 
 import aiofiles
-import httpx
 from pymediainfo import MediaInfo
 
 from cogs.redaction import Redaction
 from src.console import console
+from src.http_client import http_client_manager
 from src.trackers.COMMON import COMMON
 
 
@@ -92,7 +92,7 @@ class BHDTV:
         files = {'file': (os.path.basename(torrent_path), torrent_bytes, 'application/x-bittorrent')}
 
         if meta['debug'] is False:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
                 response = await client.post(url=self.upload_url, data=data, files=files)
             parsed: Union[Any, None] = None
             if response:
@@ -9,7 +9,6 @@ from typing import Any, Optional, cast
 
 import aiofiles
 import cli_ui
-import httpx
 import langcodes
 from bs4 import BeautifulSoup
 from langcodes.tag_parser import LanguageTagError
@@ -18,6 +17,7 @@ from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 from src.languages import languages_manager
 from src.tmdb import TmdbManager
 from src.trackers.COMMON import COMMON
@@ -40,7 +40,7 @@ class BT:
         self.auth_token: Optional[str] = None
         self.main_tmdb_data: dict[str, Any] = {}
         self.episode_tmdb_data: dict[str, Any] = {}
-        self.session = httpx.AsyncClient(headers={
+        self.session = http_client_manager.client(headers={
             'User-Agent': f'Upload Assistant ({platform.system()} {platform.release()})'
         }, timeout=60.0)
 
@@ -1,27 +1,26 @@
 # Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
 import asyncio
-import hashlib
 import json
 import os
 import re
 import secrets
 import sys
 import unicodedata
-from typing import Any, Callable, Optional, Union, cast
+from typing import Any, Optional, Union, cast
 
 import aiofiles
-import bencodepy
 import cli_ui
 import click
 import httpx
 import langcodes
 from langcodes import tag_parser
-from torf import Torrent
 
 from src.bbcode import BBCODE
 from src.console import console
 from src.exportmi import exportInfo
+from src.http_client import http_client_manager
 from src.languages import languages_manager
+from src.torrent_patch import RawTorrent
 
 
 class COMMON:
@@ -145,36 +144,41 @@ class COMMON:
     ) -> None:
         path = f"{meta['base_dir']}/tmp/{meta['uuid']}/{torrent_filename}.torrent"
         if await self.path_exists(path):
-            loop = asyncio.get_running_loop()
-            new_torrent = await loop.run_in_executor(None, Torrent.read, path)
-            for each in list(new_torrent.metainfo):
-                if each not in ('announce', 'comment', 'creation date', 'created by', 'encoding', 'info'):
-                    new_torrent.metainfo.pop(each, None)  # type: ignore
             if announce_url:
-                new_torrent.metainfo['announce'] = announce_url
+                announce = announce_url
             else:
                 raw_announce = self.config['TRACKERS'][tracker].get('announce_url')
-                new_torrent.metainfo['announce'] = str(raw_announce).strip() if raw_announce else "https://fake.tracker"
-            new_torrent.metainfo['info']['source'] = source_flag
-            if 'created by' in new_torrent.metainfo:
-                created_by = str(new_torrent.metainfo['created by'])
-                if "mkbrr" in created_by.lower():
-                    new_torrent.metainfo['created by'] = f"{created_by} using Upload Assistant"
-            # setting comment as blank as if BASE.torrent is manually created then it can result in private info such as download link being exposed.
-            new_torrent.metainfo['comment'] = ''
+                announce = str(raw_announce).strip() if raw_announce else "https://fake.tracker"
+            entropy: Optional[int] = None
             entropy_value = meta.get('entropy')
             if entropy_value is not None:
                 try:
                     entropy_int = int(entropy_value)
                     if entropy_int == 32:
-                        new_torrent.metainfo['info']['entropy'] = secrets.randbelow(2**32)  # type: ignore
+                        entropy = secrets.randbelow(2**32)
                     elif entropy_int == 64:
-                        new_torrent.metainfo['info']['entropy'] = secrets.randbelow(2**64)  # type: ignore
+                        entropy = secrets.randbelow(2**64)
                 except (ValueError, TypeError):
                     # Skip entropy setting if value is invalid
                     pass
             out_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}].torrent"
-            await loop.run_in_executor(None, lambda: Torrent.copy(new_torrent).write(out_path, overwrite=True))
+
+            def write_tracker_torrent() -> None:
+                # BASE is parsed once and shared by every tracker; only the small keys are re-encoded
+                base_torrent = RawTorrent.load(path, cache=True)
+                new_torrent = base_torrent.patch().keep_only(('announce', 'comment', 'creation date', 'created by', 'encoding'))
+                new_torrent.set('announce', announce)
+                new_torrent.set_info('source', source_flag)
+                created_by = base_torrent.string(b'created by')
+                if created_by is not None and "mkbrr" in created_by.lower():
+                    new_torrent.set('created by', f"{created_by} using Upload Assistant")
+                # setting comment as blank as if BASE.torrent is manually created then it can result in private info such as download link being exposed.
+                new_torrent.set('comment', '')
+                if entropy is not None:
+                    new_torrent.set_info('entropy', entropy)
+                new_torrent.write(out_path)
+
+            await asyncio.get_running_loop().run_in_executor(None, write_tracker_torrent)
 
     async def download_tracker_torrent(
         self,
@@ -189,7 +193,7 @@ class COMMON:
         path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}_cross].torrent" if cross else f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}].torrent"
         if downurl:
             try:
-                async with httpx.AsyncClient(headers=headers, params=params, timeout=30.0) as session, session.stream("GET", downurl) as r:
+                async with http_client_manager.client(headers=headers, params=params, timeout=30.0) as session, session.stream("GET", downurl) as r:
                     r.raise_for_status()
                     async with aiofiles.open(path, "wb") as f:
                         async for chunk in r.aiter_bytes():
@@ -224,35 +228,31 @@ class COMMON:
         """
         path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}].torrent"
         if await self.path_exists(path):
-            loop = asyncio.get_running_loop()
-            new_torrent = await loop.run_in_executor(None, Torrent.read, path)
-            if isinstance(new_tracker, list):
-                if not new_tracker:
-                    console.print(f"[red]Error: Empty tracker list provided for {tracker}. Cannot create torrent.[/red]")
-                    return None
-                new_torrent.metainfo["announce"] = new_tracker[0]
-                new_torrent.metainfo["announce-list"] = [new_tracker]
-            else:
-                new_torrent.metainfo["announce"] = new_tracker
-            new_torrent.metainfo["info"]["source"] = source_flag
-
-            # Calculate hash only when hash_is_id is True
-            torrent_hash: Optional[str] = None
-            if hash_is_id:
-                info_data = new_torrent.metainfo.get("info", {})
-                bencode_module = cast(Any, bencodepy)
-                encode = cast(Callable[[Any], bytes], bencode_module.encode)
-                info_bytes = encode(info_data)
-                torrent_hash = hashlib.sha1(
-                    info_bytes, usedforsecurity=False
-                ).hexdigest()  # SHA1 required for torrent info hash
-                new_torrent.metainfo["comment"] = comment + torrent_hash
-            else:
-                new_torrent.metainfo["comment"] = comment
+            if isinstance(new_tracker, list) and not new_tracker:
+                console.print(f"[red]Error: Empty tracker list provided for {tracker}. Cannot create torrent.[/red]")
+                return None
+
+            def write_seed_torrent() -> Optional[str]:
+                new_torrent = RawTorrent.load(path).patch()
+                if isinstance(new_tracker, list):
+                    new_torrent.set("announce", new_tracker[0])
+                    new_torrent.set("announce-list", [new_tracker])
+                else:
+                    new_torrent.set("announce", new_tracker)
+                new_torrent.set_info("source", source_flag)
+
+                # Calculate hash only when hash_is_id is True
+                torrent_hash: Optional[str] = None
+                if hash_is_id:
+                    torrent_hash = new_torrent.info_hash()
+                    new_torrent.set("comment", comment + torrent_hash)
+                else:
+                    new_torrent.set("comment", comment)
 
-            await loop.run_in_executor(None, lambda: Torrent.copy(new_torrent).write(path, overwrite=True))
+                new_torrent.write(path)
+                return torrent_hash
 
-            return torrent_hash
+            return await asyncio.get_running_loop().run_in_executor(None, write_seed_torrent)
 
         return None
 
@@ -260,20 +260,11 @@ class COMMON:
         torrent_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/[{tracker}].torrent"
         async with aiofiles.open(torrent_path, 'rb') as torrent_file:
             torrent_content = await torrent_file.read()
-            bencode_module = cast(Any, bencodepy)
-            decode = cast(Callable[[bytes], Any], bencode_module.decode)
-            torrent_data = decode(torrent_content)
-            if not isinstance(torrent_data, dict):
-                return ''
-            torrent_dict = cast(dict[bytes, Any], torrent_data)
-            info_value = torrent_dict.get(b'info')
-            if not isinstance(info_value, dict):
-                return ''
-            bencode_module = cast(Any, bencodepy)
-            encode = cast(Callable[[Any], bytes], bencode_module.encode)
-            info = encode(info_value)
-            info_hash = hashlib.sha1(info, usedforsecurity=False).hexdigest()  # SHA1 required for torrent info hash
-        return info_hash
+        try:
+            # Hash the info dict exactly as stored, without decoding and re-encoding it
+            return RawTorrent(torrent_content).patch().info_hash()
+        except ValueError:
+            return ''
 
     async def save_image_links(self, meta: dict[str, Any], image_key: str, image_list: Optional[list[dict[str, str]]]) -> Optional[str]:
         if image_list is None:
@@ -507,7 +498,7 @@ class COMMON:
         params: dict[str, str] = {'api_token': api_key}
         url = f"{torrent_url}{id}"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client_manager.client(timeout=30.0) as client:
                 response = await client.get(url=url, params=params)
                 json_response = response.json()
         except (httpx.RequestError, httpx.TimeoutException) as e:
@@ -621,7 +612,7 @@ class COMMON:
 
         # Make the GET request with proper encoding handled by 'params'
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_client_manager.client(timeout=30.0) as client:
                 response = await client.get(url=url, params=params)
                 json_response = response.json()
         except (httpx.RequestError, httpx.TimeoutException) as e:
@@ -775,7 +766,7 @@ class COMMON:
                 return None
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client_manager.client() as client:
                 # get douban url
                 if int(meta.get('imdb_id', 0)) != 0:
                     data['search'] = f"tt{meta['imdb_id']}"
@@ -1100,7 +1091,6 @@ class COMMON:
                 path = meta['discs'][0]['playlists'][0]['path']
                 await exportInfo(
                     path,
-                    False,
                     meta['uuid'],
                     meta['base_dir'],
                     is_dvd=False,
@@ -1142,7 +1132,6 @@ class COMMON:
 
                         await exportInfo(
                             largest_m2ts,
-                            False,
                             meta['uuid'],
                             meta['base_dir'],
                             is_dvd=False,
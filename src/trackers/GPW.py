@@ -15,6 +15,7 @@ from cogs.redaction import Redaction
 from src.bbcode import BBCODE
 from src.console import console
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 from src.languages import languages_manager
 from src.rehostimages import RehostImagesManager
 from src.tmdb import TmdbManager
@@ -383,7 +384,7 @@ class GPW:
         if not cookies:
             search_url = f'{self.base_url}/api.php?api_key={self.api_key}&action=torrent&imdbID={imdb}'
             try:
-                async with httpx.AsyncClient(timeout=30) as client:
+                async with http_client_manager.client(timeout=30) as client:
                     response = await client.get(search_url)
                     response.raise_for_status()
                     data = response.json()
@@ -420,7 +421,7 @@ class GPW:
             found_items: list[dict[str, Any]] = []
 
             try:
-                async with httpx.AsyncClient(cookies=cookies, timeout=30, headers={'User-Agent': 'Upload Assistant/2.3'}) as client:
+                async with http_client_manager.client(cookies=cookies, timeout=30, headers={'User-Agent': 'Upload Assistant/2.3'}) as client:
                     response = await client.get(search_url)
                     response.raise_for_status()
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -685,7 +686,7 @@ class GPW:
         search_url = f"{self.base_url}/api.php?api_key={self.api_key}&action=torrent&req=group&imdbID={meta.get('imdb_info', {}).get('imdbID')}"
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
+            async with http_client_manager.client(timeout=30) as client:
                 response = await client.get(search_url)
                 response.raise_for_status()
 
@@ -720,7 +721,7 @@ class GPW:
         poster_path = os.path.join(meta["base_dir"], "tmp", meta["uuid"], "poster.jpg")
         if not os.path.exists(poster_path):
             try:
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.get(poster_url, timeout=30)
                     response.raise_for_status()
                     async with aiofiles.open(poster_path, mode="wb") as f:
@@ -978,7 +979,7 @@ class GPW:
                     cookies = await self.load_cookies(meta)
 
                 request_cookies = cookies if use_cookies and cookies else None
-                async with httpx.AsyncClient(timeout=15, cookies=request_cookies, headers={'User-Agent': 'Upload Assistant/2.3'}) as client:
+                async with http_client_manager.client(timeout=15, cookies=request_cookies, headers={'User-Agent': 'Upload Assistant/2.3'}) as client:
                     if method == "post":
                         response = await client.post(url, data=params)
                     else:
@@ -1187,7 +1188,7 @@ class GPW:
             files = {'file_input': (f'{self.tracker}.placeholder.torrent', torrent_bytes, 'application/x-bittorrent')}
 
             try:
-                async with httpx.AsyncClient(timeout=30) as client:
+                async with http_client_manager.client(timeout=30) as client:
                     def _extract_torrent_id(payload: Any) -> str:
                         if isinstance(payload, dict):
                             torrent_id_value = payload.get('torrent_id')
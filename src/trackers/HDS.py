@@ -6,13 +6,13 @@ import re
 from typing import Any, Optional, Union, cast
 
 import aiofiles
-import httpx
 from bs4 import BeautifulSoup
 
 from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 
 Meta = dict[str, Any]
 Config = dict[str, Any]
@@ -29,7 +29,7 @@ class HDS:
         self.base_url = 'https://hd-space.org'
         self.torrent_url = f'{self.base_url}/index.php?page=torrent-details&id='
         self.requests_url = f'{self.base_url}/index.php?page=viewrequests'
-        self.session = httpx.AsyncClient(headers={
+        self.session = http_client_manager.client(headers={
             'User-Agent': f"Upload Assistant/2.3 ({platform.system()} {platform.release()})"
         }, timeout=30)
 
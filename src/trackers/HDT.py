@@ -14,6 +14,7 @@ from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieAuthUploader, CookieValidator
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 
 Meta = dict[str, Any]
 Config = dict[str, Any]
@@ -40,7 +41,7 @@ class HDT:
         self.torrent_url = f'{self.base_url}/details.php?id='
         self.announce_url = str(tracker_config_dict.get('announce_url', ''))
         self.banned_groups = []
-        self.session = httpx.AsyncClient(headers={
+        self.session = http_client_manager.client(headers={
             'User-Agent': f'Upload Assistant ({platform.system()} {platform.release()})'
         }, timeout=60.0)
 
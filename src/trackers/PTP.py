@@ -22,6 +22,8 @@ from src.bbcode import BBCODE
 from src.console import console
 from src.cookie_auth import CookieValidator
 from src.exceptions import *  # noqa F403
+from src.exportmi import mediainfo_texts
+from src.http_client import http_client_manager
 from src.rehostimages import RehostImagesManager
 from src.takescreens import TakeScreensManager
 from src.torrentcreate import TorrentCreator
@@ -123,9 +125,8 @@ class PTP:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
                 response = await client.get(url=url, headers=headers, params=params)
-            await asyncio.sleep(1)
 
             if response.status_code == 200:
                 data = response.json()
@@ -178,9 +179,8 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
         try:
             if response.status_code == 200:
                 response = response.json()
@@ -213,9 +213,8 @@ class PTP:
         }
         url = 'https://passthepopcorn.me/torrents.php'
         console.print(f"[yellow]Requesting description from {url} with ID {ptp_torrent_id}")
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
 
         ptp_desc = response.text
         # console.print(f"[yellow]Raw description received:\n{ptp_desc}...")  # Show first 500 characters for brevity
@@ -264,9 +263,8 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url=url, headers=headers, params=params)
-        await asyncio.sleep(1)
         try:
             if response.status_code != 200:
                 console.print(f"[red]PTP group lookup failed with HTTP {response.status_code}[/red]")
@@ -359,9 +357,8 @@ class PTP:
             'User-Agent': self.user_agent
         }
         url = "https://passthepopcorn.me/ajax.php"
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
             response = await client.get(url=url, params=params, headers=headers)
-        await asyncio.sleep(1)
         tinfo = {}
         try:
             response = response.json()
@@ -427,9 +424,8 @@ class PTP:
         url = 'https://passthepopcorn.me/torrents.php'
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=10.0, follow_redirects=True) as client:
                 response = await client.get(url, headers=headers, params=params)
-                await asyncio.sleep(1)  # Mimic server-friendly delay
                 if response.status_code == 200:
                     existing: list[str] = []
                     try:
@@ -464,7 +460,7 @@ class PTP:
         headers = {'referer': 'https://ptpimg.me/index.php'}
         url = "https://ptpimg.me/upload.php"
 
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(timeout=30.0, follow_redirects=True) as client:
             response = await client.post(url, headers=headers, data=payload)
         try:
             response = response.json()
@@ -1147,6 +1143,7 @@ class PTP:
 
         # Handle multiple files case
         elif len(filelist) > 1:
+            mi_texts = await mediainfo_texts(filelist[1:], debug=meta.get('debug', False))
             for i, file in enumerate(filelist):
                 if i == 0:
                     if meta['type'] == 'WEBDL' and meta.get('service_longname', '') != '' and meta.get('description') is None and self.web_source is True:
@@ -1171,7 +1168,7 @@ class PTP:
                         desc.write(f"[img]{raw_url}[/img]\n")
                     desc.write("\n")
                 else:
-                    mi_dump = MediaInfo.parse(file, output="STRING", full=False)
+                    mi_dump = mi_texts.get(file) or MediaInfo.parse(file, output="STRING", full=False)
                     temp_mi_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/TEMP_PTP_MEDIAINFO.txt"
                     async with aiofiles.open(temp_mi_path, "w", newline="", encoding="utf-8") as f:
                         await f.write(mi_dump.replace(file, os.path.basename(file)))
@@ -1312,7 +1309,7 @@ class PTP:
         if os.path.exists(cookiefile):
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+            async with http_client_manager.client(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
                 uploadresponse = await client.get("https://passthepopcorn.me/upload.php")
                 loggedIn = await self.validate_login(uploadresponse)
                 if loggedIn is True:
@@ -1339,7 +1336,7 @@ class PTP:
             "keeplogged": "1",
         }
         headers = {"User-Agent": self.user_agent}
-        async with httpx.AsyncClient(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
+        async with http_client_manager.client(cookies=cookies, timeout=30.0, follow_redirects=True) as client:
             loginresponse = await client.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
             await asyncio.sleep(2)
             try:
@@ -1592,7 +1589,7 @@ class PTP:
             cookiefile = f"{meta['base_dir']}/data/cookies/PTP.json"
             raw_cookies = self.cookie_validator._load_cookies_dict_secure(cookiefile)  # pyright: ignore[reportPrivateUsage]
             cookies = {name: str(data.get('value', '')) for name, data in raw_cookies.items()}
-            async with httpx.AsyncClient(cookies=cookies, timeout=60.0, follow_redirects=True) as client:
+            async with http_client_manager.client(cookies=cookies, timeout=60.0, follow_redirects=True) as client:
                 response = await client.post(url=url, data=data, headers=headers, files=files)
             console.print(f"[cyan]{response.url}")
             responsetext = response.text
@@ -13,6 +13,7 @@ from cogs.redaction import Redaction
 from src.bbcode import BBCODE
 from src.console import console
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 from src.languages import languages_manager
 
 from .COMMON import COMMON
@@ -32,7 +33,7 @@ class SPD:
         self.banned_groups = []
         self.banned_url = 'https://speedapp.io/api/torrent/release-group/blacklist'
         api_key = str(self.config['TRACKERS'][self.tracker]['api_key'])
-        self.session = httpx.AsyncClient(headers={
+        self.session = http_client_manager.client(headers={
             'User-Agent': "Upload Assistant",
             'accept': 'application/json',
             'Authorization': api_key,
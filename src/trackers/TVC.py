@@ -16,6 +16,7 @@ import tmdbsimple as tmdb
 
 from src.bbcode import BBCODE
 from src.console import console
+from src.http_client import http_client_manager
 from src.rehostimages import RehostImagesManager
 from src.trackers.COMMON import COMMON
 
@@ -638,7 +639,7 @@ class TVC:
         if meta['debug'] is False:
             response = None
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with http_client_manager.client(timeout=30.0) as client:
                     async with aiofiles.open(torrent_path, "rb") as open_torrent:
                         torrent_bytes = await open_torrent.read()
                     files = {'torrent': (os.path.basename(torrent_path), torrent_bytes)}
@@ -5,14 +5,16 @@ import json
 import os
 import platform
 import re
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 
 import aiofiles
 import httpx
 from typing_extensions import TypeAlias
 
 from src.console import console
+from src.dupe_search_cache import dupe_search_cache
 from src.get_desc import DescriptionBuilder
+from src.http_client import http_client_manager
 from src.trackers.COMMON import COMMON
 
 QueryValue: TypeAlias = Union[str, int, float, bool, None]
@@ -113,17 +115,23 @@ class UNIT3D:
             urls_to_check.append(self.pending_url)
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            async with http_client_manager.client(timeout=10.0, follow_redirects=True) as client:
                 for url in urls_to_check:
                     check_pending = False
                     if "api/torrents/pending" in url:
                         check_pending = True
-                    response = await client.get(url=url, headers=headers, params=request_params)
-                    response.raise_for_status()
-
-                    if response.status_code == 200:
+                    data = dupe_search_cache.get(self.tracker, url, request_params)
+                    if data is None:
+                        response = await client.get(url=url, headers=headers, params=request_params)
+                        response.raise_for_status()
+                        if response.status_code != 200:
+                            console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+                            continue
                         data = response.json()
-                        for each in data.get("data", []):
+                        dupe_search_cache.put(self.tracker, url, request_params, data)
+
+                    if isinstance(data, dict):
+                        for each in cast(dict[str, Any], data).get("data", []):
                             if check_pending:
                                 entry_tmdb = str(each.get("tmdb_id") or "")
                                 if entry_tmdb != str(meta.get("tmdb", "")):
@@ -164,8 +172,6 @@ class UNIT3D:
                                     "description": attributes.get("description", ""),
                                 }
                             dupes.append(result)
-                    else:
-                        console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 302:
                 meta["tracker_status"][self.tracker][
@@ -474,7 +480,7 @@ class UNIT3D:
 
             for attempt in range(max_retries):
                 try:  # noqa: PERF203
-                    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+                    async with http_client_manager.client(timeout=timeout, follow_redirects=True) as client:
                         response = await client.post(
                             url=self.upload_url, files=files, data=data, headers=headers
                         )
@@ -3,7 +3,7 @@ import asyncio
 import copy
 import os
 import sys
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Iterator, Mapping, MutableMapping
 from typing import Any, Optional, cast
 
 import cli_ui
@@ -15,13 +15,126 @@ from src.clients import Clients
 from src.console import console
 from src.dupe_checking import DupeChecker
 from src.imdb import imdb_manager
+from src.resource_limits import resource_limits
 from src.torrentcreate import TorrentCreator
-from src.trackers.PTP import PTP
 from src.trackersetup import TRACKER_SETUP, tracker_class_map
 from src.uphelper import UploadHelper
 
 Meta: TypeAlias = MutableMapping[str, Any]
 
+_MUTABLE_TYPES = (dict, list, set)
+
+
+class CopyOnWriteMeta(dict[str, Any]):
+    """
+    Per-tracker view of the shared meta.
+
+    The top level is copied shallowly; nested dicts/lists/sets are deep-copied the
+    first time they are read, so trackers can mutate whatever they touch without
+    leaking into the shared meta, and the large values nobody reads (mediainfo,
+    bdinfo, image lists) are never copied at all.
+
+    Overriding ``__iter__`` also takes the view off CPython's dict fast paths, so
+    ``dict(view)``, ``{**view}`` and ``other.update(view)`` read through
+    ``keys()``/``__getitem__`` and get owned copies too.
+    """
+
+    def __init__(self, base: Meta) -> None:
+        super().__init__(base._raw_items() if isinstance(base, CopyOnWriteMeta) else base)
+        self._owned: set[str] = set()
+
+    def _own(self, key: str, value: Any) -> Any:
+        if key not in self._owned:
+            self._owned.add(key)
+            if isinstance(value, _MUTABLE_TYPES):
+                value = copy.deepcopy(value)
+                super().__setitem__(key, value)
+        return value
+
+    def _own_all(self) -> None:
+        for key in list(super().keys()):
+            if key not in self._owned:
+                self._own(key, super().__getitem__(key))
+
+    def _raw_items(self) -> list[tuple[str, Any]]:
+        # Stored values without taking ownership; a new view over them copies on read itself
+        return list(super().items())
+
+    def __getitem__(self, key: str) -> Any:
+        return self._own(key, super().__getitem__(key))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._owned.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._owned.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(super().keys()))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            super().pop(key)
+            self._owned.discard(key)
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        key = next(reversed(list(super().keys())), None)
+        if key is None:
+            raise KeyError('popitem(): dictionary is empty')
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self._owned.clear()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        # dict.update() stores values directly; go through __setitem__ so they count as owned
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def values(self) -> Any:
+        self._own_all()
+        return super().values()
+
+    def items(self) -> Any:
+        self._own_all()
+        return super().items()
+
+    def copy(self) -> 'CopyOnWriteMeta':
+        return CopyOnWriteMeta(self)
+
+    __copy__ = copy
+
+    def __or__(self, other: Any) -> Any:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(cast(Mapping[str, Any], other))
+        return merged
+
+    def __ior__(self, other: Any) -> Any:
+        self.update(other)
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        self._own_all()
+        return copy.deepcopy(dict(super().items()), memo)
+
 
 class TrackerStatusManager:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -44,7 +157,7 @@ class TrackerStatusManager:
 
         async def process_single_tracker(tracker_name: str, shared_meta: Meta) -> tuple[str, dict[str, bool]]:
             nonlocal successful_trackers
-            local_meta = copy.deepcopy(shared_meta)  # Ensure each task gets its own copy of meta
+            local_meta: Meta = CopyOnWriteMeta(shared_meta)  # Isolated per-tracker view without copying all of meta up front
             local_tracker_status = {'banned': False, 'skipped': False, 'dupe': False, 'upload': False, 'other': False}
             disctype = local_meta.get('disctype', None)
             we_already_asked = False
@@ -111,7 +224,7 @@ class TrackerStatusManager:
                         if local_meta['tracker_status'][tracker_name].get('other', False):
                             local_tracker_status['other'] = True
                     elif tracker_name == "PTP":
-                        ptp: Any = PTP(config=self.config)
+                        ptp: Any = tracker_class_map['PTP'](config=self.config)
                         groupID = await ptp.get_group_by_imdb(local_meta['imdb'])
                         async with meta_lock:
                             meta['ptp_groupID'] = groupID
@@ -233,7 +346,11 @@ class TrackerStatusManager:
             searching_trackers: list[str] = [name for name in meta['trackers'] if name in tracker_class_map]
             if searching_trackers:
                 console.print(f"[yellow]Searching for existing torrents on: {', '.join(searching_trackers)}...")
-            tasks = [process_single_tracker(tracker_name, meta) for tracker_name in meta['trackers']]
+            async def process_tracker_with_slot(tracker_name: str) -> tuple[str, dict[str, bool]]:
+                async with resource_limits.slot('tracker'):
+                    return await process_single_tracker(tracker_name, meta)
+
+            tasks = [process_tracker_with_slot(tracker_name) for tracker_name in meta['trackers']]
             results = await asyncio.gather(*tasks)
 
             # Collect passed trackers and skip reasons
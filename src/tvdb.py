@@ -14,6 +14,7 @@ from urllib.error import URLError
 from tvdb_v4_official import TVDB
 
 from src.console import console
+from src.metadata_cache import metadata_cache
 
 YEAR_PATTERN = re.compile(r'\((19\d\d|20[0-3]\d)\)')
 
@@ -52,6 +53,18 @@ def _as_dict_list(value: Any) -> list[dict[str, Any]]:
     return []
 
 
+def _tvdb_call(client: Any, method: str, *args: Any, **kwargs: Any) -> Any:
+    """Call a TVDB client method, going through the persistent metadata cache."""
+    cache_parts = (method, args, sorted(kwargs.items()))
+    cached = metadata_cache.get('tvdb', *cache_parts)
+    if cached is not None:
+        return cached
+    result = getattr(client, method)(*args, **kwargs)
+    if result:
+        metadata_cache.set('tvdb', result, *cache_parts)
+    return result
+
+
 def _english_alias_names(aliases: list[dict[str, Any]]) -> list[str]:
     return [
         str(alias.get('name', '')).strip() for alias in aliases
@@ -102,7 +115,7 @@ def _series_translation_metadata(
     translation_aliases: list[str] = []
 
     try:
-        translation = cast(dict[str, Any], client.get_series_translation(series_id, 'eng'))
+        translation = cast(dict[str, Any], _tvdb_call(client, 'get_series_translation', series_id, 'eng'))
         name = translation.get('name')
         if isinstance(name, str) and name.strip():
             translation_name = name.strip()
@@ -183,7 +196,7 @@ class tvdb_data:
         if client is None:
             return None, None
 
-        results = _as_dict_list(cast(Any, client).search({filename}, year=year, type="series", lang="eng"))
+        results = _as_dict_list(_tvdb_call(client, 'search', {filename}, year=year, type="series", lang="eng"))
         await asyncio.sleep(0.1)
         try:
             if results and len(results) > 0:
@@ -333,7 +346,7 @@ class tvdb_data:
                                 client = _get_tvdb_or_warn()
                                 if client is not None:
                                     try:
-                                        series_info = cast(dict[str, Any], cast(Any, client).get_series_extended(series_id_int))
+                                        series_info = cast(dict[str, Any], _tvdb_call(client, 'get_series_extended', series_id_int))
                                         aliases_list = _as_dict_list(series_info.get('aliases', episodes_data.get('aliases')))
                                         series_metadata = _series_translation_metadata(
                                             client,
@@ -373,7 +386,9 @@ class tvdb_data:
                     console.print(f"[cyan]Fetching TVDB episodes page {page + 1}[/cyan]")
 
                 try:
-                    episodes_response = cast(Any, client).get_series_episodes(
+                    episodes_response = _tvdb_call(
+                        client,
+                        'get_series_episodes',
                         series_id_int,
                         season_type="default",
                         page=page,
@@ -437,7 +452,7 @@ class tvdb_data:
             try:
                 if all_episodes:
                     # Get series details for aliases
-                    series_info = cast(dict[str, Any], cast(Any, client).get_series_extended(series_id_int))
+                    series_info = cast(dict[str, Any], _tvdb_call(client, 'get_series_extended', series_id_int))
                     if 'aliases' in series_info:
                         episodes_data['aliases'] = series_info['aliases']
                     aliases_list = _as_dict_list(episodes_data['aliases'])
@@ -502,7 +517,7 @@ class tvdb_data:
             if series_id_int is None:
                 return fallback_name
             try:
-                series_info = cast(dict[str, Any], cast(Any, client).get_series_extended(series_id_int))
+                series_info = cast(dict[str, Any], _tvdb_call(client, 'get_series_extended', series_id_int))
                 aliases = _as_dict_list(series_info.get('aliases', []))
                 series_metadata = _series_translation_metadata(
                     client,
@@ -532,7 +547,7 @@ class tvdb_data:
                 if debug:
                     console.print(f"[cyan]Trying TVDB lookup with IMDB ID: {imdb_formatted}[/cyan]")
 
-                results = _as_dict_list(cast(Any, client).search_by_remote_id(imdb_formatted))
+                results = _as_dict_list(_tvdb_call(client, 'search_by_remote_id', imdb_formatted))
                 await asyncio.sleep(0.1)
 
                 if results and len(results) > 0:
@@ -585,7 +600,7 @@ class tvdb_data:
                 if debug:
                     console.print(f"[cyan]Trying TVDB lookup with TMDB ID: {tmdb_str}[/cyan]")
 
-                results = _as_dict_list(cast(Any, client).search_by_remote_id(tmdb_str))
+                results = _as_dict_list(_tvdb_call(client, 'search_by_remote_id', tmdb_str))
                 await asyncio.sleep(0.1)
 
                 if results and len(results) > 0:
@@ -651,7 +666,7 @@ class tvdb_data:
                     console.print(f"[yellow]Invalid TVDB episode ID: {episode_id}[/yellow]")
                 return None
 
-            episode_data = cast(dict[str, Any], cast(Any, client).get_episode_extended(episode_id_int))
+            episode_data = cast(dict[str, Any], _tvdb_call(client, 'get_episode_extended', episode_id_int))
             if debug:
                 console.print(f"[yellow]Episode data retrieved for episode ID {episode_id}[/yellow]")
 
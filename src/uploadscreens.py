@@ -16,11 +16,16 @@ import httpx
 import pyimgbox
 from typing_extensions import TypeAlias
 
+from src.cleanup import protected_tasks
 from src.console import console
+from src.http_client import http_client_manager
 
 Meta: TypeAlias = dict[str, Any]
 ImageDict: TypeAlias = dict[str, Any]
 
+# Hosts that throttle parallel uploads; others get one slot per image
+UPLOAD_HOST_LIMITS: dict[str, int] = {"onlyimage": 6, "ptscreens": 6, "lensdump": 1, "passtheimage": 6}
+
 
 class UploadScreensManager:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -38,6 +43,7 @@ class UploadScreensManager:
         retry_mode: bool = False,
         max_retries: int = 3,
         allowed_hosts: Union[list[str], None] = None,
+        prefetched: Optional["ScreenshotPrefetcher"] = None,
     ) -> tuple[list[ImageDict], int]:
         return await _upload_screens(
             self.config,
@@ -51,9 +57,62 @@ class UploadScreensManager:
             retry_mode=retry_mode,
             max_retries=max_retries,
             allowed_hosts=allowed_hosts,
+            prefetched=prefetched,
         )
 
 
+class ScreenshotPrefetcher:
+    """Start uploading screenshots as soon as ffmpeg writes them.
+
+    ``submit`` is passed to ``screenshots(on_capture=...)``; ``_upload_screens`` then
+    picks up the finished (or in-flight) upload for an image instead of starting a new
+    one, as long as the image host did not change in between.
+    """
+
+    def __init__(self, config: dict[str, Any], meta: Meta, img_host: str) -> None:
+        self.config = config
+        self.meta = meta
+        self.img_host = img_host
+        self.uploads: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self.semaphore = asyncio.Semaphore(UPLOAD_HOST_LIMITS.get(img_host, 4))
+
+    def submit(self, image_path: str) -> None:
+        key = os.path.basename(image_path)
+        previous = self.uploads.pop(key, None)
+        if previous is not None:
+            # A retake overwrote this file; the earlier upload is for stale pixels
+            previous.cancel()
+            protected_tasks.discard(previous)
+        task = asyncio.create_task(self._upload(os.path.abspath(image_path)))
+        # Mid-run cleanup() after screenshot capture must not cancel these
+        protected_tasks.add(task)
+        self.uploads[key] = task
+        if self.meta.get('debug'):
+            console.print(f"[cyan]Started early upload of {key} to {self.img_host}[/cyan]")
+
+    async def _upload(self, image_path: str) -> dict[str, Any]:
+        async with self.semaphore:
+            return await asyncio.wait_for(upload_image_task((image_path, self.img_host, self.config, self.meta)), timeout=60.0)
+
+    def take(self, image: str, img_host: str) -> Optional[asyncio.Task[dict[str, Any]]]:
+        if img_host != self.img_host:
+            return None
+        task = self.uploads.pop(os.path.basename(image), None)
+        if task is not None:
+            protected_tasks.discard(task)
+        return task
+
+    async def aclose(self) -> None:
+        """Cancel uploads nobody claimed (host switched, or more images than needed)."""
+        for task in self.uploads.values():
+            task.cancel()
+            protected_tasks.discard(task)
+        for task in self.uploads.values():
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self.uploads.clear()
+
+
 async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
     image, img_host, config, meta = args
     try:
@@ -62,7 +121,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
 
         if img_host == "imgbox":
             try:
-                image_list = await imgbox_upload(os.getcwd(), [image], return_dict={})
+                image_list = await imgbox_upload([image], return_dict={})
                 if image_list and all(
                     'img_url' in img and 'raw_url' in img and 'web_url' in img for img in image_list
                 ):
@@ -90,7 +149,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 return {'status': 'failed', 'reason': 'Missing ptpimg API key in config'}
 
             try:
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     async with aiofiles.open(image, 'rb') as file:
                         files = {'file-upload[0]': (os.path.basename(image), await file.read())}
                         headers = {'referer': 'https://ptpimg.me/index.php'}
@@ -140,7 +199,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'image': encoded_image,
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, data=data, timeout=timeout)
                     response_data = response.json()
                     if response.status_code != 200 or not response_data.get('success'):
@@ -178,7 +237,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'key': config['DEFAULT']['dalexni_api'],
                     'image': encoded_image,
                 }
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, data=data, timeout=timeout)
                     response_data = response.json()
                     if response.status_code != 200 or not response_data.get('success'):
@@ -213,7 +272,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['ptscreens_api']
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as file:
+                async with http_client_manager.client() as client, aiofiles.open(image, 'rb') as file:
                     files = {
                         'source': ('file-upload[0]', await file.read())
                     }
@@ -255,7 +314,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['utppm_api'],
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
 
@@ -293,7 +352,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': config['DEFAULT']['onlyimage_api'],
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
 
@@ -326,7 +385,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'max_th_size': 350
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as file:
+                async with http_client_manager.client() as client, aiofiles.open(image, 'rb') as file:
                     files = {
                         'img': ('file-upload[0]', await file.read())
                     }
@@ -372,7 +431,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 headers = {
                     'X-API-Key': config['DEFAULT']['lensdump_api']
                 }
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, data=data, headers=headers, timeout=timeout)
                     response_data = response.json()
                     if response_data.get('status_code') == 200:
@@ -405,7 +464,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'Authorization': f'{api_key}',
                 }
 
-                async with httpx.AsyncClient() as client:
+                async with http_client_manager.client() as client:
                     response = await client.post(url, files={'file': (filename, file_bytes)}, headers=headers, timeout=timeout)
                     if response.status_code == 200:
                         response_data = response.json()
@@ -448,7 +507,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                     'X-API-Key': pass_api_key
                 }
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with http_client_manager.client() as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'source': (os.path.basename(image), await img_file.read())}
                     response = await client.post(url, headers=headers, files=files, timeout=timeout)
 
@@ -499,7 +558,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
             try:
                 headers = {'Authorization': f'Bearer {api_key}'}
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with http_client_manager.client() as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'files[]': (os.path.basename(image), await img_file.read())}
 
                     response = await client.post(url, headers=headers, files=files, timeout=timeout)
@@ -559,7 +618,7 @@ async def upload_image_task(args: Sequence[Any]) -> dict[str, Any]:
                 headers = {'Authorization': f'{api_key}'}
                 data = {'title': 'Upload-Assistant screenshot'}
 
-                async with httpx.AsyncClient() as client, aiofiles.open(image, 'rb') as img_file:
+                async with http_client_manager.client() as client, aiofiles.open(image, 'rb') as img_file:
                     files = {'file': (os.path.basename(image), await img_file.read())}
                     response = await client.post(url, headers=headers, data=data, files=files, timeout=timeout)
 
@@ -634,7 +693,8 @@ async def _upload_screens(
     return_dict: dict[str, Any],
     retry_mode: bool = False,
     max_retries: int = 3,
-    allowed_hosts: Union[list[str], None] = None
+    allowed_hosts: Union[list[str], None] = None,
+    prefetched: Optional[ScreenshotPrefetcher] = None,
 ) -> tuple[list[ImageDict], int]:
     default_config = config.get('DEFAULT', {})
     if 'image_list' not in meta:
@@ -643,8 +703,6 @@ async def _upload_screens(
     if meta.get('debug'):
         upload_start_time = time.time()
 
-    os.chdir(f"{meta['base_dir']}/tmp/{meta['uuid']}")
-
     initial_img_host = default_config[f'img_host_{img_host_num}']
     img_host = str(meta.get('imghost', ''))
 
@@ -690,20 +748,22 @@ async def _upload_screens(
         existing_images: list[ImageDict] = []
         existing_count = 0
     else:
+        # Absolute patterns: the working directory is shared with parallel queue items
+        screens_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
         image_patterns = ["*.png", ".[!.]*.png"]
         image_glob: list[str] = []
         for pattern in image_patterns:
-            glob_results = await asyncio.to_thread(glob.glob, pattern)
+            glob_results = await asyncio.to_thread(glob.glob, os.path.join(glob.escape(screens_dir), pattern))
             image_glob.extend(glob_results)
 
         unwanted_patterns = ["FILE*", "PLAYLIST*", "POSTER*"]
         unwanted_files: set[str] = set()
         for pattern in unwanted_patterns:
-            glob_results = await asyncio.to_thread(glob.glob, pattern)
+            glob_results = await asyncio.to_thread(glob.glob, os.path.join(glob.escape(screens_dir), pattern))
             unwanted_files.update(glob_results)
             if pattern.startswith("FILE") or pattern.startswith("PLAYLIST") or pattern.startswith("POSTER"):
                 hidden_pattern = "." + pattern
-                hidden_glob_results = await asyncio.to_thread(glob.glob, hidden_pattern)
+                hidden_glob_results = await asyncio.to_thread(glob.glob, os.path.join(glob.escape(screens_dir), hidden_pattern))
                 unwanted_files.update(hidden_glob_results)
 
         image_glob = [file for file in image_glob if file not in unwanted_files]
@@ -738,8 +798,7 @@ async def _upload_screens(
 
     # Concurrency Control
     default_pool_size = len(upload_tasks)
-    host_limits = {"onlyimage": 6, "ptscreens": 6, "lensdump": 1, "passtheimage": 6}
-    pool_size = host_limits.get(img_host, default_pool_size)
+    pool_size = UPLOAD_HOST_LIMITS.get(img_host, default_pool_size)
     max_workers = min(len(upload_tasks), pool_size)
     semaphore = asyncio.Semaphore(max_workers)
 
@@ -754,6 +813,17 @@ async def _upload_screens(
         index, *task_args = task
         retry_count = 0
 
+        early_upload = prefetched.take(task_args[0], img_host) if prefetched is not None else None
+        if early_upload is not None:
+            # wait() rather than await so a failed/cancelled early upload falls through to a normal one
+            await asyncio.wait({early_upload})
+            if not early_upload.cancelled() and early_upload.exception() is None:
+                result = early_upload.result()
+                if result.get('status') == 'success':
+                    return (index, result)
+            if meta.get('debug'):
+                console.print(f"[yellow]Early upload of image {index} did not succeed, uploading again[/yellow]")
+
         async with semaphore:
             while retry_count <= max_retries:
                 future: Optional[asyncio.Task[dict[str, Any]]] = None
@@ -844,7 +914,7 @@ async def _upload_screens(
                 console.print(f"[cyan]Switching to the next image host: {meta['imghost']}[/cyan]")
 
                 gc.collect()
-                return await _upload_screens(config, meta, screens, img_host_num, i, total_screens, custom_img_list, return_dict, retry_mode=True)
+                return await _upload_screens(config, meta, screens, img_host_num, i, total_screens, custom_img_list, return_dict, retry_mode=True, prefetched=prefetched)
             else:
                 console.print("[red]No more image hosts available. Aborting upload process.")
                 return image_list, len(image_list)
@@ -896,12 +966,10 @@ async def _upload_screens(
 
 
 async def imgbox_upload(
-    chdir: str,
     image_glob: list[str],
     return_dict: dict[str, Any],
 ) -> list[dict[str, str]]:
     try:
-        os.chdir(chdir)
         image_list: list[dict[str, str]] = []
 
         async with pyimgbox.Gallery(thumb_width=350, square_thumbs=False) as gallery:
@@ -18,45 +18,72 @@ from collections.abc import Iterable, Mapping
 from pathlib import Path
 from typing import Any, Optional, cast
 
-import aiofiles
-import cli_ui
-import discord
-import requests
-from packaging import version
-from torf import Torrent
-from typing_extensions import TypeAlias
-
-from bin.get_mkbrr import MkbrrBinaryManager
-from cogs.redaction import Redaction
-from discordbot import DiscordNotifier
-from src.add_comparison import ComparisonManager
 from src.args import Args
-from src.cleanup import cleanup_manager
-from src.clients import Clients
 from src.console import console
-from src.disc_menus import process_disc_menus
-from src.dupe_checking import DupeChecker
-from src.get_desc import gen_desc
-from src.get_name import NameManager
-from src.get_tracker_data import TrackerDataManager
-from src.languages import languages_manager
-from src.nfo_link import NfoLinkManager
-from src.qbitwait import Wait
-from src.queuemanage import QueueManager
-from src.takescreens import TakeScreensManager
-from src.torrentcreate import TorrentCreator
-from src.trackerhandle import process_trackers
-from src.trackers.AR import AR
-from src.trackers.COMMON import COMMON
-from src.trackers.PTP import PTP
-from src.trackersetup import TRACKER_SETUP, api_trackers, http_trackers, other_api_trackers, tracker_class_map
-from src.trackerstatus import TrackerStatusManager
-from src.uphelper import UploadHelper
-from src.uploadscreens import UploadScreensManager
 
-cli_ui.setup(color='always', title="Upload Assistant")
 base_dir = os.path.abspath(os.path.dirname(__file__))
 
+
+def _dispatch_trivial_modes(argv: list[str]) -> None:
+    """
+    Answer --help, a bare --cleanup and an empty command line before the upload machinery is imported.
+
+    None of them need config, trackers or torrent clients, which together take about a second to import.
+    bin/check_startup_time.py guards this.
+    """
+    if not argv or any(arg in ('-h', '--help') for arg in argv):
+        # argparse prints the help (or the missing-path error) and exits
+        Args().parse(argv, {})
+    if argv in (['--cleanup'], ['-cleanup']):
+        if os.path.exists(f"{base_dir}/tmp"):
+            shutil.rmtree(f"{base_dir}/tmp")
+            console.print("[yellow]Successfully emptied tmp directory[/yellow]")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    _dispatch_trivial_modes(sys.argv[1:])
+
+import aiofiles  # noqa: E402
+import cli_ui  # noqa: E402
+from torf import Torrent  # noqa: E402
+from typing_extensions import TypeAlias  # noqa: E402
+
+from bin.get_mkbrr import MkbrrBinaryManager  # noqa: E402
+from cogs.redaction import Redaction  # noqa: E402
+from src.add_comparison import ComparisonManager  # noqa: E402
+from src.cleanup import cleanup_manager, protected_tasks  # noqa: E402
+from src.clients import Clients  # noqa: E402
+from src.disc_menus import process_disc_menus  # noqa: E402
+from src.dupe_checking import DupeChecker  # noqa: E402
+from src.dupe_search_cache import dupe_search_cache  # noqa: E402
+from src.frame_index import frame_index  # noqa: E402
+from src.get_desc import gen_desc  # noqa: E402
+from src.get_name import NameManager  # noqa: E402
+from src.get_tracker_data import TrackerDataManager  # noqa: E402
+from src.guessit_cache import guessit_cache  # noqa: E402
+from src.http_client import http_client_manager  # noqa: E402
+from src.languages import languages_manager  # noqa: E402
+from src.mediainfo_cache import mediainfo_cache  # noqa: E402
+from src.metadata_cache import metadata_cache  # noqa: E402
+from src.nfo_link import NfoLinkManager  # noqa: E402
+from src.piece_cache import piece_hash_cache  # noqa: E402
+from src.qbit_mirror import qbit_mirrors  # noqa: E402
+from src.qbitwait import Wait  # noqa: E402
+from src.queuemanage import QueueManager  # noqa: E402
+from src.rate_limit import rate_limiter  # noqa: E402
+from src.resource_limits import resource_limits  # noqa: E402
+from src.takescreens import TakeScreensManager  # noqa: E402
+from src.torrentcreate import TorrentCreator  # noqa: E402
+from src.trackerhandle import process_trackers  # noqa: E402
+from src.trackers.COMMON import COMMON  # noqa: E402
+from src.trackersetup import TRACKER_SETUP, api_trackers, http_trackers, other_api_trackers, tracker_class_map  # noqa: E402
+from src.trackerstatus import TrackerStatusManager  # noqa: E402
+from src.uphelper import UploadHelper  # noqa: E402
+from src.uploadscreens import ScreenshotPrefetcher, UploadScreensManager  # noqa: E402
+
+cli_ui.setup(color='always', title="Upload Assistant")
+
 # Global state for shutdown handling (reset via _reset_shutdown_state() for in-process runs)
 _shutdown_requested = False
 _is_webui_mode = False
@@ -230,6 +257,14 @@ if os.path.exists(_config_path):
     try:
         from data.config import config as _imported_config  # pyright: ignore[reportMissingImports,reportUnknownVariableType]
         config = cast(dict[str, Any], _imported_config)
+        http_client_manager.configure(config)
+        rate_limiter.configure(config, base_dir)
+        dupe_search_cache.configure(config)
+        metadata_cache.configure(config, base_dir)
+        piece_hash_cache.configure(config, base_dir)
+        mediainfo_cache.configure(config, base_dir)
+        frame_index.configure(config, base_dir)
+        resource_limits.configure(config)
         parser = Args(config)
         client = Clients(config)
         name_manager = NameManager(config)
@@ -428,9 +463,123 @@ async def validate_tracker_logins(meta: Meta, trackers: Optional[list[str]] = No
         await asyncio.gather(*[validate_single_tracker(tracker) for tracker in valid_trackers])
 
 
+async def resolve_image_hosts(meta: Meta) -> tuple[Optional[list[str]], list[str]]:
+    """Pick the image host(s) acceptable to every selected tracker with image host rules.
+
+    May switch meta['imghost'] to a common approved host. Returns (allowed_hosts, relevant_trackers).
+    """
+    trackers_with_image_host_requirements = {'A4K', 'BHD', 'DC', 'GPW', 'HUNO', 'MTV', 'OE', 'PTP', 'STC', 'TVC'}
+
+    relevant_trackers = [
+        t for t in cast(list[Any], meta.get('trackers', []))
+        if isinstance(t, str) and t in trackers_with_image_host_requirements and t in tracker_class_map
+    ]
+
+    # If all relevant trackers share exactly one common approved host that the user has configured,
+    # and it's not the initially selected host, switch meta['imghost'] to that common host.
+    # If multiple common hosts exist, pick the first by config priority (img_host_1..img_host_9).
+    allowed_hosts: Optional[list[str]] = None
+    if relevant_trackers:
+        try:
+            tracker_instances = {
+                tracker_name: tracker_class_map[tracker_name](config=config)
+                for tracker_name in relevant_trackers
+            }
+
+            if meta.get('debug'):
+                console.print(f"[cyan]Image host debug: meta['imghost']={meta.get('imghost')} img_host_1={config['DEFAULT'].get('img_host_1')}[/cyan]")
+                console.print(f"[cyan]Image host debug: relevant_trackers={relevant_trackers}[/cyan]")
+
+            default_cfg_obj = config.get('DEFAULT', {})
+            default_cfg: dict[str, Any] = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
+            configured_hosts: list[str] = []
+            for host_index in range(1, 10):
+                host_key = f'img_host_{host_index}'
+                if host_key in default_cfg:
+                    host = default_cfg.get(host_key)
+                    if host and host not in configured_hosts:
+                        configured_hosts.append(str(host))
+
+            if meta.get('debug'):
+                console.print(f"[cyan]Image host debug: configured_hosts={configured_hosts}[/cyan]")
+
+            approved_sets: list[set[str]] = []
+            all_known = True
+            for tracker_name in relevant_trackers:
+                tracker_instance = tracker_instances[tracker_name]
+                approved_hosts = getattr(tracker_instance, 'approved_image_hosts', None)
+                if not approved_hosts:
+                    all_known = False
+                    break
+                if isinstance(approved_hosts, (list, set, tuple)):
+                    approved_hosts_list = [
+                        str(host)
+                        for host in cast(Iterable[Any], approved_hosts)
+                    ]
+                    approved_sets.append(set(approved_hosts_list))
+                else:
+                    all_known = False
+                    break
+
+                if meta.get('debug'):
+                    console.print(
+                        f"[cyan]Image host debug: {tracker_name}.approved_image_hosts={approved_hosts_list}[/cyan]"
+                    )
+
+            if all_known and approved_sets and configured_hosts:
+                common_hosts: set[str] = set()
+                for host_set in approved_sets:
+                    if not common_hosts:
+                        common_hosts = set(host_set)
+                    else:
+                        common_hosts &= host_set
+                common_configured_hosts = [h for h in configured_hosts if h in common_hosts]
+
+                if meta.get('debug'):
+                    console.print(f"[cyan]Image host debug: common_hosts={sorted(common_hosts)}[/cyan]")
+                    console.print(f"[cyan]Image host debug: common_configured_hosts={common_configured_hosts}[/cyan]")
+
+                # If we have any common hosts, use them as allowed_hosts for upload_screens
+                if common_configured_hosts:
+                    allowed_hosts = common_configured_hosts
+                elif common_hosts:
+                    allowed_hosts = sorted(common_hosts)
+
+                # Prefer the user-selected host if it's valid for all relevant trackers; otherwise
+                # fall back to the first common configured host by config priority (img_host_1..img_host_9).
+                current_img_host = str(meta.get('imghost') or config['DEFAULT'].get('img_host_1') or "")
+                preferred_host: Optional[str] = None
+
+                if common_configured_hosts and current_img_host not in common_configured_hosts:
+                    preferred_host = common_configured_hosts[0]
+                elif common_hosts and current_img_host not in common_hosts:
+                    preferred_host = sorted(common_hosts)[0]
+
+                if preferred_host and preferred_host != meta.get('imghost'):
+                    if meta.get('debug'):
+                        console.print(
+                            f"[cyan]Image host debug: current host '{current_img_host}' is not common to all trackers; "
+                            f"switching meta['imghost'] from '{meta.get('imghost')}' to '{preferred_host}'.[/cyan]"
+                        )
+                    meta['imghost'] = preferred_host
+
+            elif meta.get('debug'):
+                console.print(
+                    f"[cyan]Image host debug: cannot compute common host (all_known={all_known}, approved_sets={len(approved_sets)}, configured_hosts={len(configured_hosts)}).[/cyan]"
+                )
+
+        except Exception as e:
+            if meta.get('debug'):
+                console.print(f"[yellow]Could not determine a common approved image host: {e}[/yellow]")
+
+    return allowed_hosts, relevant_trackers
+
+
 async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
     """Process the metadata for each queued path."""
     if use_discord and bot:
+        from discordbot import DiscordNotifier
+
         await DiscordNotifier.send_discord_notification(
             config, bot, f"Starting upload process for: {meta['path']}", debug=meta.get('debug', False), meta=meta
         )
@@ -735,6 +884,18 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                 await common.get_bdmv_mediainfo(meta)
                 bdmv_mi_created = True
 
+        # Hashing is disk-bound, ffmpeg CPU-bound and image hosts network-bound, so by default BASE.torrent
+        # hashing starts now and screenshots are uploaded as ffmpeg finishes them. A forced recheck must
+        # finish before hashing, so that case keeps the sequential order.
+        pipeline_screens = bool(config['DEFAULT'].get('pipeline_screenshots', True))
+        base_torrent_task: Optional[asyncio.Task[None]] = None
+        if pipeline_screens and not meta.get('force_recheck', False):
+            base_torrent_task = asyncio.create_task(create_base_torrent(meta, background=True))
+            protected_tasks.add(base_torrent_task)
+
+        image_hosts: Optional[tuple[Optional[list[str]], list[str]]] = None
+        prefetcher: Optional[ScreenshotPrefetcher] = None
+        images_done = False
         progress_task = asyncio.create_task(print_progress("[yellow]Still processing, please wait...", interval=10))
         try:
             if 'manual_frames' not in meta:
@@ -840,9 +1001,20 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                             if meta['debug']:
                                 console.print(f"videopath: {videopath}, filename: {filename}, meta: {meta['uuid']}, base_dir: {base_dir}, manual_frames: {manual_frames}")
 
+                            if (
+                                pipeline_screens
+                                and len(meta.get('image_list', [])) < int(meta.get('cutoff') or 1)
+                                and meta.get('skip_imghost_upload', False) is False
+                            ):
+                                image_hosts = await resolve_image_hosts(meta)
+                                prefetch_host = str(meta.get('imghost') or config['DEFAULT'].get('img_host_1') or '')
+                                if prefetch_host:
+                                    prefetcher = ScreenshotPrefetcher(config, meta, prefetch_host)
+
                             await takescreens_manager.screenshots(
                                 videopath, filename, meta['uuid'], base_dir, meta,
-                                manual_frames=manual_frames  # Pass additional kwargs directly
+                                manual_frames=manual_frames,  # Pass additional kwargs directly
+                                on_capture=prefetcher.submit if prefetcher is not None else None
                             )
                         except asyncio.CancelledError as e:
                             await cleanup_screenshot_temp_files(meta)
@@ -897,109 +1069,9 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                 cutoff = int(meta.get('cutoff') or 1)
                 if len(meta.get('image_list', [])) < cutoff and meta.get('skip_imghost_upload', False) is False:
                     # Validate and (if needed) rehost images to tracker-approved hosts before uploading any new screenshots.
-                    trackers_with_image_host_requirements = {'A4K', 'BHD', 'DC', 'GPW', 'HUNO', 'MTV', 'OE', 'PTP', 'STC', 'TVC'}
-
-                    relevant_trackers = [
-                        t for t in cast(list[Any], meta.get('trackers', []))
-                        if isinstance(t, str) and t in trackers_with_image_host_requirements and t in tracker_class_map
-                    ]
-
-                    # If all relevant trackers share exactly one common approved host that the user has configured,
-                    # and it's not the initially selected host, switch meta['imghost'] to that common host.
-                    # If multiple common hosts exist, pick the first by config priority (img_host_1..img_host_9).
-                    allowed_hosts: Optional[list[str]] = None
-                    if relevant_trackers:
-                        try:
-                            tracker_instances = {
-                                tracker_name: tracker_class_map[tracker_name](config=config)
-                                for tracker_name in relevant_trackers
-                            }
-
-                            if meta.get('debug'):
-                                console.print(f"[cyan]Image host debug: meta['imghost']={meta.get('imghost')} img_host_1={config['DEFAULT'].get('img_host_1')}[/cyan]")
-                                console.print(f"[cyan]Image host debug: relevant_trackers={relevant_trackers}[/cyan]")
-
-                            default_cfg_obj = config.get('DEFAULT', {})
-                            default_cfg: dict[str, Any] = cast(dict[str, Any], default_cfg_obj) if isinstance(default_cfg_obj, dict) else {}
-                            configured_hosts: list[str] = []
-                            for host_index in range(1, 10):
-                                host_key = f'img_host_{host_index}'
-                                if host_key in default_cfg:
-                                    host = default_cfg.get(host_key)
-                                    if host and host not in configured_hosts:
-                                        configured_hosts.append(str(host))
-
-                            if meta.get('debug'):
-                                console.print(f"[cyan]Image host debug: configured_hosts={configured_hosts}[/cyan]")
-
-                            approved_sets: list[set[str]] = []
-                            all_known = True
-                            for tracker_name in relevant_trackers:
-                                tracker_instance = tracker_instances[tracker_name]
-                                approved_hosts = getattr(tracker_instance, 'approved_image_hosts', None)
-                                if not approved_hosts:
-                                    all_known = False
-                                    break
-                                if isinstance(approved_hosts, (list, set, tuple)):
-                                    approved_hosts_list = [
-                                        str(host)
-                                        for host in cast(Iterable[Any], approved_hosts)
-                                    ]
-                                    approved_sets.append(set(approved_hosts_list))
-                                else:
-                                    all_known = False
-                                    break
-
-                                if meta.get('debug'):
-                                    console.print(
-                                        f"[cyan]Image host debug: {tracker_name}.approved_image_hosts={approved_hosts_list}[/cyan]"
-                                    )
-
-                            if all_known and approved_sets and configured_hosts:
-                                common_hosts: set[str] = set()
-                                for host_set in approved_sets:
-                                    if not common_hosts:
-                                        common_hosts = set(host_set)
-                                    else:
-                                        common_hosts &= host_set
-                                common_configured_hosts = [h for h in configured_hosts if h in common_hosts]
-
-                                if meta.get('debug'):
-                                    console.print(f"[cyan]Image host debug: common_hosts={sorted(common_hosts)}[/cyan]")
-                                    console.print(f"[cyan]Image host debug: common_configured_hosts={common_configured_hosts}[/cyan]")
-
-                                # If we have any common hosts, use them as allowed_hosts for upload_screens
-                                if common_configured_hosts:
-                                    allowed_hosts = common_configured_hosts
-                                elif common_hosts:
-                                    allowed_hosts = sorted(common_hosts)
-
-                                # Prefer the user-selected host if it's valid for all relevant trackers; otherwise
-                                # fall back to the first common configured host by config priority (img_host_1..img_host_9).
-                                current_img_host = str(meta.get('imghost') or config['DEFAULT'].get('img_host_1') or "")
-                                preferred_host: Optional[str] = None
-
-                                if common_configured_hosts and current_img_host not in common_configured_hosts:
-                                    preferred_host = common_configured_hosts[0]
-                                elif common_hosts and current_img_host not in common_hosts:
-                                    preferred_host = sorted(common_hosts)[0]
-
-                                if preferred_host and preferred_host != meta.get('imghost'):
-                                    if meta.get('debug'):
-                                        console.print(
-                                            f"[cyan]Image host debug: current host '{current_img_host}' is not common to all trackers; "
-                                            f"switching meta['imghost'] from '{meta.get('imghost')}' to '{preferred_host}'.[/cyan]"
-                                        )
-                                    meta['imghost'] = preferred_host
-
-                            elif meta.get('debug'):
-                                console.print(
-                                    f"[cyan]Image host debug: cannot compute common host (all_known={all_known}, approved_sets={len(approved_sets)}, configured_hosts={len(configured_hosts)}).[/cyan]"
-                                )
-
-                        except Exception as e:
-                            if meta.get('debug'):
-                                console.print(f"[yellow]Could not determine a common approved image host: {e}[/yellow]")
+                    if image_hosts is None:
+                        image_hosts = await resolve_image_hosts(meta)
+                    allowed_hosts, relevant_trackers = image_hosts
 
                     if meta.get('debug'):
                         image_list_for_debug = cast(list[Any], meta.get('image_list') or [])
@@ -1038,7 +1110,8 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                         for idx in range(start_index, len(host_order)):
                             meta['imghost'] = host_order[idx]
                             await uploadscreens_manager.upload_screens(
-                                meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict, allowed_hosts=allowed_hosts
+                                meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict, allowed_hosts=allowed_hosts,
+                                prefetched=prefetcher
                             )
                             image_list_count = len(meta.get('image_list', []) or [])
                             if meta.get('debug'):
@@ -1108,29 +1181,33 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
                             console.print(f"[cyan]Saved {len(image_list)} images to image_data.json")
                     except Exception as e:
                         console.print(f"[yellow]Failed to save image data: {str(e)}")
+            images_done = True
         finally:
             progress_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await progress_task
+            if prefetcher is not None:
+                await prefetcher.aclose()
+            if base_torrent_task is not None and not images_done:
+                # Leaving early (error or interrupt): stop background hashing with us
+                protected_tasks.discard(base_torrent_task)
+                base_torrent_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await base_torrent_task
 
         torrent_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
-        if meta.get('force_recheck', False):
-            waiter = Wait(config)
-            await waiter.select_and_recheck_best_torrent(meta, meta['path'], check_interval=5)
-        if not os.path.exists(torrent_path):
-            reuse_torrent = None
-            if meta.get('rehash', False) is False and not meta['base_torrent_created'] and not meta['we_checked_them_all']:
-                reuse_torrent = await client.find_existing_torrent(meta)
-                if reuse_torrent is not None:
-                    await TorrentCreator.create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
-
-            if meta['nohash'] is False and reuse_torrent is None:
-                await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE")
-            if meta['nohash']:
-                meta['client'] = "none"
-
-        elif os.path.exists(torrent_path) and meta.get('rehash', False) is True and meta['nohash'] is False:
-            await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE")
+        if base_torrent_task is not None:
+            if meta['debug'] and not base_torrent_task.done():
+                console.print("[cyan]Waiting for BASE torrent hashing to finish...[/cyan]")
+            try:
+                await base_torrent_task
+            finally:
+                protected_tasks.discard(base_torrent_task)
+        else:
+            if meta.get('force_recheck', False):
+                waiter = Wait(config)
+                await waiter.select_and_recheck_best_torrent(meta, meta['path'], check_interval=5)
+            await create_base_torrent(meta)
 
         if os.path.exists(torrent_path):
             raw_trackers = meta.get('trackers')
@@ -1175,6 +1252,26 @@ async def process_meta(meta: Meta, base_dir: str, bot: Any = None) -> None:
             await f.write(json.dumps(meta, indent=4))
 
 
+async def create_base_torrent(meta: Meta, background: bool = False) -> None:
+    """Create (or reuse from the client) tmp/<uuid>/BASE.torrent unless --nohash."""
+    torrent_path = f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent"
+    torrent_exists = await asyncio.to_thread(os.path.exists, torrent_path)
+    if not torrent_exists:
+        reuse_torrent = None
+        if meta.get('rehash', False) is False and not meta['base_torrent_created'] and not meta['we_checked_them_all']:
+            reuse_torrent = await client.find_existing_torrent(meta)
+            if reuse_torrent is not None:
+                await TorrentCreator.create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
+
+        if meta['nohash'] is False and reuse_torrent is None:
+            await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE", background=background)
+        if meta['nohash']:
+            meta['client'] = "none"
+
+    elif meta.get('rehash', False) is True and meta['nohash'] is False:
+        await TorrentCreator.create_torrent(meta, Path(meta['path']), "BASE", background=background)
+
+
 async def cleanup_screenshot_temp_files(meta: Meta) -> None:
     """Cleanup temporary screenshot files to prevent orphaned files in case of failures."""
     tmp_dir = f"{meta['base_dir']}/tmp/{meta['uuid']}"
@@ -1194,22 +1291,23 @@ async def save_processed_file(log_file: str, file_path: str) -> None:
     """
     Adds a processed file to the log, deduplicating and always appending to the end.
     """
-    if os.path.exists(log_file):
-        async with aiofiles.open(log_file, encoding='utf-8') as f:
-            try:
-                content = await f.read()
-                loaded: Any = json.loads(content) if content.strip() else []
-                processed_files = cast(list[Any], loaded) if isinstance(loaded, list) else []
-            except Exception:
-                processed_files = []
-    else:
-        processed_files = []
+    async with QueueManager.log_lock(log_file):
+        if os.path.exists(log_file):
+            async with aiofiles.open(log_file, encoding='utf-8') as f:
+                try:
+                    content = await f.read()
+                    loaded: Any = json.loads(content) if content.strip() else []
+                    processed_files = cast(list[Any], loaded) if isinstance(loaded, list) else []
+                except Exception:
+                    processed_files = []
+        else:
+            processed_files = []
 
-    processed_files_clean: list[str] = [str(entry) for entry in processed_files if entry != file_path]
-    processed_files_clean.append(file_path)
+        processed_files_clean: list[str] = [str(entry) for entry in processed_files if entry != file_path]
+        processed_files_clean.append(file_path)
 
-    async with aiofiles.open(log_file, "w", encoding='utf-8') as f:
-        await f.write(json.dumps(processed_files_clean, indent=4))
+        async with aiofiles.open(log_file, "w", encoding='utf-8') as f:
+            await f.write(json.dumps(processed_files_clean, indent=4))
 
 
 def get_local_version(version_file: str) -> Optional[str]:
@@ -1230,6 +1328,8 @@ def get_local_version(version_file: str) -> Optional[str]:
 
 def get_remote_version(url: str) -> tuple[Optional[str], Optional[str]]:
     """Fetches the latest version information from the remote repository."""
+    import requests
+
     try:
         response = requests.get(url, timeout=30)
         if response.status_code == 200:
@@ -1285,6 +1385,8 @@ async def update_notification(base_dir: str) -> Optional[str]:
     if not remote_version:
         return local_version
 
+    from packaging import version
+
     if version.parse(remote_version) > version.parse(local_version):
         console.print(f"[red][NOTICE] [green]Update available: v[/green][yellow]{remote_version}")
         console.print(f"[red][NOTICE] [green]Current version: v[/green][yellow]{local_version}")
@@ -1318,6 +1420,14 @@ async def do_the_thing(base_dir: str) -> None:
             raise TypeError(f"Expected dict, got {type(_reloaded).__name__}")
         config.clear()
         config.update(_reloaded)
+        http_client_manager.configure(config)
+        rate_limiter.configure(config, base_dir)
+        dupe_search_cache.configure(config)
+        metadata_cache.configure(config, base_dir)
+        piece_hash_cache.configure(config, base_dir)
+        mediainfo_cache.configure(config, base_dir)
+        frame_index.configure(config, base_dir)
+        resource_limits.configure(config)
     except Exception as exc:
         console.print(f"[yellow]Warning: could not reload config from disk: {exc}[/yellow]")
 
@@ -1345,8 +1455,7 @@ async def do_the_thing(base_dir: str) -> None:
             if os.name != 'nt':
                 os.chmod(subdir_path, 0o700)
 
-    bot: Any = None
-    connect_task: Optional[asyncio.Task[None]] = None
+    discord_sessions: list[tuple[Any, asyncio.Task[None]]] = []
     meta: Meta = {}
     paths: list[str] = []
     for each in sys.argv[1:]:
@@ -1375,6 +1484,7 @@ async def do_the_thing(base_dir: str) -> None:
             meta['path'] = None  # Clear the dummy path after parsing
         else:
             meta, _help, _before_args = cast(tuple[Meta, Any, Any], parser.parse(list(' '.join(sys.argv[1:]).split(' ')), meta))
+        metadata_cache.set_mode(no_cache=bool(meta.get('no_cache')), refresh_cache=bool(meta.get('refresh_cache')))
 
         # Start web UI if requested (exclusive mode - doesn't continue with uploads)
         if meta.get('webui'):
@@ -1522,11 +1632,15 @@ async def do_the_thing(base_dir: str) -> None:
         skipped_files_count = 0
         base_meta = dict(meta.items())
 
-        for queue_item in queue_list:
+        async def process_queue_item(queue_item: Any) -> bool:
+            """Process one queue entry; returns True once --limit-queue has been reached."""
+            nonlocal processed_files_count, skipped_files_count
             total_files = len(queue_list)
-            bot = None
+            bot: Any = None
+            connect_task: Optional[asyncio.Task[None]] = None
             current_item_path = ""
             tmp_path = ""
+            path = queue_item if isinstance(queue_item, str) else ""
             try:
                 meta = base_meta.copy()
 
@@ -1602,6 +1716,8 @@ async def do_the_thing(base_dir: str) -> None:
                 and not meta['debug']
                 and ((only_unattended and meta.get('unattended', False)) or not only_unattended)
             ):
+                import discord
+
                 try:
                     console.print("[cyan]Starting Discord bot initialization...")
                     intents = discord.Intents.default()
@@ -1610,6 +1726,7 @@ async def do_the_thing(base_dir: str) -> None:
                     token = discord_bot_token
                     await asyncio.wait_for(bot.login(token), timeout=10)
                     connect_task = asyncio.create_task(bot.connect())
+                    discord_sessions.append((bot, connect_task))
 
                     try:
                         await asyncio.wait_for(bot.wait_until_ready(), timeout=20)
@@ -1617,7 +1734,7 @@ async def do_the_thing(base_dir: str) -> None:
                     except asyncio.TimeoutError:
                         console.print("[bold red]Bot failed to connect within timeout period.")
                         console.print("[yellow]Continuing without Discord integration...")
-                        if 'connect_task' in locals():
+                        if connect_task is not None:
                             connect_task.cancel()
                 except discord.LoginFailure:
                     console.print("[bold red]Discord bot token is invalid. Please check your configuration.")
@@ -1729,6 +1846,8 @@ async def do_the_thing(base_dir: str) -> None:
                         list(other_api_trackers),
                     )
                     if use_discord and bot:
+                        from discordbot import DiscordNotifier
+
                         await DiscordNotifier.send_upload_status_notification(config, bot, meta)
 
                     if config['DEFAULT'].get('cross_seeding', True):
@@ -1749,6 +1868,14 @@ async def do_the_thing(base_dir: str) -> None:
             if meta['debug']:
                 finish_time = time.time()
                 console.print(f"Uploads processed in {finish_time - start_time:.4f} seconds")
+                http_client_manager.print_stats()
+                rate_limiter.print_stats()
+                dupe_search_cache.print_stats()
+                metadata_cache.print_stats()
+                piece_hash_cache.print_stats()
+                mediainfo_cache.print_stats()
+                guessit_cache.print_stats()
+                qbit_mirrors.print_stats()
 
             def build_tracker_status_line(tracker: str, status: Any) -> str:
                 try:
@@ -1780,6 +1907,8 @@ async def do_the_thing(base_dir: str) -> None:
                     return f"Error printing {tracker} data: {exc}\n"
 
             if use_discord and bot:
+                from discordbot import DiscordNotifier
+
                 send_upload_links = bool(discord_config.get('send_upload_links', False)) if discord_config is not None else False
                 if send_upload_links:
                     try:
@@ -1842,7 +1971,7 @@ async def do_the_thing(base_dir: str) -> None:
                 await cleanup_manager.cleanup()
                 gc.collect()
                 cleanup_manager.reset_terminal()
-                break
+                return True
 
             if sanitize_meta and not meta.get('emby', False):
                 try:
@@ -1853,6 +1982,43 @@ async def do_the_thing(base_dir: str) -> None:
             await cleanup_manager.cleanup()
             gc.collect()
             cleanup_manager.reset_terminal()
+            return False
+
+        def queue_item_path(queue_item: Any) -> str:
+            if isinstance(queue_item, Mapping):
+                return str(cast(Mapping[str, Any], queue_item).get('path') or '')
+            return str(queue_item)
+
+        def limit_allows_start(running: int) -> bool:
+            limit = int(base_meta.get('limit_queue') or 0)
+            return limit <= 0 or (processed_files_count - skipped_files_count) + running < limit
+
+        parallel_items = resource_limits.parallel_items
+        if parallel_items > 1 and not (base_meta.get('unattended') or str(config['DEFAULT'].get('auto_mode', False)).lower() == "true"):
+            console.print("[yellow]queue_parallel_items needs unattended mode, processing the queue one item at a time[/yellow]")
+            parallel_items = 1
+
+        if parallel_items > 1 and len(queue_list) > 1:
+            console.print(f"[cyan]Processing up to {parallel_items} queue items in parallel[/cyan]")
+            resource_limits.start()
+            cleanup_manager.deferred = True
+            try:
+                await QueueManager.run_queue_items(
+                    queue_list,
+                    process_queue_item,
+                    max_parallel=parallel_items,
+                    # Disc parsing still depends on the process working directory
+                    is_exclusive=lambda item: QueueManager.is_disc_path(queue_item_path(item)),
+                    can_start=limit_allows_start,
+                )
+            finally:
+                resource_limits.stop()
+                cleanup_manager.deferred = False
+                await cleanup_manager.cleanup()
+        else:
+            for queue_item in queue_list:
+                if await process_queue_item(queue_item):
+                    break
 
     except Exception as e:
         console.print(f"[bold red]An unexpected error occurred: {e}")
@@ -1862,12 +2028,14 @@ async def do_the_thing(base_dir: str) -> None:
         cleanup_manager.reset_terminal()
 
     finally:
-        if bot is not None:
+        for bot, connect_task in discord_sessions:
             await bot.close()
-        if connect_task is not None:
             connect_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await connect_task
+        # The pools live for the whole run; mid-run cleanup() calls leave them open
+        with contextlib.suppress(Exception):
+            await http_client_manager.aclose()
         if not sys.stdin.closed:
             cleanup_manager.reset_terminal()
 
@@ -1949,7 +2117,7 @@ async def process_cross_seeds(meta: Meta) -> None:
                 if tracker != "PTP":
                     dupes = await tracker_class.search_existing(meta, disctype)
                 else:
-                    ptp = PTP(config=config)
+                    ptp = tracker_class_map['PTP'](config=config)
                     group_id = meta.get('ptp_groupID')
                     if not group_id:
                         group_id = await ptp.get_group_by_imdb(meta['imdb'])
@@ -2023,7 +2191,7 @@ async def process_cross_seeds(meta: Meta) -> None:
 
         if tracker == "AR" and download_url:
             try:
-                ar = AR(config=config)
+                ar = tracker_class_map['AR'](config=config)
                 auth_key = await ar.get_auth_key(meta)
 
                 # Extract torrent_pass from announce_url
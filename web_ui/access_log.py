@@ -1,6 +1,24 @@
+"""Web UI access log.
+
+Records are JSON lines in ``access_log.log``. A background thread appends them
+in batches, and rotates the file into a gzip archive once it reaches
+``UA_WEBUI_ACCESS_LOG_MAX_MB`` or its oldest record is
+``UA_WEBUI_ACCESS_LOG_ROTATE_DAYS`` old, keeping ``UA_WEBUI_ACCESS_LOG_BACKUPS``
+archives. An in-memory index of the live file (offset, time, endpoint and
+status per line) lets ``tail`` filter and read just the lines it returns;
+archives are only opened when the live file doesn't hold enough matches.
+"""
 from __future__ import annotations
 
+import atexit
+import bisect
+import gzip
 import json
+import os
+import queue
+import shutil
+import threading
+import time
 from contextlib import suppress
 from datetime import datetime, timezone
 from pathlib import Path
@@ -9,6 +27,74 @@ from typing import Any, Optional
 DEFAULT_LEVEL = "access_denied"  # default: log only failed/denied attempts
 VALID_LEVELS = {"access_denied", "access", "disabled"}
 
+DEFAULT_MAX_MB = 10
+DEFAULT_ROTATE_DAYS = 7
+DEFAULT_BACKUPS = 5
+# The writer waits this long after the first queued record to batch up more
+BATCH_WINDOW_SECONDS = 0.25
+ARCHIVE_TIME_FORMAT = "%Y%m%dT%H%M%S"
+# Records are timestamped before they reach the writer, so the file is only nearly sorted by time
+TIME_SLACK_SECONDS = 1.0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _record_time(record: dict[str, Any]) -> float:
+    try:
+        return datetime.fromisoformat(str(record.get("timestamp"))).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, ...]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class AccessLogFilter:
+    """Matches records by endpoint prefix, status (``403`` or a class such as ``4xx``) and time range (epoch seconds)."""
+
+    def __init__(self, endpoint: Optional[str] = None, status: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None) -> None:
+        self.endpoint = endpoint or None
+        self.status = (status or "").strip().lower() or None
+        if self.status is not None and not (self.status.isdigit() or (len(self.status) == 3 and self.status[0].isdigit() and self.status[1:] == "xx")):
+            raise ValueError("status must be a code such as 403 or a class such as 4xx")
+        self.since = since
+        self.until = until
+
+    def matches(self, when: float, endpoint: str, status: int) -> bool:
+        if self.since is not None and when < self.since:
+            return False
+        if self.until is not None and when > self.until:
+            return False
+        if self.endpoint is not None and not endpoint.startswith(self.endpoint):
+            return False
+        if self.status is not None:
+            if self.status.endswith("xx"):
+                return status // 100 == int(self.status[0])
+            return status == int(self.status)
+        return True
+
+    def matches_record(self, record: dict[str, Any]) -> bool:
+        try:
+            status = int(record.get("status") or 0)
+        except (TypeError, ValueError):
+            status = 0
+        return self.matches(_record_time(record), str(record.get("endpoint") or ""), status)
+
+    def overlaps(self, first: float, last: float) -> bool:
+        if self.since is not None and last + TIME_SLACK_SECONDS < self.since:
+            return False
+        return not (self.until is not None and first - TIME_SLACK_SECONDS > self.until)
+
 
 class AccessLogger:
     def __init__(self, cfg_dir: Path) -> None:
@@ -17,10 +103,31 @@ class AccessLogger:
         # store access level inside webui_auth.json per request
         self.user_file = self.cfg_dir / "webui_auth.json"
         self.log_file = self.cfg_dir / "access_log.log"
+        self.max_bytes = int(_env_number("UA_WEBUI_ACCESS_LOG_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024)
+        self.rotate_seconds = _env_number("UA_WEBUI_ACCESS_LOG_ROTATE_DAYS", DEFAULT_ROTATE_DAYS) * 86400
+        self.backups = max(0, int(_env_number("UA_WEBUI_ACCESS_LOG_BACKUPS", DEFAULT_BACKUPS)))
+        # The level is read on every request; re-read it only when the user file changes
+        self._level: tuple[Optional[tuple[int, ...]], str] = (None, DEFAULT_LEVEL)
+        # Guards the log file and its index
+        self._lock = threading.Lock()
+        self._indexed: Optional[tuple[int, int]] = None  # (inode, size) the index covers
+        self._offsets: list[int] = []
+        self._times: list[float] = []
+        self._endpoints: list[str] = []
+        self._statuses: list[int] = []
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._pending = 0
+        self._written = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
 
     def get_level(self) -> str:
+        signature = _file_signature(self.user_file)
+        cached_signature, cached_level = self._level
+        if signature is not None and signature == cached_signature:
+            return cached_level
+        level = DEFAULT_LEVEL
         try:
-            if self.user_file.exists():
+            if signature is not None:
                 try:
                     doc = json.loads(self.user_file.read_text(encoding="utf-8"))
                 except Exception:
@@ -28,10 +135,11 @@ class AccessLogger:
                 if isinstance(doc, dict):
                     txt = doc.get("access_log_level")
                     if isinstance(txt, str) and txt in VALID_LEVELS:
-                        return txt
+                        level = txt
         except Exception:
             pass
-        return DEFAULT_LEVEL
+        self._level = (signature, level)
+        return level
 
     def set_level(self, level: str) -> bool:
         if level not in VALID_LEVELS:
@@ -49,6 +157,7 @@ class AccessLogger:
             data["access_log_level"] = level
             # write back safely
             self.user_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            self._level = (_file_signature(self.user_file), level)
             return True
         except Exception:
             return False
@@ -149,25 +258,219 @@ class AccessLogger:
                 if record.get("user") is not None:
                     record["user"] = "<REDACTED>"
 
-            # Append as JSON line
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._enqueue(json.dumps(record, ensure_ascii=False) + "\n")
         except Exception:
             # Best-effort logging: swallow errors
             pass
 
-    def tail(self, n: int = 200) -> list[dict[str, Any]]:
+
+    # --- writer -----------------------------------------------------------------
+
+    def _enqueue(self, line: str) -> None:
+        with self._written:
+            self._pending += 1
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="webui-access-log", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        self._queue.put(line)
+
+    def _write_loop(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            time.sleep(BATCH_WINDOW_SECONDS)
+            # This thread is the only consumer, so a non-empty queue can't run dry under it
+            while not self._queue.empty():
+                lines.append(self._queue.get_nowait())
+            # Best-effort logging: a batch that can't be written is dropped
+            with suppress(Exception):
+                self._write(lines)
+            with self._written:
+                self._pending -= len(lines)
+                self._written.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every record logged so far is on disk."""
+        with self._written:
+            self._written.wait_for(lambda: self._pending <= 0, timeout)
+
+    def _write(self, lines: list[str]) -> None:
+        with self._lock:
+            self._sync_index()
+            with open(self.log_file, "ab") as f:
+                offset = f.tell()
+                for line in lines:
+                    data = line.encode("utf-8")
+                    f.write(data)
+                    self._index_line(offset, data)
+                    offset += len(data)
+            self._indexed = (os.stat(self.log_file).st_ino, offset)
+            oldest = self._times[0] if self._times else 0.0
+            if offset >= self.max_bytes or (oldest and time.time() - oldest >= self.rotate_seconds):
+                self._rotate()
+
+    # --- index --------------------------------------------------------------------
+
+    def _reset_index(self) -> None:
+        self._indexed = None
+        self._offsets = []
+        self._times = []
+        self._endpoints = []
+        self._statuses = []
+
+    def _index_line(self, offset: int, data: bytes) -> None:
+        try:
+            record = json.loads(data)
+            status = int(record.get("status") or 0)
+        except (ValueError, TypeError, AttributeError):
+            return
+        self._offsets.append(offset)
+        self._times.append(_record_time(record))
+        self._endpoints.append(str(record.get("endpoint") or ""))
+        self._statuses.append(status)
+
+    def _sync_index(self) -> None:
+        """Index the live file; only lines added since the last call are read, unless the file was replaced."""
+        # Called with self._lock held
+        try:
+            st = os.stat(self.log_file)
+        except OSError:
+            self._reset_index()
+            return
+        if self._indexed is not None and self._indexed[0] == st.st_ino and self._indexed[1] <= st.st_size:
+            start = self._indexed[1]
+        else:
+            self._reset_index()
+            start = 0
+        if start == st.st_size:
+            self._indexed = (st.st_ino, start)
+            return
+        offset = start
+        with open(self.log_file, "rb") as f:
+            f.seek(start)
+            for data in f:
+                if not data.endswith(b"\n"):
+                    # A partial last line is picked up once it is complete
+                    break
+                self._index_line(offset, data)
+                offset += len(data)
+        self._indexed = (st.st_ino, offset)
+
+    # --- rotation -------------------------------------------------------------------
+
+    def _archives(self) -> list[tuple[Path, float, float]]:
+        """Archived logs, newest first, with the time span each one covers."""
+        found: list[tuple[tuple[float, float, int], Path]] = []
+        for path in self.cfg_dir.glob("access_log.*.log.gz"):
+            try:
+                first, rest = path.name[len("access_log."):-len(".log.gz")].split("-", 1)
+                # A rotation that collides with an existing name gets a ".<counter>" suffix
+                last, _, counter = rest.partition(".")
+                key = (
+                    datetime.strptime(last, ARCHIVE_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp(),
+                    datetime.strptime(first, ARCHIVE_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp(),
+                    int(counter) if counter else 0,
+                )
+            except ValueError:
+                continue
+            found.append((key, path))
+        # By time, then by collision counter; the file name alone puts "<name>.1" ahead of "<name>"
+        found.sort(key=lambda item: item[0], reverse=True)
+        return [(path, first, last) for (last, first, _counter), path in found]
+
+    def _rotate(self) -> None:
+        # Called with self._lock held
+        now = time.time()
+        first = self._times[0] if self._times else now
+        last = max(self._times) if self._times else now
+
+        def stamp(when: float) -> str:
+            return datetime.fromtimestamp(when, timezone.utc).strftime(ARCHIVE_TIME_FORMAT)
+
+        name = f"access_log.{stamp(first)}-{stamp(last)}"
+        archive = self.cfg_dir / f"{name}.log.gz"
+        counter = 1
+        while archive.exists():
+            archive = self.cfg_dir / f"{name}.{counter}.log.gz"
+            counter += 1
+        partial = archive.with_name(archive.name + ".tmp")
+        with open(self.log_file, "rb") as src, gzip.open(partial, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(partial, archive)
+        os.remove(self.log_file)
+        self._reset_index()
+        for path, _first, _last in self._archives()[self.backups:]:
+            with suppress(OSError):
+                path.unlink()
+
+    # --- reading --------------------------------------------------------------------
+
+    def _read_live(self, n: int, flt: Optional[AccessLogFilter]) -> list[dict[str, Any]]:
+        """Up to ``n`` newest matching records of the live file, newest first."""
+        # Called with self._lock held and the index in sync
+        if not self._offsets:
+            return []
+        if flt is None:
+            # The last n lines are one contiguous read
+            start = self._offsets[max(0, len(self._offsets) - n)]
+            with open(self.log_file, "rb") as f:
+                f.seek(start)
+                data = f.read(self._indexed[1] - start if self._indexed else -1)
+            out: list[dict[str, Any]] = []
+            for line in reversed(data.splitlines()):
+                with suppress(ValueError):
+                    out.append(json.loads(line))
+            return out[:n]
+        lo, hi = 0, len(self._times)
+        if flt.since is not None:
+            lo = bisect.bisect_left(self._times, flt.since - TIME_SLACK_SECONDS)
+        if flt.until is not None:
+            hi = bisect.bisect_right(self._times, flt.until + TIME_SLACK_SECONDS)
+        picked: list[int] = []
+        for i in range(hi - 1, lo - 1, -1):
+            if flt.matches(self._times[i], self._endpoints[i], self._statuses[i]):
+                picked.append(self._offsets[i])
+                if len(picked) >= n:
+                    break
+        out = []
+        with open(self.log_file, "rb") as f:
+            for offset in picked:
+                f.seek(offset)
+                with suppress(ValueError):
+                    out.append(json.loads(f.readline()))
+        return out
+
+    def _read_archives(self, n: int, flt: Optional[AccessLogFilter]) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for path, first, last in self._archives():
+            if flt is not None and not flt.overlaps(first, last):
+                continue
+            try:
+                with gzip.open(path, "rb") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            for line in reversed(lines):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if flt is None or flt.matches_record(record):
+                    out.append(record)
+                    if len(out) >= n:
+                        return out
+        return out
+
+    def tail(self, n: int = 200, flt: Optional[AccessLogFilter] = None) -> list[dict[str, Any]]:
+        """The newest ``n`` records (matching ``flt``), oldest first."""
         try:
-            if not self.log_file.exists():
-                return []
-            # Read last n lines (simple approach)
-            with open(self.log_file, encoding="utf-8") as f:
-                lines = f.read().splitlines()
-            lines = lines[-n:]
-            out = []
-            for ln in lines:
-                with suppress(Exception):
-                    out.append(json.loads(ln))
+            self.flush(timeout=2.0)
+            with self._lock:
+                self._sync_index()
+                out = self._read_live(n, flt)
+                if len(out) < n:
+                    out.extend(self._read_archives(n - len(out), flt))
+            out.reverse()
             return out
         except Exception:
             return []
@@ -4,16 +4,21 @@ Provides:
 - Argon2 password hashing/verification for a single local user
 - Session secret loading (env/file) and AES-GCM key derivation
 - AES-GCM encrypt/decrypt helpers that return base64 payloads
-- File-backed user and credential storage under XDG config dir
+- File-backed user and credential storage under XDG config dir, decrypted once
+  per version of the file and cached in memory
 """
 from __future__ import annotations
 
 import base64
+import copy
+import hashlib
+import hmac
 import json
 import logging
 import math
 import os
 import string
+import threading
 from contextlib import suppress
 from pathlib import Path
 from typing import Optional
@@ -400,12 +405,124 @@ def create_user(username: str, password: str) -> None:
     path.write_text(json.dumps(data), encoding="utf-8")
     with suppress(Exception):
         os.chmod(path, 0o600)
+    _user_cache.clear()
 
 
-def load_user() -> Optional[dict]:
-    path = _get_user_file()
-    if not path.exists():
+def _file_signature(path: Path) -> Optional[tuple[int, ...]]:
+    """Identify one version of a file: any rewrite or replacement changes the signature."""
+    try:
+        st = os.stat(path)
+    except OSError:
         return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class _UserCache:
+    """Decrypted contents of the user file, reused until the file changes on disk.
+
+    Every authenticated request looks up the user and API tokens, so the file is
+    read and the extras blob decrypted once per version of the file (detected by
+    its stat signature) instead of once per call. Encrypted fields are decrypted
+    on first use, and writes made through this module update the cache directly.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Resolving the config dir probes the container environment, so do it once
+        self._path: Optional[Path] = None
+        self._signature: Optional[tuple[int, ...]] = None
+        self._user: Optional[dict] = None
+        self._fields: dict[str, Optional[str]] = {}
+        self._tokens: Optional[dict] = None
+        self._token_index: dict[bytes, str] = {}
+
+    def _reset(self) -> None:
+        self._signature = None
+        self._user = None
+        self._fields = {}
+        self._tokens = None
+        self._token_index = {}
+
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = _get_user_file()
+        return self._path
+
+    def _current(self) -> Optional[dict]:
+        # Called with self._lock held
+        path = self.path()
+        # Stat before reading: a write racing the read then shows up as a new signature next time
+        signature = _file_signature(path)
+        if signature is None:
+            self._reset()
+            return None
+        if signature != self._signature:
+            self._reset()
+            user = _read_user(path)
+            if user is not None:
+                self._signature = signature
+                self._user = user
+            return user
+        return self._user
+
+    def _field_value(self, name: str) -> Optional[str]:
+        # Called with self._lock held and a current user
+        if name not in self._fields:
+            self._fields[name] = _unpack_field((self._user or {}).get("extras") or {}, name)
+        return self._fields[name]
+
+    def user(self) -> Optional[dict]:
+        with self._lock:
+            user = self._current()
+            return copy.deepcopy(user) if user is not None else None
+
+    def field(self, name: str) -> tuple[Optional[str], dict]:
+        """The decrypted per-field value and the extras dict it came from."""
+        with self._lock:
+            user = self._current()
+            if user is None:
+                return None, {}
+            return self._field_value(name), copy.deepcopy(user.get("extras") or {})
+
+    def find_token(self, token: str) -> Optional[dict]:
+        with self._lock:
+            if self._current() is None:
+                return None
+            if self._tokens is None:
+                self._tokens = _decode_api_tokens(self._field_value("api_tokens"), (self._user or {}).get("extras") or {})
+                self._token_index = {hashlib.sha256(key.encode("utf-8")).digest(): key for key in self._tokens}
+            stored = self._token_index.get(hashlib.sha256(token.encode("utf-8")).digest())
+            # The index is keyed by digest; confirm the token itself in constant time
+            if stored is None or not hmac.compare_digest(stored.encode("utf-8"), token.encode("utf-8")):
+                return None
+            info = self._tokens.get(stored)
+            return dict(info) if isinstance(info, dict) else None
+
+    def write_through(self, read_signature: Optional[tuple[int, ...]], raw: dict, extras: dict, field: str, plaintext: Optional[str]) -> None:
+        """Record a field just written to the user file without reading it back."""
+        with self._lock:
+            previous = self._user
+            fresh = previous is not None and read_signature is not None and read_signature == self._signature
+            signature = _file_signature(self.path())
+            if signature is None or previous is None or "username" not in previous:
+                self._reset()
+                return
+            user = dict(raw)
+            user["extras"] = extras
+            user["username"] = previous["username"]
+            # Other decrypted fields carry over only if the cache matched the file the write started from
+            fields = self._fields if fresh else {}
+            self._reset()
+            self._signature = signature
+            self._user = user
+            self._fields = {**fields, field: plaintext}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+def _read_user(path: Path) -> Optional[dict]:
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
@@ -448,22 +565,18 @@ def load_user() -> Optional[dict]:
     return data
 
 
-def get_totp_secret() -> Optional[str]:
-    u = load_user()
-    if not u:
-        return None
-    extras = u.get("extras") or {}
-    # Use per-field unpack
-    val = _unpack_field(extras, "totp_secret")
-    if val is not None:
-        return val
-    # Backwards compat: older code may have totp_secret in extras dict directly
-    return extras.get("totp_secret")
+_user_cache = _UserCache()
 
 
-def set_totp_secret(secret: Optional[str]) -> None:
+def load_user() -> Optional[dict]:
+    return _user_cache.user()
+
+
+def _write_field(field: str, plaintext: Optional[str]) -> None:
+    """Re-encrypt one per-field value into the user file."""
     # Read raw file, update extras, re-encrypt
     path = _get_user_file()
+    read_signature = _file_signature(path)
     if path.exists():
         try:
             raw = json.loads(path.read_text(encoding="utf-8"))
@@ -481,23 +594,32 @@ def set_totp_secret(secret: Optional[str]) -> None:
             raise EncryptionError("failed to decrypt existing extras_enc; aborting write to preserve data")
         extras = json.loads(dec)
 
-    # Pack/unpack with per-field keys
     # Pack/unpack with per-field keys; let encryption errors propagate
-    _pack_field(extras, "totp_secret", secret)
+    _pack_field(extras, field, plaintext)
 
     key = _get_master_key()
     raw["extras_enc"] = encrypt_text(key, json.dumps(extras, separators=(",",":"), ensure_ascii=False))
     path.write_text(json.dumps(raw), encoding="utf-8")
     with suppress(Exception):
         os.chmod(path, 0o600)
+    _user_cache.write_through(read_signature, raw, extras, field, plaintext)
+
+
+def get_totp_secret() -> Optional[str]:
+    # Use per-field unpack
+    val, extras = _user_cache.field("totp_secret")
+    if val is not None:
+        return val
+    # Backwards compat: older code may have totp_secret in extras dict directly
+    return extras.get("totp_secret")
+
+
+def set_totp_secret(secret: Optional[str]) -> None:
+    _write_field("totp_secret", secret)
 
 
 def get_recovery_hashes() -> list[str]:
-    u = load_user()
-    if not u:
-        return []
-    extras = u.get("extras") or {}
-    val = _unpack_field(extras, "recovery_hashes")
+    val, extras = _user_cache.field("recovery_hashes")
     if val is not None:
         try:
             parsed = json.loads(val)
@@ -510,39 +632,10 @@ def get_recovery_hashes() -> list[str]:
 
 
 def set_recovery_hashes(hashes: list[str]) -> None:
-    path = _get_user_file()
-    if path.exists():
-        try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            raise OSError("failed to read existing user file; aborting to avoid overwriting encrypted data") from None
-    else:
-        raw = {}
-    extras = {}
-    extras_enc = raw.get("extras_enc")
-    if extras_enc:
-        # If an encrypted extras blob exists, require successful decryption
-        key = derive_aes_key(load_session_secret())
-        dec = decrypt_text(key, extras_enc)
-        if not dec:
-            raise EncryptionError("failed to decrypt existing extras_enc; aborting write to preserve data")
-        extras = json.loads(dec)
-
-    _pack_field(extras, "recovery_hashes", json.dumps(hashes, separators=(",",":"), ensure_ascii=False))
-
-    key = _get_master_key()
-    raw["extras_enc"] = encrypt_text(key, json.dumps(extras, separators=(",",":"), ensure_ascii=False))
-    path.write_text(json.dumps(raw), encoding="utf-8")
-    with suppress(Exception):
-        os.chmod(path, 0o600)
+    _write_field("recovery_hashes", json.dumps(hashes, separators=(",",":"), ensure_ascii=False))
 
 
-def get_api_tokens() -> dict:
-    u = load_user()
-    if not u:
-        return {}
-    extras = u.get("extras") or {}
-    val = _unpack_field(extras, "api_tokens")
+def _decode_api_tokens(val: Optional[str], extras: dict) -> dict:
     if val is not None:
         try:
             parsed = json.loads(val)
@@ -553,32 +646,20 @@ def get_api_tokens() -> dict:
     return extras.get("api_tokens") or {}
 
 
-def set_api_tokens(store: dict) -> None:
-    path = _get_user_file()
-    if path.exists():
-        try:
-            raw = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            raise OSError("failed to read existing user file; aborting to avoid overwriting encrypted data") from None
-    else:
-        raw = {}
-    extras = {}
-    extras_enc = raw.get("extras_enc")
-    if extras_enc:
-        # If an encrypted extras blob exists, require successful decryption
-        key = derive_aes_key(load_session_secret())
-        dec = decrypt_text(key, extras_enc)
-        if not dec:
-            raise EncryptionError("failed to decrypt existing extras_enc; aborting write to preserve data")
-        extras = json.loads(dec)
+def get_api_tokens() -> dict:
+    val, extras = _user_cache.field("api_tokens")
+    return _decode_api_tokens(val, extras)
 
-    _pack_field(extras, "api_tokens", json.dumps(store, separators=(",",":"), ensure_ascii=False))
 
-    key = _get_master_key()
-    raw["extras_enc"] = encrypt_text(key, json.dumps(extras, separators=(",",":"), ensure_ascii=False))
-    path.write_text(json.dumps(raw), encoding="utf-8")
-    with suppress(Exception):
-        os.chmod(path, 0o600)
+def find_api_token(token: str) -> Optional[dict]:
+    """Stored metadata for an API token, or None; the lookup doesn't compare token strings directly."""
+    if not token:
+        return None
+    return _user_cache.find_token(token)
+
+
+def set_api_tokens(store: dict) -> None:
+    _write_field("api_tokens", json.dumps(store, separators=(",",":"), ensure_ascii=False))
 
 
 def verify_user(username: str, password: str) -> bool:
@@ -0,0 +1,124 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""Sequence-numbered console output for the execute stream.
+
+Every chunk of an upload's console output is rendered once, stored with an
+increasing sequence number and sent to the browser as its own SSE event whose
+``id:`` is that number. Each session keeps its most recent chunks in a bounded
+ring buffer, so a client that lost the connection can reattach through
+``/api/execute/stream`` with ``Last-Event-ID`` and receive only what it missed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from typing import Optional
+
+# Chunks kept per session for reconnecting clients (UA_WEBUI_STREAM_BUFFER overrides)
+DEFAULT_BUFFER_CHUNKS = 5000
+# Finished sessions kept around for late reconnects
+MAX_STREAMS = 16
+KEEPALIVE_SECONDS = 0.5
+
+# Rich export template for one chunk: the inline-styled spans in a margin-less <pre>,
+# so consecutive chunks line up like a single console
+CHUNK_HTML_FORMAT = (
+    "<pre style=\"font-family:Menlo,'DejaVu Sans Mono',consolas,'Courier New',monospace;margin:0\">"
+    "<code style=\"font-family:inherit\">{code}</code></pre>"
+)
+
+
+def _buffer_chunks() -> int:
+    try:
+        return max(100, int(os.environ.get("UA_WEBUI_STREAM_BUFFER", DEFAULT_BUFFER_CHUNKS)))
+    except ValueError:
+        return DEFAULT_BUFFER_CHUNKS
+
+
+def sse_event(payload: dict[str, object], event_id: Optional[int] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+
+def parse_event_id(value: Optional[str]) -> int:
+    try:
+        return max(0, int(str(value).strip()))
+    except (TypeError, ValueError):
+        return 0
+
+
+class ConsoleStream:
+    def __init__(self, max_chunks: Optional[int] = None) -> None:
+        self._chunks: deque[tuple[int, str, str]] = deque(maxlen=max_chunks or _buffer_chunks())
+        self._cond = threading.Condition()
+        self.last_seq = 0
+        self.finished = False
+        self.exit_code: Optional[int] = None
+
+    def append(self, html: str, origin: str = "console") -> int:
+        """Store a rendered chunk and wake the readers; returns its sequence number."""
+        with self._cond:
+            self.last_seq += 1
+            self._chunks.append((self.last_seq, html, origin))
+            self._cond.notify_all()
+            return self.last_seq
+
+    def finish(self, exit_code: Optional[int] = None) -> None:
+        with self._cond:
+            if not self.finished:
+                self.finished = True
+                self.exit_code = exit_code
+            self._cond.notify_all()
+
+    def since(self, seq: int) -> tuple[list[tuple[int, str, str]], int]:
+        """Chunks after ``seq``, and how many of them already fell out of the buffer."""
+        with self._cond:
+            chunks = [chunk for chunk in self._chunks if chunk[0] > seq]
+            first_kept = self._chunks[0][0] if self._chunks else self.last_seq + 1
+            return chunks, max(0, first_kept - seq - 1)
+
+    def events(self, last_seq: int = 0) -> Iterator[str]:
+        """SSE events for every chunk after ``last_seq``, live until the run finishes."""
+        while True:
+            chunks, dropped = self.since(last_seq)
+            if dropped:
+                yield sse_event({"type": "gap", "dropped": dropped})
+            for seq, html, origin in chunks:
+                yield sse_event({"type": "html_delta", "seq": seq, "data": html, "origin": origin}, seq)
+                last_seq = seq
+            with self._cond:
+                if self.finished and last_seq >= self.last_seq:
+                    break
+                # Chunks appended between since() and here are picked up without waiting
+                woke = self.last_seq > last_seq or self._cond.wait(KEEPALIVE_SECONDS)
+            if not woke:
+                yield sse_event({"type": "keepalive"})
+        if self.exit_code is not None:
+            yield sse_event({"type": "exit", "code": self.exit_code})
+
+
+class ConsoleStreams:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._streams: OrderedDict[str, ConsoleStream] = OrderedDict()
+
+    def create(self, session_id: str) -> ConsoleStream:
+        stream = ConsoleStream()
+        with self._lock:
+            previous = self._streams.pop(session_id, None)
+            if previous is not None:
+                previous.finish()
+            self._streams[session_id] = stream
+            finished = [key for key, value in self._streams.items() if value.finished]
+            for key in finished[:max(0, len(self._streams) - MAX_STREAMS)]:
+                del self._streams[key]
+        return stream
+
+    def get(self, session_id: str) -> Optional[ConsoleStream]:
+        with self._lock:
+            return self._streams.get(session_id)
+
+
+console_streams = ConsoleStreams()
@@ -0,0 +1,283 @@
+# Upload Assistant © 2025 Audionut & wastaken7 — Licensed under UAPL v1.0
+"""Upload jobs for the Web UI.
+
+Every upload started from the Web UI is a job: ``upload.py`` in its own worker
+process, with stdin as the job's input channel and its console output rendered
+into the session's ``ConsoleStream``. Jobs run in parallel up to
+``UA_WEBUI_MAX_JOBS``; beyond that, or while the machine is short of memory or
+CPU, new jobs wait in a FIFO queue and start as soon as there is room. A job
+keeps running when its browser disconnects and can be reattached, listed and
+cancelled by its session id.
+"""
+from __future__ import annotations
+
+import codecs
+import contextlib
+import html
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import psutil
+
+from web_ui.console_stream import ConsoleStream
+
+DEFAULT_MAX_JOBS = 2
+# Admission thresholds for starting a job next to ones already running
+DEFAULT_MIN_FREE_MB = 1024
+DEFAULT_MAX_LOAD = 1.0  # 1-minute load average per CPU
+# Finished jobs kept for the job list
+MAX_FINISHED_JOBS = 50
+# A partial line (e.g. an input prompt) is shown after this much silence
+PARTIAL_LINE_FLUSH_SECONDS = 0.2
+ADMISSION_RECHECK_SECONDS = 2.0
+
+ACTIVE_STATES = ("queued", "running")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class Job:
+    def __init__(self, job_id: str, path: str, command: list[str], cwd: str, env: dict[str, str], stream: ConsoleStream) -> None:
+        self.id = job_id
+        self.path = path
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.stream = stream
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.process: Optional[subprocess.Popen[bytes]] = None
+        self.cancel_requested = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "path": self.path,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "ended": self.ended,
+            "returncode": self.returncode,
+            "pid": self.process.pid if self.process is not None else None,
+            "output_seq": self.stream.last_seq,
+        }
+
+
+class JobManager:
+    def __init__(self, render: Optional[Callable[[str], str]] = None) -> None:
+        self.render = render
+        self.max_jobs = max(1, int(_env_number("UA_WEBUI_MAX_JOBS", DEFAULT_MAX_JOBS)))
+        self.min_free_bytes = int(_env_number("UA_WEBUI_JOB_MIN_FREE_MB", DEFAULT_MIN_FREE_MB) * 1024 * 1024)
+        self.max_load = _env_number("UA_WEBUI_JOB_MAX_LOAD", DEFAULT_MAX_LOAD)
+        self._cond = threading.Condition()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: list[Job] = []
+        self._running: set[Job] = set()
+        self._scheduler: Optional[threading.Thread] = None
+
+    # --- submission and lookup -------------------------------------------------
+
+    def submit(self, job_id: str, path: str, command: list[str], cwd: str, env: dict[str, str], stream: ConsoleStream) -> Job:
+        """Queue an upload; raises ValueError if the same content is already being uploaded."""
+        job = Job(job_id, path, command, cwd, env, stream)
+        with self._cond:
+            normalized = os.path.normcase(os.path.abspath(path))
+            for other in self._jobs.values():
+                if other.status in ACTIVE_STATES and os.path.normcase(os.path.abspath(other.path)) == normalized:
+                    raise ValueError(f"An upload of this path is already {other.status} (job {other.id})")
+            # A reused id replaces the finished job of that name
+            self._jobs.pop(job_id, None)
+            self._jobs[job_id] = job
+            self._queue.append(job)
+            self._prune()
+            self._admit()
+            self._ensure_scheduler()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[dict[str, Any]]:
+        with self._cond:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def queue_position(self, job_id: str) -> int:
+        """Jobs ahead of this one in the queue, or -1 when it isn't queued."""
+        with self._cond:
+            for index, job in enumerate(self._queue):
+                if job.id == job_id:
+                    return index
+            return -1
+
+    def running_count(self) -> int:
+        with self._cond:
+            return len(self._running)
+
+    def send_input(self, job_id: str, text: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.process is None or job.process.poll() is not None or job.process.stdin is None:
+            return False
+        job.process.stdin.write((text + "\n").encode("utf-8"))
+        job.process.stdin.flush()
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False when there is nothing to cancel."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ACTIVE_STATES:
+                return False
+            job.cancel_requested = True
+            if job.status == "queued":
+                self._queue.remove(job)
+                self._finish(job, "cancelled", None)
+                return True
+            process = job.process
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return True
+
+    # --- scheduling ---------------------------------------------------------------
+
+    def _has_headroom(self) -> bool:
+        if len(self._running) >= self.max_jobs:
+            return False
+        if not self._running:
+            # A lone job always starts, whatever the machine looks like
+            return True
+        try:
+            if psutil.virtual_memory().available < self.min_free_bytes:
+                return False
+            load_per_cpu = psutil.getloadavg()[0] / max(1, psutil.cpu_count() or 1)
+            return load_per_cpu < self.max_load
+        except Exception:
+            return True
+
+    def _ensure_scheduler(self) -> None:
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._scheduler = threading.Thread(target=self._schedule, name="webui-job-scheduler", daemon=True)
+            self._scheduler.start()
+
+    def _admit(self) -> None:
+        # Called with self._cond held: start queued jobs, oldest first, while there is room
+        while self._queue and self._has_headroom():
+            job = self._queue.pop(0)
+            job.status = "running"
+            job.started = time.time()
+            self._running.add(job)
+            threading.Thread(target=self._run, args=(job,), name=f"webui-job-{job.id}", daemon=True).start()
+
+    def _schedule(self) -> None:
+        with self._cond:
+            while True:
+                self._admit()
+                # Woken when a job ends; re-checks admission periodically while jobs wait on resources
+                self._cond.wait(ADMISSION_RECHECK_SECONDS if self._queue else None)
+
+    def _finish(self, job: Job, status: str, returncode: Optional[int]) -> None:
+        # Called with self._cond held
+        job.status = status
+        job.returncode = returncode
+        job.ended = time.time()
+        self._running.discard(job)
+        job.stream.finish(returncode)
+        self._cond.notify_all()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE_STATES]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    # --- worker process -------------------------------------------------------------
+
+    def _emit(self, job: Job, text: str) -> None:
+        if not text:
+            return
+        fragment = None
+        if self.render is not None:
+            with contextlib.suppress(Exception):
+                fragment = self.render(text)
+        job.stream.append(fragment if fragment is not None else f"<pre>{html.escape(text)}</pre>")
+
+    def _run(self, job: Job) -> None:
+        returncode: Optional[int] = None
+        try:
+            job.process = subprocess.Popen(  # lgtm[py/command-line-injection]
+                job.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=job.cwd,
+                env=job.env,
+            )
+            if job.cancel_requested:
+                job.process.terminate()
+            self._pump_output(job, job.process)
+            returncode = job.process.wait()
+        except Exception as e:
+            self._emit(job, f"Failed to run upload: {e}\n")
+        finally:
+            if job.process is not None:
+                for pipe in (job.process.stdin, job.process.stdout):
+                    with contextlib.suppress(Exception):
+                        if pipe is not None:
+                            pipe.close()
+            with self._cond:
+                status = "cancelled" if job.cancel_requested else ("finished" if returncode == 0 else "failed")
+                self._finish(job, status, returncode)
+
+    def _pump_output(self, job: Job, process: subprocess.Popen[bytes]) -> None:
+        """Render the worker's output line by line; a trailing partial line (a prompt) is shown once output pauses."""
+        if process.stdout is None:
+            return
+        chunks: queue.Queue[bytes] = queue.Queue()
+        fd = process.stdout.fileno()
+
+        def read() -> None:
+            while True:
+                try:
+                    data = os.read(fd, 4096)
+                except OSError:
+                    data = b""
+                chunks.put(data)
+                if not data:
+                    return
+
+        threading.Thread(target=read, name=f"webui-job-{job.id}-stdout", daemon=True).start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while True:
+            try:
+                data = chunks.get(timeout=PARTIAL_LINE_FLUSH_SECONDS)
+            except queue.Empty:
+                if pending:
+                    self._emit(job, pending)
+                    pending = ""
+                continue
+            if not data:
+                break
+            pending += decoder.decode(data)
+            complete, newline, rest = pending.rpartition("\n")
+            if newline:
+                self._emit(job, complete + newline)
+                pending = rest
+        pending += decoder.decode(b"", final=True)
+        self._emit(job, pending)
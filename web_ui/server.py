@@ -41,14 +41,18 @@ except Exception:
     ansi_to_html = None
 
 from src.console import console
+from src.library_index import library_index, tokenize
+from web_ui.console_stream import CHUNK_HTML_FORMAT, console_streams, parse_event_id
+from web_ui.jobs import JobManager
 
 cfg_dir = auth_mod.get_config_dir()
 cfg_dir.mkdir(parents=True, exist_ok=True)
 
 # Access logging helper
 try:
-    from web_ui.access_log import AccessLogger
+    from web_ui.access_log import AccessLogFilter, AccessLogger
 except Exception:
+    AccessLogFilter = None
     AccessLogger = None
 
 access_logger = AccessLogger(cfg_dir) if AccessLogger is not None else None
@@ -492,12 +496,12 @@ SUPPORTED_VIDEO_EXTS = {'.mkv', '.mp4', '.ts'}
 # Supported description file extensions for WebUI description file browser
 SUPPORTED_DESC_EXTS = {'.txt', '.nfo', '.md'}
 
-# Regex for splitting filenames on common separators (dots, dashes, underscores, spaces)
-_BROWSE_SEARCH_SEP_RE = re.compile(r'[\s.\-_]+')
-
 # Lock to prevent concurrent in-process uploads (avoids cross-session interference)
 inproc_lock = threading.Lock()
 
+# Worker-process upload jobs started from /api/execute
+job_manager = JobManager(ansi_to_html)
+
 # Runtime browse roots (set by upload.py when starting web UI)
 _runtime_browse_roots: Optional[str] = None
 
@@ -657,13 +661,9 @@ def _persist_existing_api_token(token: str, username: str, label: str = "") -> b
 def _verify_api_token(token: str) -> Optional[str]:
     if not token:
         return None
-    store = _load_token_store()
-    info = store.get(token)
+    info = _get_token_info(token)
     if not info:
         return None
-    expiry = info.get("expiry")
-    if expiry and int(datetime.now(timezone.utc).timestamp()) > int(expiry):
-        return None
     return str(info.get("user"))
 
 
@@ -671,8 +671,10 @@ def _get_token_info(token: str) -> Optional[dict[str, Any]]:
     """Return stored token info dict or None."""
     if not token:
         return None
-    store = _load_token_store()
-    info = store.get(token)
+    try:
+        info = auth_mod.find_api_token(token)
+    except Exception:
+        return None
     if not info:
         return None
     expiry = info.get("expiry")
@@ -1122,6 +1124,7 @@ def set_runtime_browse_roots(browse_roots: str) -> None:
     """Set browse roots at runtime (used by upload.py when starting web UI)"""
     global _runtime_browse_roots
     _runtime_browse_roots = browse_roots
+    library_index.warm(_get_browse_roots())
 
 
 def _load_config_from_file(path: Path) -> dict[str, Any] | None:
@@ -2215,8 +2218,32 @@ def access_log_entries_api():
     except (ValueError, TypeError):
         n = 50
 
+    def _time_arg(name: str) -> Optional[float]:
+        # Epoch seconds or an ISO 8601 timestamp (UTC when no offset is given)
+        raw = (request.args.get(name) or "").strip()
+        if not raw:
+            return None
+        with contextlib.suppress(ValueError):
+            return float(raw)
+        when = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.timestamp()
+
     try:
-        entries = access_logger.tail(n)
+        flt = None
+        if any(request.args.get(k) for k in ("endpoint", "status", "since", "until")):
+            flt = AccessLogFilter(
+                endpoint=request.args.get("endpoint"),
+                status=request.args.get("status"),
+                since=_time_arg("since"),
+                until=_time_arg("until"),
+            )
+    except ValueError as e:
+        return jsonify({"success": False, "error": f"Invalid filter: {e}"}), 400
+
+    try:
+        entries = access_logger.tail(n, flt)
         return jsonify({"success": True, "entries": entries})
     except Exception:
         return jsonify({"success": False, "error": "Failed to read log entries"}), 500
@@ -2860,80 +2887,25 @@ def browse_search():
         return jsonify({"success": False, "error": "Browsing is not configured"}), 400
 
     # Split on common separators
-    query_tokens = [t for t in _BROWSE_SEARCH_SEP_RE.split(query.lower()) if t]
+    query_tokens = tokenize(query)
     if not query_tokens:
         return jsonify({"success": True, "items": [], "query": query})
 
-    def name_matches(name: str) -> bool:
-        """Check if query tokens appear as whole-word ordered subsequence in the name."""
-        name_tokens = [t for t in _BROWSE_SEARCH_SEP_RE.split(name.lower()) if t]
-        pos = 0
-        for qt in query_tokens:
-            found = False
-            while pos < len(name_tokens):
-                if name_tokens[pos] == qt:
-                    pos += 1
-                    found = True
-                    break
-                pos += 1
-            if not found:
-                return False
-        return True
-
     allowed_exts = SUPPORTED_DESC_EXTS if file_filter == "desc" else SUPPORTED_VIDEO_EXTS
     items: list[BrowseItem] = []
 
     try:
-        for root in roots:
-            root_abs = os.path.abspath(root)
-            if not os.path.isdir(root_abs):
-                continue
+        # Served from the persistent filename index instead of walking every root per query
+        for entry in library_index.search_tokens(roots, query_tokens):
+            if not entry.is_dir:
+                _, ext = os.path.splitext(entry.lower_name)
+                if ext not in allowed_exts:
+                    continue
             try:
-                for dirpath, dirnames, filenames in os.walk(root_abs):
-                    # Skip hidden dirs
-                    dirnames[:] = [d for d in dirnames if not d.startswith(".")]
-
-                    # Check dirs
-                    for dirname in dirnames:
-                        if name_matches(dirname):
-                            full_path = os.path.join(dirpath, dirname)
-                            try:
-                                _assert_safe_resolved_path(full_path)
-                            except ValueError:
-                                continue
-                            items.append({"name": dirname, "path": full_path, "type": "folder", "children": []})
-                            if len(items) >= max_results:
-                                break
-
-                    if len(items) >= max_results:
-                        break
-
-                    # Check files
-                    for filename in filenames:
-                        if filename.startswith("."):
-                            continue
-                        if not name_matches(filename):
-                            continue
-                        _, ext = os.path.splitext(filename.lower())
-                        if ext not in allowed_exts:
-                            continue
-                        full_path = os.path.join(dirpath, filename)
-                        try:
-                            _assert_safe_resolved_path(full_path)
-                        except ValueError:
-                            continue
-                        items.append({"name": filename, "path": full_path, "type": "file", "children": None})
-                        if len(items) >= max_results:
-                            break
-
-                    if len(items) >= max_results:
-                        break
-            except PermissionError:
-                continue
-            except Exception as e:
-                console.print(f"Error searching in {root}: {e}", markup=False)
+                _assert_safe_resolved_path(entry.path)
+            except ValueError:
                 continue
-
+            items.append({"name": entry.name, "path": entry.path, "type": "folder" if entry.is_dir else "file", "children": [] if entry.is_dir else None})
             if len(items) >= max_results:
                 break
 
@@ -3034,6 +3006,8 @@ def execute_command():
         session_id = data.get("session_id", "default")
         # If a previous run for this session left state behind, attempt to
         # terminate/cleanup it so the new execution starts with a clean slate.
+        with contextlib.suppress(Exception):
+            job_manager.cancel(session_id)
         with contextlib.suppress(Exception):
             existing = active_processes.pop(session_id, None)
             if existing:
@@ -3048,6 +3022,9 @@ def execute_command():
             return jsonify({"error": "Missing path", "success": False}), 400
 
         def generate():
+            stream = console_streams.create(session_id)
+            # Set when the client goes away while an in-process run continues; the run then finishes the stream itself
+            detached = False
             try:
                 # Build command to run upload.py directly
                 validated_path = _resolve_user_path(path, require_exists=True, require_dir=False)
@@ -3083,9 +3060,11 @@ def execute_command():
 
                 yield f"data: {json.dumps({'type': 'system', 'data': f'Executing: {command_str}'})}\n\n"
 
-                # Decide whether to run as a subprocess or in-process. In-process
-                # preserves Rich output and allows capturing console.input / cli_ui prompts.
-                use_subprocess = bool(os.environ.get("UA_WEBUI_USE_SUBPROCESS", "").strip())
+                # Uploads run as jobs in their own worker processes. The legacy
+                # in-process mode (one run at a time, console/cli_ui patched in this
+                # process) is opt-in via UA_WEBUI_USE_INPROC.
+                use_inproc = bool(os.environ.get("UA_WEBUI_USE_INPROC", "").strip())
+                use_subprocess = not use_inproc or bool(os.environ.get("UA_WEBUI_USE_SUBPROCESS", "").strip())
 
                 if not use_subprocess:
                     # In-process execution path
@@ -3118,8 +3097,17 @@ def execute_command():
                     # output to the real stdout. record=True still records renderables.
                     record_console = RichConsole(record=True, force_terminal=True, width=120, file=io.StringIO())
 
-                    # Queue to serialize print actions from the worker thread
-                    render_queue: queue.Queue[tuple[Any, dict[str, Any]]] = queue.Queue()
+                    # Serializes print actions from the worker threads. Each print is
+                    # rendered once; export_html(clear=True) only returns what was
+                    # recorded since the previous export.
+                    render_lock = threading.Lock()
+
+                    def render_to_stream(p_args: tuple[Any, ...], p_kwargs: dict[str, Any]) -> None:
+                        with render_lock:
+                            record_console.print(*p_args, **p_kwargs)
+                            chunk = record_console.export_html(inline_styles=True, code_format=CHUNK_HTML_FORMAT)
+                        if chunk.strip():
+                            stream.append(chunk)
 
                     # Cancellation event for cooperative shutdown
                     cancel_event = threading.Event()
@@ -3142,9 +3130,9 @@ def execute_command():
                         orig_print = orig_console.print
 
                         def wrapped_print(*p_args: Any, **p_kwargs: Any) -> Any:
-                            # Enqueue print calls to be applied from the SSE thread
+                            # Render into the session's stream; readers pick it up from there
                             with contextlib.suppress(Exception):
-                                render_queue.put((p_args, p_kwargs))
+                                render_to_stream(p_args, p_kwargs)
                             return orig_print(*p_args, **p_kwargs)
 
                         orig_console.print = cast(Any, wrapped_print)
@@ -3256,6 +3244,8 @@ def execute_command():
 
                     # Prepare sys.argv for upload.py to parse
                     old_argv = list(sys.argv)
+                    worker: Optional[threading.Thread] = None
+                    completed = False
                     try:
                         import shlex
 
@@ -3332,8 +3322,15 @@ def execute_command():
                                     except Exception:
                                         pass
                                     del _ua_console_store[console_key]
-                                # Release lock to allow next inproc run
-                                inproc_lock.release()
+                                sys.argv = old_argv
+                                # The SSE client may have detached, so drop our tracking entry here as well
+                                with contextlib.suppress(Exception):
+                                    if active_processes.get(session_id, {}).get("input_queue") is input_queue:
+                                        active_processes.pop(session_id, None)
+                                # Release lock to allow next inproc run (/api/kill may have released it already)
+                                with contextlib.suppress(RuntimeError):
+                                    inproc_lock.release()
+                                stream.finish()
 
                         worker = threading.Thread(target=run_upload, daemon=True)
                         # Acquire lock to prevent concurrent inproc runs (avoids cross-session interference)
@@ -3361,102 +3358,51 @@ def execute_command():
 
                         console.print(f"Started inproc worker for session {session_id}: {worker.name}", markup=False)
 
-                        # Stream full HTML snapshots from the recorder while the worker runs.
-                        # To avoid spinning the SSE thread and growing the server task queue
-                        # when the uploader prints heavily, block waiting for print events
-                        # with a short timeout and coalesce multiple prints into a
-                        # single exported snapshot.
-                        last_body = ""
-                        try:
-                            while worker.is_alive():
-                                try:
-                                    # Wait for the next print event (blocks briefly). This
-                                    # prevents the generator from busy-waiting and tying up
-                                    # Waitress worker threads.
-                                    r_args, r_kwargs = render_queue.get(timeout=0.5)
-                                    with contextlib.suppress(Exception):
-                                        record_console.print(*r_args, **r_kwargs)
-
-                                    # Drain any additional queued prints so we can coalesce
-                                    # them into a single exported snapshot.
-                                    while not render_queue.empty():
-                                        try:
-                                            r_args, r_kwargs = render_queue.get_nowait()
-                                        except queue.Empty:
-                                            break
-                                        with contextlib.suppress(Exception):
-                                            record_console.print(*r_args, **r_kwargs)
-
-                                    # Export and yield a full HTML snapshot only when the
-                                    # rendered body has changed.
-                                    html_doc = record_console.export_html(inline_styles=True)
-                                    m = re.search(r"<body[^>]*>(.*?)</body>", html_doc, re.S | re.I)
-                                    body = m.group(1).strip() if m else html_doc
-                                    if body != last_body:
-                                        last_body = body
-                                        yield f"data: {json.dumps({'type': 'html_full', 'data': body})}\n\n"
-                                except queue.Empty:
-                                    # No print activity within the timeout — send a keepalive
-                                    # to keep the SSE connection alive without busy-waiting.
-                                    yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
-                                except Exception:
-                                    # Swallow per-iteration errors to keep the stream alive.
-                                    yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
-
-                            # Worker finished; drain any remaining prints and send final snapshot
-                            while not render_queue.empty():
-                                try:
-                                    r_args, r_kwargs = render_queue.get_nowait()
-                                except queue.Empty:
-                                    break
-                                with contextlib.suppress(Exception):
-                                    record_console.print(*r_args, **r_kwargs)
+                        # Stream the rendered chunks while the worker runs; the worker
+                        # finishes the stream when upload.main returns.
+                        yield from stream.events()
+                        completed = True
 
+                    finally:
+                        if worker is not None and worker.is_alive() and not completed:
+                            # The client went away mid-run. Leave the run and its patches in
+                            # place; it can be reattached via /api/execute/stream and restores
+                            # everything itself when it ends.
+                            detached = True
+                            console.print(f"Client detached from inproc session {session_id}", markup=False)
+                        else:
+                            # restore patched functions and argv
                             try:
-                                html_doc = record_console.export_html(inline_styles=True)
-                                m = re.search(r"<body[^>]*>(.*?)</body>", html_doc, re.S | re.I)
-                                body = m.group(1).strip() if m else html_doc
-                                if body != last_body:
-                                    yield f"data: {json.dumps({'type': 'html_full', 'data': body})}\n\n"
+                                # Prefer restoring originals from the module-level store
+                                console_key = id(orig_console)
+                                if console_key in _ua_console_store:
+                                    stored = _ua_console_store.pop(console_key, {})
+                                    with contextlib.suppress(Exception):
+                                        orig_console.print = stored.get("orig_print", orig_console.print)
+                                    with contextlib.suppress(Exception):
+                                        orig_in = stored.get("orig_input", None)
+                                        if orig_in is not None:
+                                            orig_console.input = orig_in
                             except Exception:
-                                pass
-                        except Exception:
-                            # Ensure generator continues and yields a final keepalive on error
-                            yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
-
-                    finally:
-                        # restore patched functions and argv
-                        try:
-                            # Prefer restoring originals from the module-level store
-                            console_key = id(orig_console)
-                            if console_key in _ua_console_store:
-                                stored = _ua_console_store.pop(console_key, {})
+                                # best-effort restore using locals
                                 with contextlib.suppress(Exception):
-                                    orig_console.print = stored.get("orig_print", orig_console.print)
+                                    orig_console.print = orig_print
                                 with contextlib.suppress(Exception):
-                                    orig_in = stored.get("orig_input", None)
-                                    if orig_in is not None:
-                                        orig_console.input = orig_in
-                        except Exception:
-                            # best-effort restore using locals
+                                    if orig_input is not None:
+                                        orig_console.input = orig_input
+
                             with contextlib.suppress(Exception):
-                                orig_console.print = orig_print
+                                if orig_ask_yes_no is not None:
+                                    _cli_ui.ask_yes_no = orig_ask_yes_no
                             with contextlib.suppress(Exception):
-                                if orig_input is not None:
-                                    orig_console.input = orig_input
-
-                        with contextlib.suppress(Exception):
-                            if orig_ask_yes_no is not None:
-                                _cli_ui.ask_yes_no = orig_ask_yes_no
-                        with contextlib.suppress(Exception):
-                            if orig_ask_string is not None:
-                                _cli_ui.ask_string = orig_ask_string
+                                if orig_ask_string is not None:
+                                    _cli_ui.ask_string = orig_ask_string
 
-                        sys.argv = old_argv
+                            sys.argv = old_argv
 
-                        # Remove process tracking for this session
-                        with contextlib.suppress(Exception):
-                            active_processes.pop(session_id, None)
+                            # Remove process tracking for this session
+                            with contextlib.suppress(Exception):
+                                active_processes.pop(session_id, None)
 
                     return
 
@@ -3465,7 +3411,9 @@ def execute_command():
                     env = os.environ.copy()
                     env["PYTHONUNBUFFERED"] = "1"
                     env["PYTHONIOENCODING"] = "utf-8"
-                    # Disable Python output buffering
+                    # Keep Rich's colours and layout even though stdout is a pipe
+                    env["FORCE_COLOR"] = "1"
+                    env["COLUMNS"] = "120"
 
                     # Sanity-check the working directory used for the subprocess.
                     # `base_dir` is computed from the application `__file__`, but
@@ -3513,157 +3461,20 @@ def execute_command():
                         yield f"data: {json.dumps({'type': 'error', 'data': 'Unsafe execution request'})}\n\n"
                         return
 
-                    process = subprocess.Popen(  # lgtm[py/command-line-injection]
-                        command,
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        bufsize=0,  # Completely unbuffered
-                        cwd=str(base_dir),
-                        env=env,
-                        universal_newlines=True,
-                    )
-
-                    # Store process for input handling (no queue needed)
-                    active_processes[session_id] = {"process": process}
-
-                    # Wrap subprocess handling in try/finally to guarantee cleanup
                     try:
-                        # Thread to read stdout - stream raw output with ANSI codes
-                        def read_stdout():
-                            try:
-                                if process.stdout is None:
-                                    return
-                                while True:
-                                    # Read in small chunks for real-time streaming
-                                    chunk = process.stdout.read(1)
-                                    if not chunk:
-                                        break
-                                    output_queue.put(("stdout", chunk))
-                            except Exception as e:
-                                console.print(f"stdout read error: {e}", markup=False)
-
-                        # Thread to read stderr - stream raw output
-                        def read_stderr():
-                            try:
-                                if process.stderr is None:
-                                    return
-                                while True:
-                                    chunk = process.stderr.read(1)
-                                    if not chunk:
-                                        break
-                                    output_queue.put(("stderr", chunk))
-                            except Exception as e:
-                                console.print(f"stderr read error: {e}", markup=False)
-
-                        output_queue: queue.Queue[tuple[str, str]] = queue.Queue()
-
-                        # Start threads (no input thread needed - we write directly)
-                        stdout_thread = threading.Thread(target=read_stdout, daemon=True)
-                        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-
-                        stdout_thread.start()
-                        stderr_thread.start()
-
-                        # Record threads and output queue for debugging/cleanup
-                        try:
-                            if session_id in active_processes:
-                                info = cast(Any, active_processes[session_id])
-                                info["stdout_thread"] = stdout_thread
-                                info["stderr_thread"] = stderr_thread
-                                info["output_queue"] = output_queue
-                        except Exception:
-                            pass
-
-                        console.print(f"Started subprocess reader threads for session {session_id}: stdout={stdout_thread.name}, stderr={stderr_thread.name}", markup=False)
-
-                        def _read_output(q: queue.Queue[tuple[str, str]]) -> tuple[bool, Union[tuple[str, str], None]]:
-                            try:
-                                return True, q.get(timeout=0.1)
-                            except queue.Empty:
-                                return False, None
-
-                        # Stream output as buffered chunks and always emit HTML fragments
-                        # If we are running the upload as a subprocess, stream ANSI->HTML as before.
-                        buffers: dict[str, str] = {"stdout": "", "stderr": ""}
-
-                        while process.poll() is None or not output_queue.empty():
-                            has_output, output = _read_output(output_queue)
-                            if has_output and output is not None:
-                                output_type, char = output
-                                if output_type not in buffers:
-                                    buffers[output_type] = ""
-                                buffers[output_type] += char
-
-                                # Flush on newline or when buffer grows large
-                                if char == "\n" or len(buffers[output_type]) > 512:
-                                    chunk = buffers[output_type]
-                                    buffers[output_type] = ""
-
-                                    # Convert to HTML fragment. If helper missing, escape and wrap in <pre>
-                                    try:
-                                        if ansi_to_html:
-                                            html_fragment = ansi_to_html(chunk)
-                                        else:
-                                            import html as _html
-
-                                            html_fragment = f"<pre>{_html.escape(chunk)}</pre>"
-
-                                        yield f"data: {json.dumps({'type': 'html', 'data': html_fragment, 'origin': output_type})}\n\n"
-                                    except Exception as e:
-                                        console.print(f"HTML conversion error: {e}", markup=False)
-                                        import html as _html
-
-                                        html_fragment = f"<pre>{_html.escape(chunk)}</pre>"
-                                        yield f"data: {json.dumps({'type': 'html', 'data': html_fragment, 'origin': output_type})}\n\n"
-                            else:
-                                # keepalive to keep the SSE connection alive
-                                yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
-
-                        # Flush remaining buffers as HTML
-                        for t, remaining in list(buffers.items()):
-                            if remaining:
-                                try:
-                                    if ansi_to_html:
-                                        html_fragment = ansi_to_html(remaining)
-                                    else:
-                                        import html as _html
-
-                                        html_fragment = f"<pre>{_html.escape(remaining)}</pre>"
-
-                                    yield f"data: {json.dumps({'type': 'html', 'data': html_fragment, 'origin': t})}\n\n"
-
-                                except Exception as e:
-                                    console.print(f"HTML flush error: {e}", markup=False)
-                                    import html as _html
-
-                                    html_fragment = f"<pre>{_html.escape(remaining)}</pre>"
-                                    yield f"data: {json.dumps({'type': 'html', 'data': html_fragment, 'origin': t})}\n\n"
-
-                        # Wait for process to finish
-                        process.wait()
+                        job_manager.submit(session_id, validated_path, command, str(base_dir), env, stream)
+                    except ValueError as err:
+                        yield f"data: {json.dumps({'type': 'error', 'data': str(err)})}\n\n"
+                        return
+                    # The job owns the stream from here on: it keeps running if this client goes away
+                    detached = True
 
-                        # Clean up (normal path)
-                        if session_id in active_processes:
-                            del active_processes[session_id]
+                    position = job_manager.queue_position(session_id)
+                    if position >= 0:
+                        queued_msg = f"Queued behind {position} other upload(s); {job_manager.running_count()} running"
+                        yield f"data: {json.dumps({'type': 'system', 'data': queued_msg})}\n\n"
 
-                        yield f"data: {json.dumps({'type': 'exit', 'code': process.returncode})}\n\n"
-                    finally:
-                        # Ensure subprocess pipes are closed to avoid leaking file handles
-                        with contextlib.suppress(Exception):
-                            if process.stdin is not None:
-                                process.stdin.close()
-                        with contextlib.suppress(Exception):
-                            if process.stdout is not None:
-                                process.stdout.close()
-                        with contextlib.suppress(Exception):
-                            if process.stderr is not None:
-                                process.stderr.close()
-                        # Ensure we remove tracking entry if still present
-                        with contextlib.suppress(Exception):
-                            if session_id in active_processes:
-                                del active_processes[session_id]
+                    yield from stream.events()
 
             except Exception as e:
                 console.print(f"Execution error for session {session_id}: {e}", markup=False)
@@ -3673,6 +3484,9 @@ def execute_command():
                 # Clean up on error
                 if session_id in active_processes:
                     del active_processes[session_id]
+            finally:
+                if not detached:
+                    stream.finish()
 
         return Response(generate(), mimetype="text/event-stream")
 
@@ -3682,6 +3496,23 @@ def execute_command():
         return jsonify({"error": "Request error", "success": False}), 500
 
 
+@app.route("/api/execute/stream", methods=["GET"])
+@limiter.limit("300 per hour", key_func=_rate_limit_key_func)
+def execute_stream():
+    """Reattach to a run's output, replaying what came after Last-Event-ID"""
+    bearer = _get_bearer_from_header()
+    if bearer and not _token_is_valid(bearer):
+        return jsonify({"error": "Forbidden (invalid token)", "success": False}), 403
+
+    session_id = request.args.get("session_id", "default")
+    stream = console_streams.get(session_id)
+    if stream is None:
+        return jsonify({"error": "No output for this session", "success": False}), 404
+
+    last_event_id = parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+    return Response(stream.events(last_event_id), mimetype="text/event-stream")
+
+
 @app.route("/api/input", methods=["POST"])
 @limiter.limit("200 per hour", key_func=_rate_limit_key_func)
 def send_input():
@@ -3705,6 +3536,11 @@ def send_input():
             if not _is_authenticated():
                 return jsonify({"error": "Authentication required (web session)" , "success": False}), 401
 
+        if job_manager.get(session_id) is not None:
+            if not job_manager.send_input(session_id, user_input):
+                return jsonify({"error": "Process not running", "success": False}), 400
+            return jsonify({"success": True})
+
         if session_id not in active_processes:
             return jsonify({"error": "No active process", "success": False}), 404
 
@@ -3768,6 +3604,10 @@ def kill_process():
             if not _is_authenticated():
                 return jsonify({"error": "Authentication required (web session)" , "success": False}), 401
 
+        if job_manager.cancel(session_id):
+            console.print(f"Job cancelled for session {session_id}", markup=False)
+            return jsonify({"success": True, "message": "Process terminated"})
+
         if session_id not in active_processes:
             return jsonify({"error": "No active process", "success": False}), 404
 
@@ -3909,6 +3749,47 @@ def kill_process():
         return jsonify({"error": "Kill error", "success": False}), 500
 
 
+@app.route("/api/jobs", methods=["GET"])
+@limiter.limit("600 per hour", key_func=_rate_limit_key_func)
+def list_jobs():
+    """List queued, running and recently finished upload jobs"""
+    bearer = _get_bearer_from_header()
+    if bearer:
+        if not _token_is_valid(bearer):
+            return jsonify({"error": "Forbidden (invalid token)", "success": False}), 403
+    else:
+        if not _is_authenticated():
+            return jsonify({"error": "Authentication required (web session)" , "success": False}), 401
+
+    return jsonify({"success": True, "max_jobs": job_manager.max_jobs, "jobs": job_manager.list_jobs()})
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET", "DELETE"])
+@limiter.limit("600 per hour", key_func=_rate_limit_key_func)
+def job_detail(job_id: str):
+    """Show one upload job, or cancel it with DELETE"""
+    bearer = _get_bearer_from_header()
+    if bearer:
+        if not _token_is_valid(bearer):
+            return jsonify({"error": "Forbidden (invalid token)", "success": False}), 403
+    else:
+        if not _is_authenticated():
+            return jsonify({"error": "Authentication required (web session)" , "success": False}), 401
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "No such job", "success": False}), 404
+
+    if request.method == "DELETE":
+        if not _verify_csrf_header():
+            return jsonify({"error": "CSRF token missing or invalid", "success": False}), 403
+        if not job_manager.cancel(job_id):
+            return jsonify({"error": "Job is not active", "success": False}), 400
+        console.print(f"Job cancelled for session {job_id}", markup=False)
+
+    return jsonify({"success": True, "job": job.to_dict()})
+
+
 @app.errorhandler(404)
 def not_found(_e: Exception):
     return jsonify({"error": "Not found", "success": False}), 404
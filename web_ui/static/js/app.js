@@ -359,7 +359,6 @@ function AudionutsUAGUI() {
   const [descLinkFocused, setDescLinkFocused] = useState(false);
   
   const richOutputRef = useRef(null);
-  const lastFullHashRef = useRef('');
   const inputRef = useRef(null);
   const sseAbortControllerRef = useRef(null);
   
@@ -1012,8 +1011,6 @@ function AudionutsUAGUI() {
     if (rootContainer) {
       rootContainer.innerHTML = '';
     }
-    // Reset last-full snapshot key to allow appending fresh full snapshots
-    if (lastFullHashRef) lastFullHashRef.current = '';
 
     appendSystemMessage('');
     appendSystemMessage(`$ python upload.py "${selectedPath}" ${customArgs}`);
@@ -1051,41 +1048,40 @@ function AudionutsUAGUI() {
         appendSystemMessage('✗ Execute failed: empty response body', 'error');
         return;
       }
-      const reader = response.body.getReader();
-      const decoder = new TextDecoder();
-      let buffer = '';
+      // Highest output chunk rendered so far; a reconnect asks the server for
+      // everything after it via Last-Event-ID, so nothing is shown twice.
+      let lastSeq = 0;
+      let exited = false;
 
       const processSSELine = (line) => {
         if (localController && localController.signal.aborted) return;
         if (!line.trim() || !line.startsWith('data: ')) return;
         try {
           const data = JSON.parse(line.substring(6));
-          if (data.type === 'html' || data.type === 'html_full') {
+          if (data.type === 'html_delta') {
+            if (typeof data.seq === 'number') {
+              if (data.seq <= lastSeq) return;
+              lastSeq = data.seq;
+            }
             try {
-              const rawHtml = data.data || '';
-              const clean = sanitizeHtml(rawHtml);
-              if (data.type === 'html_full') {
-                const shortSample = clean.slice(0, 200);
-                const key = `${clean.length}:${shortSample}`;
-                if (lastFullHashRef.current !== key) {
-                  lastFullHashRef.current = key;
-                  const wrapper = document.createElement('div');
-                  wrapper.innerHTML = clean;
-                  if (rootContainer) rootContainer.appendChild(wrapper);
-                  setTimeout(() => {
-                    const last = rootContainer && rootContainer.lastElementChild;
-                    if (last && last.scrollIntoView) last.scrollIntoView({ block: 'end' });
-                    else if (rootContainer) rootContainer.scrollTop = rootContainer.scrollHeight;
-                  }, 0);
-                }
-                return;
-              }
-              // delegate to shared helper for fragments
-              appendHtmlFragment(clean);
+              appendHtmlFragment(data.data || '');
             } catch (e) {
               console.error('Failed to render HTML fragment:', e);
             }
-              } else if (data.type === 'exit') {
+          } else if (data.type === 'html') {
+            try {
+              appendHtmlFragment(data.data || '');
+            } catch (e) {
+              console.error('Failed to render HTML fragment:', e);
+            }
+          } else if (data.type === 'system') {
+            appendSystemMessage(data.data || '');
+          } else if (data.type === 'error') {
+            appendSystemMessage(`✗ ${data.data || 'Execution error'}`, 'error');
+          } else if (data.type === 'gap') {
+            appendSystemMessage(`… ${data.dropped} earlier output chunks were dropped while disconnected`, 'error');
+          } else if (data.type === 'exit') {
+            exited = true;
             if (!(localController && localController.signal.aborted)) {
               appendSystemMessage('');
               appendSystemMessage(`✓ Process exited with code ${data.code}`);
@@ -1096,29 +1092,59 @@ function AudionutsUAGUI() {
         }
       };
 
-      /* eslint-disable no-constant-condition */
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) {
-          // process any remaining buffered content
-          if (buffer) {
-            const finalLines = buffer.split('\n');
-            for (const line of finalLines) {
-              processSSELine(line);
+      const readStream = async (body) => {
+        const reader = body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        /* eslint-disable no-constant-condition */
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) {
+            // process any remaining buffered content
+            if (buffer) {
+              const finalLines = buffer.split('\n');
+              for (const line of finalLines) {
+                processSSELine(line);
+              }
             }
+            break;
           }
-          break;
-        }
 
-        buffer += decoder.decode(value, { stream: true });
-        const parts = buffer.split('\n');
-        buffer = parts.pop(); // last item may be incomplete
+          buffer += decoder.decode(value, { stream: true });
+          const parts = buffer.split('\n');
+          buffer = parts.pop(); // last item may be incomplete
 
-        for (const line of parts) {
-          processSSELine(line);
+          for (const line of parts) {
+            processSSELine(line);
+          }
+        }
+        /* eslint-enable no-constant-condition */
+      };
+
+      const MAX_RECONNECTS = 5;
+      let streamBody = response.body;
+      for (let attempt = 0; ; attempt++) {
+        try {
+          await readStream(streamBody);
+          break;
+        } catch (streamError) {
+          if (exited || (localController && localController.signal.aborted) || attempt >= MAX_RECONNECTS) {
+            throw streamError;
+          }
+        }
+        // The connection dropped mid-run: reattach and replay what we missed
+        appendSystemMessage('… connection lost, reconnecting', 'error');
+        await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)));
+        const resumed = await apiFetch(`${API_BASE}/execute/stream?session_id=${encodeURIComponent(newSessionId)}`, {
+          headers: { 'Last-Event-ID': String(lastSeq) },
+          signal: controller.signal
+        });
+        if (!resumed.ok || !resumed.body) {
+          appendSystemMessage(`✗ Reconnect failed (${resumed.status})`, 'error');
+          return;
         }
+        streamBody = resumed.body;
       }
-      /* eslint-enable no-constant-condition */
       // Only append the final completion message when not aborted.
       if (!(localController && localController.signal.aborted)) {
         appendSystemMessage('✓ Execution completed');